@@ -0,0 +1,89 @@
+"""Benchmark of the jsonplus cache/session serializer against pickle.
+
+Run with::
+
+    $ python -m django_jsonplus.bench
+    $ python -m django_jsonplus.bench -w mixed -n 100
+
+Workloads are those of :mod:`jsonplus.bench`. For each workload and
+serializer, the serialized size, and ``dumps``/``loads`` rates (calls per
+second) are reported.
+"""
+
+from __future__ import print_function
+
+from collections import OrderedDict
+import argparse
+import pickle
+import random
+
+from jsonplus.bench import WORKLOADS, SEED, DEFAULT_REPEAT, _rate
+
+from django_jsonplus.serializers import JSONPlusSerializer
+
+
+DEFAULT_SIZE = 100
+
+
+class PickleSerializer(object):
+    """Pickle, as used by Django's cache backends."""
+
+    def dumps(self, obj):
+        return pickle.dumps(obj, pickle.HIGHEST_PROTOCOL)
+
+    def loads(self, data):
+        return pickle.loads(data)
+
+
+# serializer name -> serializer
+SERIALIZERS = OrderedDict([
+    ('pickle', PickleSerializer()),
+    ('jsonplus', JSONPlusSerializer(compress_threshold=None)),
+    ('jsonplus+zlib', JSONPlusSerializer()),
+])
+
+
+def bench(workloads=None, size=DEFAULT_SIZE, repeat=DEFAULT_REPEAT, number=None):
+    """Benchmark all :data:`SERIALIZERS` on `workloads` (all by default).
+
+    Returns:
+        `list` of `dict` results, with ``workload``, ``serializer``,
+        ``bytes``, ``dumps_per_sec`` and ``loads_per_sec``.
+    """
+    results = []
+    for name in workloads or WORKLOADS:
+        payload = WORKLOADS[name](random.Random(SEED), size)
+        for serializer_name, serializer in SERIALIZERS.items():
+            data = serializer.dumps(payload)
+            results.append(OrderedDict([
+                ('workload', name),
+                ('serializer', serializer_name),
+                ('bytes', len(data)),
+                ('dumps_per_sec', _rate(lambda: serializer.dumps(payload), repeat, number)),
+                ('loads_per_sec', _rate(lambda: serializer.loads(data), repeat, number)),
+            ]))
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m django_jsonplus.bench',
+                                     description="Benchmark cache serializers.")
+    parser.add_argument('-w', '--workload', action='append', choices=list(WORKLOADS),
+                        help="workload to run (can be repeated, default: all)")
+    parser.add_argument('-n', '--size', type=int, default=DEFAULT_SIZE,
+                        help="workload size (default: %(default)s)")
+    parser.add_argument('-r', '--repeat', type=int, default=DEFAULT_REPEAT,
+                        help="timing repetitions (default: %(default)s)")
+    parser.add_argument('--number', type=int,
+                        help="operations per repetition (default: automatic)")
+    args = parser.parse_args(argv)
+
+    print("%-12s %-14s %10s %12s %12s" % ("workload", "serializer", "bytes", "dumps/s", "loads/s"))
+    for result in bench(args.workload, size=args.size, repeat=args.repeat, number=args.number):
+        print("%-12s %-14s %10d %12.1f %12.1f" % (
+            result['workload'], result['serializer'], result['bytes'],
+            result['dumps_per_sec'], result['loads_per_sec']))
+
+
+if __name__ == '__main__':
+    main()
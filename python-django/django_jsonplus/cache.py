@@ -0,0 +1,65 @@
+"""Local-memory cache backend storing values serialized with jsonplus
+(instead of pickle), e.g. as a stand-in for a Redis cache with
+:class:`~django_jsonplus.serializers.JSONPlusSerializer` in tests.
+
+Use with::
+
+    CACHES = {
+        'default': {
+            'BACKEND': 'django_jsonplus.cache.JSONPlusLocMemCache',
+            'OPTIONS': {'COMPRESS_THRESHOLD': 1024, 'COMPRESS_LEVEL': 6},
+        }
+    }
+"""
+
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+from django.core.cache.backends.locmem import LocMemCache
+
+from django_jsonplus.serializers import JSONPlusSerializer
+
+
+class JSONPlusLocMemCache(LocMemCache):
+    serializer_class = JSONPlusSerializer
+
+    def __init__(self, name, params):
+        super(JSONPlusLocMemCache, self).__init__(name, params)
+        options = params.get('OPTIONS', {})
+        self.serializer = self.serializer_class(**dict(
+            (name.lower(), options[name])
+            for name in ('COMPRESS_THRESHOLD', 'COMPRESS_LEVEL') if name in options))
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        data = self.serializer.dumps(value)
+        with self._lock:
+            if self._has_expired(key):
+                self._set(key, data, timeout)
+                return True
+            return False
+
+    def get(self, key, default=None, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        with self._lock:
+            if self._has_expired(key):
+                self._delete(key)
+                return default
+            data = self._cache[key]
+            self._cache.move_to_end(key, last=False)
+        return self.serializer.loads(data)
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        data = self.serializer.dumps(value)
+        with self._lock:
+            self._set(key, data, timeout)
+
+    def incr(self, key, delta=1, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        with self._lock:
+            if self._has_expired(key):
+                self._delete(key)
+                raise ValueError("Key '%s' not found" % key)
+            value = self.serializer.loads(self._cache[key]) + delta
+            self._cache[key] = self.serializer.dumps(value)
+            self._cache.move_to_end(key, last=False)
+        return value
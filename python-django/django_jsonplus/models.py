@@ -1,14 +1,25 @@
+from contextlib import contextmanager
+
 import six
 import jsonplus
 
 from django.db import models
+from django.db.models.query_utils import DeferredAttribute
+
+
+class _Serialized(six.text_type):
+    """JSON text of a value loaded from the database, not decoded yet."""
+
+
+class _Encoded(_Serialized):
+    """JSON text of a value encoded ahead of saving (in bulk)."""
 
 
 class JSONPlusField(models.TextField):
     """Use jsonplus serializer to support custom python types, like
     `datetime`."""
 
-    def from_db_value(self, value, expression, connection, context):
+    def from_db_value(self, value, expression, connection, context=None):
         if value is None:
             return value
         return jsonplus.loads(value)
@@ -21,4 +32,147 @@ class JSONPlusField(models.TextField):
     def get_prep_value(self, value):
         if value is None:
             return value
+        if isinstance(value, _Serialized):
+            return six.text_type(value)
         return jsonplus.dumps(value)
+
+
+class _LazyDeserializer(DeferredAttribute):
+    """Model attribute descriptor that decodes the serialized value on first
+    access, and caches the decoded value on the instance."""
+
+    def __get__(self, instance, cls=None):
+        value = super(_LazyDeserializer, self).__get__(instance, cls)
+        if type(value) is _Serialized:
+            value = instance.__dict__[self.field.attname] = jsonplus.loads(value)
+        return value
+
+    def __set__(self, instance, value):
+        instance.__dict__[self.field.attname] = value
+
+
+class LazyJSONPlusField(JSONPlusField):
+    """A `JSONPlusField` decoded lazily: values are decoded from JSON only
+    when the model attribute is accessed (and the decoded value is cached
+    on the instance), and values never accessed are saved back as loaded,
+    without re-encoding.
+
+    Stored in a `jsonb` column on PostgreSQL (note: `jsonb` can't store
+    non-finite floats), and in a text column on other databases.
+
+    Note: ``values()``/``values_list()`` querysets return serialized JSON
+    text (decode it with ``field.to_python()``).
+    """
+
+    descriptor_class = _LazyDeserializer
+
+    def db_type(self, connection):
+        if connection.vendor == 'postgresql':
+            return 'jsonb'
+        return super(LazyJSONPlusField, self).db_type(connection)
+
+    def get_placeholder(self, value, compiler, connection):
+        if connection.vendor == 'postgresql':
+            return '%s::jsonb'
+        return '%s'
+
+    def select_format(self, compiler, sql, params):
+        # read `jsonb` as text, not decoded by the database driver
+        if compiler.connection.vendor == 'postgresql':
+            sql = '%s::text' % sql
+        return super(LazyJSONPlusField, self).select_format(compiler, sql, params)
+
+    def from_db_value(self, value, expression, connection, context=None):
+        if value is None:
+            return value
+        return _Serialized(value)
+
+    def pre_save(self, model_instance, add):
+        # don't decode values not accessed
+        value = model_instance.__dict__.get(self.attname)
+        if type(value) is _Serialized:
+            return value
+        return super(LazyJSONPlusField, self).pre_save(model_instance, add)
+
+
+_missing = object()
+
+
+class JSONPlusQuerySet(models.QuerySet):
+    """QuerySet with bulk operations encoding (and decoding) values of
+    `JSONPlusField` fields in batches, with a shared encoder (optionally in
+    a pool of `workers` processes, or in an `executor`; see
+    :func:`jsonplus.dumps_many`), instead of one by one.
+
+    Use as a model manager with ``objects = JSONPlusQuerySet.as_manager()``.
+    """
+
+    def _json_fields(self, names=None):
+        fields = self.model._meta.concrete_fields
+        if names is not None:
+            fields = [self.model._meta.get_field(name) for name in names]
+        return [field for field in fields if isinstance(field, JSONPlusField)]
+
+    @contextmanager
+    def _encoded(self, objs, fields, executor, workers):
+        """Replace values of `fields` of `objs` with their (bulk) encoded
+        JSON, restoring the original values on exit."""
+        originals = []
+        try:
+            for field in fields:
+                attname = field.attname
+                values = [obj.__dict__.get(attname, _missing) for obj in objs]
+                pending = [idx for idx, value in enumerate(values)
+                           if value is not None and value is not _missing
+                           and not isinstance(value, _Serialized)]
+                documents = jsonplus.dumps_many([values[idx] for idx in pending],
+                                                executor=executor, workers=workers)
+                for idx, document in zip(pending, documents):
+                    objs[idx].__dict__[attname] = _Encoded(document)
+                # values loaded, but never decoded, are saved as they are
+                for obj, value in zip(objs, values):
+                    if type(value) is _Serialized:
+                        obj.__dict__[attname] = _Encoded(value)
+                originals.append((attname, values))
+            yield
+        finally:
+            for attname, values in originals:
+                for obj, value in zip(objs, values):
+                    if value is not _missing:
+                        obj.__dict__[attname] = value
+
+    def bulk_create(self, objs, *pa, **kw):
+        executor, workers = kw.pop('executor', None), kw.pop('workers', None)
+        objs = list(objs)
+        with self._encoded(objs, self._json_fields(), executor, workers):
+            return super(JSONPlusQuerySet, self).bulk_create(objs, *pa, **kw)
+
+    def bulk_update(self, objs, fields, *pa, **kw):
+        executor, workers = kw.pop('executor', None), kw.pop('workers', None)
+        objs = list(objs)
+        with self._encoded(objs, self._json_fields(fields), executor, workers):
+            return super(JSONPlusQuerySet, self).bulk_update(objs, fields, *pa, **kw)
+
+    def decoded_values_list(self, *fields, **kw):
+        """Like ``values_list(*fields, flat=...)``, but with values of
+        `LazyJSONPlusField` fields decoded, in bulk (accepts `executor` and
+        `workers`, see :func:`jsonplus.loads_many`).
+
+        Returns:
+            `list` of tuples (or of values, if ``flat=True``).
+        """
+        executor, workers = kw.pop('executor', None), kw.pop('workers', None)
+        flat = kw.pop('flat', False)
+        rows = [list(row) for row in self.values_list(*fields, **kw)]
+        for col in range(len(rows[0]) if rows else 0):
+            pending = [row for row in rows if type(row[col]) is _Serialized]
+            values = jsonplus.loads_many([row[col] for row in pending],
+                                         executor=executor, workers=workers)
+            for row, value in zip(pending, values):
+                row[col] = value
+        if flat:
+            if len(fields) != 1:
+                raise TypeError("'flat' is not valid when values_list is called "
+                                "with more than one field.")
+            return [row[0] for row in rows]
+        return [tuple(row) for row in rows]
@@ -0,0 +1,64 @@
+"""Serializers for Django's cache and sessions, using jsonplus.
+
+Values are encoded in the compact representation of the exact coding (so
+all types supported by jsonplus are restored), as UTF-8 bytes, compressed
+with zlib if longer than :attr:`JSONPlusSerializer.compress_threshold`.
+
+Use for sessions with::
+
+    SESSION_SERIALIZER = 'django_jsonplus.serializers.JSONPlusSerializer'
+
+and with Redis cache with::
+
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': 'redis://127.0.0.1:6379',
+            'OPTIONS': {'serializer': 'django_jsonplus.serializers.JSONPlusSerializer'},
+        }
+    }
+"""
+
+import zlib
+
+import six
+import jsonplus
+
+
+# zlib streams (with the default window size) start with 0x78 (``x``),
+# which no JSON document does, so compressed data needs no other marker
+_ZLIB_HEADER = b'x'
+
+
+class JSONPlusSerializer(object):
+    """Serializer with ``dumps(obj) -> bytes`` and ``loads(bytes) -> obj``,
+    as expected by Django's Redis cache backend, and by sessions."""
+
+    #: Size (in bytes) of encoded values above which they are compressed
+    #: (``None`` to never compress).
+    compress_threshold = 1024
+
+    #: zlib compression level.
+    compress_level = 6
+
+    def __init__(self, **options):
+        for name, value in options.items():
+            if name not in ('compress_threshold', 'compress_level'):
+                raise TypeError("Unexpected option: %r" % name)
+            setattr(self, name, value)
+
+    def dumps(self, obj):
+        if type(obj) is int:
+            # plain integers, for atomic incr/decr in the cache backend
+            return six.text_type(obj).encode('ascii')
+        data = jsonplus.dumps(obj, exact=True, compact=True).encode('utf-8')
+        if self.compress_threshold is not None and len(data) > self.compress_threshold:
+            data = zlib.compress(data, self.compress_level)
+        return data
+
+    def loads(self, data):
+        if isinstance(data, six.binary_type) and data[:1] == _ZLIB_HEADER:
+            data = zlib.decompress(data)
+        if isinstance(data, six.binary_type):
+            data = data.decode('utf-8')
+        return jsonplus.loads(data)
@@ -18,6 +18,8 @@ setup(
     install_requires=[i.strip() for i in open('requirements.txt').readlines()],
     classifiers=[
         'Environment :: Web Environment',
+        'Framework :: Django',
+        'Framework :: Django :: 4.0',
         'Intended Audience :: Developers',
         'License :: OSI Approved :: MIT License',
         'Operating System :: OS Independent',
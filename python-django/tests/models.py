@@ -1,7 +1,16 @@
 from django.db import models
-from django_jsonplus.models import JSONPlusField
+from django_jsonplus.models import JSONPlusField, LazyJSONPlusField, JSONPlusQuerySet
 
 
 class TestModel(models.Model):
     normal = JSONPlusField()
     nullable = JSONPlusField(null=True, blank=True)
+
+    objects = JSONPlusQuerySet.as_manager()
+
+
+class LazyTestModel(models.Model):
+    normal = LazyJSONPlusField()
+    nullable = LazyJSONPlusField(null=True, blank=True)
+
+    objects = JSONPlusQuerySet.as_manager()
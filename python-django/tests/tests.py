@@ -1,15 +1,26 @@
 from __future__ import absolute_import, print_function
 from collections import namedtuple
 from datetime import datetime
+from decimal import Decimal
+
+try:
+    from unittest import mock
+except ImportError:
+    import mock
 
 from django.test import TestCase
 from django.db import connection
+from django.core import signing
 
 from moneyed import Money
 from djmoney.money import Money as DjangoMoney
 import jsonplus
 
-from tests.models import TestModel
+from django_jsonplus.models import LazyJSONPlusField, _Serialized
+from django_jsonplus.serializers import JSONPlusSerializer
+from django_jsonplus.cache import JSONPlusLocMemCache
+from django_jsonplus import bench
+from tests.models import TestModel, LazyTestModel
 
 
 class SimpleTest(TestCase):
@@ -64,4 +75,181 @@ class SimpleTest(TestCase):
         self.assertEqual(obj, dm)
         self.assertTrue(hasattr(obj, 'is_localized'))
         self.assertTrue(hasattr(dm, 'is_localized'))
-        self.assertFalse(hasattr(m, 'is_localized'))
\ No newline at end of file
+        self.assertFalse(hasattr(m, 'is_localized'))
+
+
+class FakeConnection(object):
+    vendor = 'postgresql'
+
+
+class LazyTest(TestCase):
+    def setUp(self):
+        self.value = {"ts": datetime(2017, 2, 17, 2, 41), "price": Decimal('1.23'),
+                      "tags": {"a", "b"}}
+        self.orig = LazyTestModel.objects.create(normal=self.value)
+
+    def test_roundtrip(self):
+        copy = LazyTestModel.objects.get(id=self.orig.id)
+        self.assertEqual(copy.normal, self.value)
+        self.assertIsNone(copy.nullable)
+
+        Point = namedtuple('Point', 'x y')
+        for value in ["value", 1, None, [1, "2"], Point(3, 4), datetime.now()]:
+            orig = LazyTestModel.objects.create(normal=1, nullable=value)
+            self.assertEqual(LazyTestModel.objects.get(id=orig.id).nullable, value)
+
+    def test_lazy(self):
+        copy = LazyTestModel.objects.get(id=self.orig.id)
+        self.assertIs(type(copy.__dict__['normal']), _Serialized)
+
+        with mock.patch('jsonplus.loads', wraps=jsonplus.loads) as loads:
+            value = copy.normal
+            self.assertIs(copy.normal, value)
+            self.assertEqual(loads.call_count, 1)
+        self.assertEqual(value, self.value)
+
+    def test_save_unchanged(self):
+        copy = LazyTestModel.objects.get(id=self.orig.id)
+        copy.nullable = [1]
+        with mock.patch('jsonplus.dumps', wraps=jsonplus.dumps) as dumps, \
+                mock.patch('jsonplus.loads', wraps=jsonplus.loads) as loads:
+            copy.save()
+            # only the modified field is encoded, and nothing is decoded
+            dumps.assert_called_once_with([1])
+            self.assertEqual(loads.call_count, 0)
+        self.assertEqual(LazyTestModel.objects.get(id=self.orig.id).normal, self.value)
+
+    def test_modified(self):
+        copy = LazyTestModel.objects.get(id=self.orig.id)
+        copy.normal["extra"] = 1
+        copy.save()
+        self.assertEqual(LazyTestModel.objects.get(id=self.orig.id).normal["extra"], 1)
+
+    def test_deferred(self):
+        copy = LazyTestModel.objects.defer('normal').get(id=self.orig.id)
+        self.assertNotIn('normal', copy.__dict__)
+        self.assertEqual(copy.normal, self.value)
+
+    def test_values_list(self):
+        text, = LazyTestModel.objects.values_list('normal', flat=True)
+        self.assertEqual(LazyTestModel._meta.get_field('normal').to_python(text), self.value)
+
+    def test_postgresql(self):
+        field = LazyJSONPlusField()
+        self.assertEqual(field.db_type(connection), 'text')
+        self.assertEqual(field.db_type(FakeConnection()), 'jsonb')
+        self.assertEqual(field.get_placeholder(None, None, FakeConnection()), '%s::jsonb')
+        compiler = mock.Mock(connection=FakeConnection())
+        self.assertEqual(field.select_format(compiler, '"col"', []), ('"col"::text', []))
+
+
+class BulkTest(TestCase):
+    def setUp(self):
+        self.ts = datetime(2017, 2, 17, 2, 41)
+        self.values = [{"id": i, "ts": self.ts, "price": Decimal(i)} for i in range(50)]
+
+    def test_bulk_create(self):
+        for model in (TestModel, LazyTestModel):
+            objs = [model(normal=value, nullable=None if i % 2 else [i])
+                    for i, value in enumerate(self.values)]
+            with mock.patch('jsonplus.dumps', side_effect=AssertionError("dumps called")):
+                model.objects.bulk_create(objs)
+            # original values are restored
+            self.assertIs(objs[0].normal, self.values[0])
+            self.assertEqual([obj.normal for obj in model.objects.order_by('id')], self.values)
+            self.assertEqual(model.objects.filter(nullable__isnull=True).count(), 25)
+
+    def test_workers(self):
+        TestModel.objects.bulk_create([TestModel(normal=value) for value in self.values],
+                                      workers=2)
+        self.assertEqual([obj.normal for obj in TestModel.objects.order_by('id')], self.values)
+
+    def test_bulk_update(self):
+        for model in (TestModel, LazyTestModel):
+            model.objects.bulk_create([model(normal=value) for value in self.values])
+            objs = list(model.objects.order_by('id'))
+            for obj in objs:
+                obj.nullable = obj.pk
+            with mock.patch('jsonplus.dumps', side_effect=AssertionError("dumps called")):
+                model.objects.bulk_update(objs, ['normal', 'nullable'], batch_size=20)
+            self.assertEqual([(obj.normal, obj.nullable) for obj in model.objects.order_by('id')],
+                             [(value, obj.pk) for value, obj in zip(self.values, objs)])
+
+    def test_lazy_unchanged(self):
+        LazyTestModel.objects.bulk_create([LazyTestModel(normal=value) for value in self.values])
+        objs = list(LazyTestModel.objects.all())
+        with mock.patch('jsonplus.dumps_many', wraps=jsonplus.dumps_many) as dumps_many, \
+                mock.patch('jsonplus.loads', side_effect=AssertionError("loads called")):
+            LazyTestModel.objects.bulk_update(objs, ['normal'])
+            dumps_many.assert_called_once_with([], executor=None, workers=None)
+        self.assertIs(type(objs[0].__dict__['normal']), _Serialized)
+
+    def test_decoded_values_list(self):
+        LazyTestModel.objects.bulk_create([LazyTestModel(normal=value, nullable=i)
+                                           for i, value in enumerate(self.values)])
+        rows = LazyTestModel.objects.order_by('id').decoded_values_list('normal', 'nullable')
+        self.assertEqual(rows, [(value, i) for i, value in enumerate(self.values)])
+        self.assertEqual(LazyTestModel.objects.order_by('id').decoded_values_list('normal', flat=True),
+                         self.values)
+        self.assertEqual(LazyTestModel.objects.none().decoded_values_list('normal'), [])
+        self.assertRaises(TypeError, LazyTestModel.objects.decoded_values_list, 'id', 'normal', flat=True)
+
+
+class SerializerTest(TestCase):
+    def setUp(self):
+        Point = namedtuple('Point', 'x y')
+        self.value = {"ts": datetime(2017, 2, 17, 2, 41), "price": Decimal('1.23'),
+                      "point": Point(1, 2), "tags": {"a"}, "money": Money(1, 'EUR')}
+
+    def test_roundtrip(self):
+        serializer = JSONPlusSerializer()
+        data = serializer.dumps(self.value)
+        self.assertIsInstance(data, bytes)
+        self.assertTrue(jsonplus.compact.is_compact(data))
+        self.assertEqual(serializer.loads(data), self.value)
+
+    def test_compression(self):
+        value = [self.value] * 100
+        compressed = JSONPlusSerializer().dumps(value)
+        plain = JSONPlusSerializer(compress_threshold=None).dumps(value)
+        self.assertTrue(len(compressed) < len(plain))
+        for data in (compressed, plain):
+            self.assertEqual(JSONPlusSerializer().loads(data), value)
+        # small values are not compressed
+        self.assertEqual(JSONPlusSerializer().dumps([1]), JSONPlusSerializer(compress_threshold=None).dumps([1]))
+        self.assertRaises(TypeError, JSONPlusSerializer, threshold=10)
+
+    def test_integers(self):
+        self.assertEqual(JSONPlusSerializer().dumps(42), b'42')
+        self.assertEqual(JSONPlusSerializer().loads(b'43'), 43)
+        self.assertIs(JSONPlusSerializer().loads(JSONPlusSerializer().dumps(True)), True)
+
+    def test_session(self):
+        signed = signing.dumps(self.value, salt='session', serializer=JSONPlusSerializer)
+        self.assertEqual(signing.loads(signed, salt='session', serializer=JSONPlusSerializer),
+                         self.value)
+
+    def test_cache(self):
+        cache = JSONPlusLocMemCache('jsonplus', {'OPTIONS': {'COMPRESS_THRESHOLD': 100}})
+        self.assertEqual(cache.serializer.compress_threshold, 100)
+        cache.set('value', self.value)
+        self.assertEqual(cache.get('value'), self.value)
+        self.assertTrue(cache.add('new', [self.value]))
+        self.assertFalse(cache.add('new', None))
+        self.assertEqual(cache.get_many(['value', 'new', 'missing']),
+                         {'value': self.value, 'new': [self.value]})
+        self.assertEqual(cache.get('missing', 'default'), 'default')
+        # stored serialized, not pickled
+        self.assertTrue(all(isinstance(data, bytes) and not data.startswith(b'\x80')
+                            for data in cache._cache.values()))
+
+        cache.set('counter', 1)
+        self.assertEqual(cache.incr('counter', 5), 6)
+        self.assertEqual(cache.decr('counter'), 5)
+        self.assertEqual(cache.get('counter'), 5)
+        self.assertRaises(ValueError, cache.incr, 'missing')
+        cache.clear()
+
+    def test_bench(self):
+        results = bench.bench(['datetime'], size=10, repeat=1, number=1)
+        self.assertEqual([result['serializer'] for result in results], list(bench.SERIALIZERS))
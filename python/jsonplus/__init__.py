@@ -3,28 +3,31 @@
 # TODO: handle environments without threads
 # (Python compiled without thread support)
 
+# NOTE: to keep `import jsonplus` fast, optional and heavier dependencies
+# (`dateutil`, `moneyed`, `fractions`, `uuid`) are imported on first use, and
+# so are submodules implementing the less common functionality (see
+# `_lazy_attributes` below).
+
 import simplejson as json
-from operator import attrgetter
-from sortedcontainers import SortedList
 from datetime import datetime, timedelta, date, time
-from dateutil.parser import parse as parse_datetime
 from functools import wraps, partial
+from contextlib import contextmanager
 from operator import methodcaller
 from decimal import Decimal
-from fractions import Fraction
 from collections import namedtuple
+from bisect import bisect_right
+from weakref import WeakKeyDictionary
 import threading
-import uuid
-
-try:
-    from moneyed import Money, Currency
-except ImportError:
-    # defer failing to actual (de-)serialization
-    pass
+import binascii
+import sys
+import re
 
-__all__ = ["loads", "dumps", "load", "dump", "pretty",
+__all__ = ["loads", "dumps", "load", "dump", "iterdump", "iterload",
+           "dump_lines", "load_lines", "dumps_many", "loads_many",
+           "packb", "unpackb", "pretty",
            "json_loads", "json_dumps", "json_load", "json_dump",
-           "json_prettydump", "encoder", "decoder"]
+           "json_prettydump", "encoder", "decoder", "register_namedtuple",
+           "use_engine", "stats", "reset_stats", "enable_stats"]
 
 
 # Should we aim for the *exact* reproduction of Python types,
@@ -49,16 +52,49 @@ __all__ = ["loads", "dumps", "load", "dump", "pretty",
 # where `coding` is `jsonplus.EXACT` or `jsonplus.COMPAT`. Another way, maybe
 # simpler, is to use `jsonplus.prefer_exact()` and `jsonplus.prefer_compat()`.
 #
-# The preference is stored thread-local.
+# The preference is stored context-local (in a `contextvars.ContextVar`),
+# so it's local to a thread, as well as to an asyncio task. To select the
+# coding for a block of code only, use the `jsonplus.coding(coding)` context
+# manager. (On Python < 3.7, the preference is thread-local.)
 
 EXACT = 1
 COMPAT = 2
 CODING_DEFAULT = EXACT
 
-_local = threading.local()
+try:
+    from contextvars import ContextVar
+
+    _coding = ContextVar('jsonplus_coding', default=CODING_DEFAULT)
+
+    def prefer(coding):
+        _coding.set(coding)
+
+    _preferred_coding = _coding.get
+
+except ImportError:
+    _local = threading.local()
+
+    def prefer(coding):
+        _local.coding = coding
 
-def prefer(coding):
-    _local.coding = coding
+    def _preferred_coding():
+        return getattr(_local, 'coding', CODING_DEFAULT)
+
+@contextmanager
+def coding(coding):
+    """Context manager selecting the preferred `coding` (`EXACT` or `COMPAT`)
+    within its block, restoring the previous one on exit.
+
+    Example:
+        >>> with jsonplus.coding(jsonplus.COMPAT):
+        ...     jsonplus.dumps(datetime.now())
+    """
+    previous = _preferred_coding()
+    prefer(coding)
+    try:
+        yield
+    finally:
+        prefer(previous)
 
 def prefer_exact():
     prefer(EXACT)
@@ -110,12 +146,28 @@ def kwargified(constructor):
 _PredicatedEncoder = namedtuple('_PredicatedEncoder',
                                 'priority predicate encoder typename')
 
+
+class _PrioritizedList(list):
+    """List of predicated encoders, kept sorted by priority. Encoders of
+    equal priority are kept in order of addition."""
+
+    def __init__(self):
+        super(_PrioritizedList, self).__init__()
+        self._priorities = []
+
+    def add(self, item):
+        idx = bisect_right(self._priorities, item.priority)
+        self._priorities.insert(idx, item.priority)
+        self.insert(idx, item)
+
+
 def encoder(classname, predicate=None, priority=None, exact=True):
     """A decorator for registering a new encoder for object type
     defined either by a `classname`, or detected via `predicate`.
 
     Predicates are tested according to priority (low to high),
-    but always before classname.
+    but always before classname. The encoder found is cached per
+    object type, so predicates should depend only on ``type(obj)``.
 
     Args:
         classname (str):
@@ -167,42 +219,74 @@ def encoder(classname, predicate=None, priority=None, exact=True):
                 _PredicatedEncoder(priority, predicate, f, classname))
         else:
             subregistry['classname'].setdefault(classname, f)
+        # previously resolved types might now resolve to the new encoder
+        _encode_cache['exact' if exact else 'compat'].clear()
         return f
 
     return _decorator
 
 
-def _json_default_exact(obj):
-    """Serialization handlers for types unsupported by `simplejson` 
-    that try to preserve the exact data types.
+# Per-type cache of resolved encoders, one for each coding. Maps ``type(obj)``
+# to a ``(typename, encoder)`` pair, or to ``None`` if no encoder is registered
+# for that type. Invalidated on each new encoder registration. Types are
+# referenced weakly, so (dynamically created) classes can still be freed.
+_encode_cache = {'exact': WeakKeyDictionary(), 'compat': WeakKeyDictionary()}
+
+def _resolve_encoder(coding, obj):
+    """Find the encoder for `obj` in the `coding` ('exact' or 'compat')
+    subregistry. Predicates are tested first, then classname.
+
+    The result is cached per type of `obj`, so predicates are evaluated only
+    the first time an object of a certain type is encoded (predicates are
+    therefore assumed to depend on the object's type only).
     """
+    cls = type(obj)
+    cache = _encode_cache[coding]
+    try:
+        return cache[cls]
+    except KeyError:
+        pass
+
+    subregistry = _encode_handlers[coding]
+    handler = None
+    for candidate in subregistry['predicate']:
+        if candidate.predicate(obj):
+            handler = (candidate.typename, candidate.encoder)
+            break
+        if _profiling.enabled:
+            _profiling.predicate_miss(coding, candidate.typename)
+    else:
+        classname = cls.__name__
+        if classname in subregistry['classname']:
+            handler = (classname, subregistry['classname'][classname])
 
-    # first try predicate-based encoders
-    for handler in _encode_handlers['exact']['predicate']:
-        if handler.predicate(obj):
-            return {"__class__": handler.typename,
-                    "__value__": handler.encoder(obj)}
+    if handler is not None and _profiling.enabled:
+        typename, encode = handler
+        handler = (typename, _profiling.timed('encode_' + coding, typename, encode))
 
-    # then classname-based
-    classname = type(obj).__name__
-    if classname in _encode_handlers['exact']['classname']:
-        return {"__class__": classname,
-                "__value__": _encode_handlers['exact']['classname'][classname](obj)}
+    cache[cls] = handler
+    return handler
 
-    raise TypeError(repr(obj) + " is not JSON serializable")
+
+def _json_default_exact(obj):
+    """Serialization handlers for types unsupported by `simplejson` 
+    that try to preserve the exact data types.
+    """
+    handler = _resolve_encoder('exact', obj)
+    if handler is None:
+        raise TypeError(repr(obj) + " is not JSON serializable")
+    typename, encode = handler
+    return {"__class__": typename, "__value__": encode(obj)}
 
 
 def _json_default_compat(obj):
     """Serialization handlers that try to dump objects in
     compatibility mode. Similar to above.
     """
-    for handler in _encode_handlers['compat']['predicate']:
-        if handler.predicate(obj):
-            return handler.encoder(obj)
-    classname = type(obj).__name__
-    if classname in _encode_handlers['compat']['classname']:
-        return _encode_handlers['compat']['classname'][classname](obj)
-    raise TypeError(repr(obj) + " is not JSON serializable")
+    handler = _resolve_encoder('compat', obj)
+    if handler is None:
+        raise TypeError(repr(obj) + " is not JSON serializable")
+    return handler[1](obj)
 
 
 def decoder(classname):
@@ -238,7 +322,7 @@ def _encoder_default_args(kw):
     """Shape default arguments for encoding functions."""
     
     # manual override of the preferred coding with `exact=False`
-    if kw.pop('exact', getattr(_local, 'coding', CODING_DEFAULT) == EXACT):
+    if kw.pop('exact', _preferred_coding() == EXACT):
         # settings necessary for the "exact coding"
         kw.update({
             'default': _json_default_exact,
@@ -267,11 +351,18 @@ def _encoder_default_args(kw):
     # allow objects to provide json serialization on its behalf
     kw.setdefault('for_json', True)
 
+    # don't decode `bytes` as UTF-8 text, encode them with our encoders
+    if bytes is not str:
+        kw.setdefault('encoding', None)
+
 
 def _decoder_default_args(kw):
     """Shape default arguments for decoding functions."""
 
-    kw.update({'object_hook': _json_object_hook})
+    if _profiling.enabled:
+        kw.update({'object_hook': _profiling.object_hook})
+    else:
+        kw.update({'object_hook': _json_object_hook})
 
 
 
@@ -294,24 +385,108 @@ class JSONDecoder(json.JSONDecoder):
 
 
 
-def dumps(*pa, **kw):
-    _encoder_default_args(kw)
-    return json.dumps(*pa, **kw)
+def _text_keys(obj):
+    """`obj` with `bytes` keys of (nested) dicts decoded as UTF-8 text, copied
+    only where needed (i.e. `obj` itself is returned if there are none)."""
+    if isinstance(obj, dict):
+        items = [(key.decode('utf-8') if isinstance(key, bytes) else key, _text_keys(value))
+                 for key, value in obj.items()]
+        if all(item[0] is key and item[1] is value
+               for item, (key, value) in zip(items, obj.items())):
+            return obj
+        return dict(items)
+    if isinstance(obj, (list, tuple)):
+        values = [_text_keys(value) for value in obj]
+        if all(new is old for new, old in zip(values, obj)):
+            return obj
+        if isinstance(obj, list):
+            return values
+        if hasattr(obj, '_fields'):
+            return obj._make(values)
+        return type(obj)(values)
+    return obj
+
+
+def _has_bytes_keys(obj):
+    """True if there are `bytes` keys in (nested) dicts of `obj`, i.e. if
+    :func:`_text_keys` would convert it. Nothing is copied."""
+    stack, seen = [(obj,)], set()
+    while stack:
+        items = stack.pop()
+        if isinstance(items, dict):
+            if bytes in map(type, items):
+                return True
+            items = items.values()
+        for item in items:
+            if type(item) in _PLAIN_TYPES or not isinstance(item, (dict, list, tuple)):
+                continue
+            # (containers are visited once, so that walk ends on cycles, too)
+            if id(item) not in seen:
+                seen.add(id(item))
+                stack.append(item)
+    return False
+
+_PLAIN_TYPES = frozenset([type(None), bool, int, float, str, bytes])
+
+
+def _encode_text_keys(encode, obj, *pa, **kw):
+    """Encode `obj` with `encode`, encoding `bytes` keys as (UTF-8) text.
+
+    `simplejson` does that only if `bytes` values are encoded as text, too,
+    so, since they are not, `obj` is converted and encoded again, if (and
+    only if) encoding fails on keys, and there are such keys.
+    """
+    try:
+        return encode(obj, *pa, **kw)
+    except TypeError as exc:
+        # (e.g. "keys must be str, ..., not bytes")
+        if 'key' not in str(exc) or not _has_bytes_keys(obj):
+            raise
+    return encode(_text_keys(obj), *pa, **kw)
 
 
-def loads(*pa, **kw):
-    _decoder_default_args(kw)
-    return json.loads(*pa, **kw)
+def dumps(*pa, **kw):
+    engine = _get_engine(kw.pop('engine', None))
+    if kw.pop('compact', False) and kw.get('exact', _preferred_coding() == EXACT):
+        return _encode_text_keys(_compact_dumps, *pa, **kw)
+    return _encode_text_keys(engine.dumps, *pa, **kw)
+
+
+def loads(s, *pa, **kw):
+    name = kw.pop('engine', None)
+    engine = _get_engine(name)
+    lazy = kw.pop('lazy', False)
+    if lazy and name is not None and engine.name != 'simplejson':
+        raise TypeError("lazy decoding is supported only with the simplejson engine")
+    if _is_compact(s):
+        try:
+            value = _compact_loads(s, *pa, **dict(kw))
+        except _NotCompact:
+            pass
+        else:
+            if lazy:
+                raise TypeError("lazy decoding of documents in compact representation is not supported")
+            return value
+    if lazy:
+        return _lazy_loads(s, *pa, **kw)
+    return engine.loads(s, *pa, **kw)
 
 
-def dump(*pa, **kw):
-    _encoder_default_args(kw)
-    return json.dump(*pa, **kw)
+def dump(obj, fp, **kw):
+    engine = _get_engine(kw.pop('engine', None))
+    compact = kw.pop('compact', False)
+    if compact or not engine.iterative:
+        # compact representation can't be streamed (header comes first)
+        kw.pop('buffer_size', None)
+        fp.write(dumps(obj, engine=engine, compact=compact, **kw))
+        return
+    from jsonplus.stream import iterdump
+    for chunk in iterdump(obj, **kw):
+        fp.write(chunk)
 
 
-def load(*pa, **kw):
-    _decoder_default_args(kw)
-    return json.load(*pa, **kw)
+def load(fp, *pa, **kw):
+    return loads(fp.read(), *pa, **kw)
 
 
 def pretty(x, sort_keys=True, indent=4*' ', separators=(',', ': '), **kw):
@@ -345,7 +520,7 @@ _encode_handlers = {
             'UUID': partial(getattrs, attrs=['hex']),
             'Money': partial(getattrs, attrs=['amount', 'currency'])
         },
-        'predicate': SortedList(key=attrgetter('priority'))
+        'predicate': _PrioritizedList()
     },
     'compat': {
         'classname': {
@@ -360,24 +535,129 @@ _encode_handlers = {
             'Currency': str,
             'Money': str,
         },
-        'predicate': SortedList(key=attrgetter('priority'))
+        'predicate': _PrioritizedList()
     }
 }
 
 
+# Strict ISO 8601 parsing of `datetime`/`date`/`time` values, as produced by
+# their ``isoformat()`` on encoding. Uses ``fromisoformat()`` where available
+# (Python 3.7+), and a precompiled regex-based parser otherwise. Values not
+# conforming to the format are left to a (much slower) `dateutil` parser.
+
+try:
+    from datetime import timezone
+
+    def _fixed_offset(seconds):
+        return timezone(timedelta(seconds=seconds))
+
+except ImportError:
+    def _fixed_offset(seconds):
+        from dateutil.tz import tzoffset
+        return tzoffset(None, seconds)
+
+
+_ISO_DATE = r'(\d{4})-(\d{2})-(\d{2})'
+_ISO_TIME = (r'(\d{2}):(\d{2})(?::(\d{2})(?:\.(\d{1,6}))?)?'
+             r'(?:([+-])(\d{2}):(\d{2})(?::(\d{2}))?)?')
+
+_iso_date_match = re.compile(_ISO_DATE + r'\Z').match
+_iso_time_match = re.compile(_ISO_TIME + r'\Z').match
+_iso_datetime_match = re.compile(_ISO_DATE + r'[T ]' + _ISO_TIME + r'\Z').match
+
+def _iso_time_args(hour, minute, second, fraction,
+                   sign, offset_hour, offset_minute, offset_second):
+    args = [int(hour), int(minute), int(second or 0),
+            int((fraction or '0').ljust(6, '0'))]
+    tzinfo = None
+    if sign:
+        offset = (int(offset_hour) * 3600 + int(offset_minute) * 60 +
+                  int(offset_second or 0))
+        tzinfo = _fixed_offset(-offset if sign == '-' else offset)
+    return args, tzinfo
+
+def _regex_iso_datetime(value):
+    match = _iso_datetime_match(value)
+    if not match:
+        raise ValueError("Invalid isoformat string: %r" % value)
+    groups = match.groups()
+    args, tzinfo = _iso_time_args(*groups[3:])
+    return datetime(*[int(g) for g in groups[:3]] + args, tzinfo=tzinfo)
+
+def _regex_iso_date(value):
+    match = _iso_date_match(value)
+    if not match:
+        raise ValueError("Invalid isoformat string: %r" % value)
+    return date(*[int(g) for g in match.groups()])
+
+def _regex_iso_time(value):
+    match = _iso_time_match(value)
+    if not match:
+        raise ValueError("Invalid isoformat string: %r" % value)
+    args, tzinfo = _iso_time_args(*match.groups())
+    return time(*args, tzinfo=tzinfo)
+
+
+if hasattr(datetime, 'fromisoformat'):
+    _parse_iso_datetime = datetime.fromisoformat
+    _parse_iso_date = date.fromisoformat
+    _parse_iso_time = time.fromisoformat
+else:
+    _parse_iso_datetime = _regex_iso_datetime
+    _parse_iso_date = _regex_iso_date
+    _parse_iso_time = _regex_iso_time
+
+
+def parse_datetime(value):
+    """Parse `value` with the (slow, but lenient) `dateutil` parser."""
+    from dateutil.parser import parse
+    return parse(value)
+
+
+def _load_datetime(value):
+    try:
+        return _parse_iso_datetime(value)
+    except ValueError:
+        return parse_datetime(value)
+
+
+def _load_date(value):
+    try:
+        return _parse_iso_date(value)
+    except ValueError:
+        return parse_datetime(value).date()
+
+
+def _load_time(value):
+    try:
+        return _parse_iso_time(value)
+    except ValueError:
+        return parse_datetime(value).timetz()
+
+
+def _load_fraction(numerator, denominator):
+    from fractions import Fraction
+    return Fraction(numerator, denominator)
+
+
+def _load_uuid(hex):
+    from uuid import UUID
+    return UUID(hex)
+
+
 # all decode handlers are for EXACT decoding BY CLASSNAME
 _decode_handlers = {
-    'datetime': parse_datetime,
-    'date': lambda v: parse_datetime(v).date(),
-    'time': lambda v: parse_datetime(v).timetz(),
+    'datetime': _load_datetime,
+    'date': _load_date,
+    'time': _load_time,
     'timedelta': kwargified(timedelta),
     'tuple': tuple,
     'set': set,
     'frozenset': frozenset,
     'complex': kwargified(complex),
     'Decimal': Decimal,
-    'Fraction': kwargified(Fraction),
-    'UUID': kwargified(uuid.UUID)
+    'Fraction': kwargified(_load_fraction),
+    'UUID': kwargified(_load_uuid)
 }
 
 
@@ -388,9 +668,62 @@ def _dump_namedtuple(obj):
             "values": list(obj)}
 
 
+# Maximum number of namedtuple classes (re-)created on decoding, and cached
+# for reuse (least recently used classes are dropped first).
+NAMEDTUPLE_CACHE_SIZE = 256
+
+# namedtuple classes registered for decoding, by (name, fields)
+_namedtuple_classes = {}
+
+def register_namedtuple(cls):
+    """Register namedtuple class `cls` to be used for decoding of namedtuples
+    with the same name and fields (instead of creating a new class).
+    Can be used as a class decorator.
+
+    Example:
+        @jsonplus.register_namedtuple
+        class Point(namedtuple('Point', 'x y')):
+            def norm(self):
+                return math.hypot(self.x, self.y)
+
+        >>> jsonplus.loads(jsonplus.dumps(Point(3, 4))).norm()
+        5.0
+    """
+    _namedtuple_classes[(cls.__name__, tuple(cls._fields))] = cls
+    return cls
+
+
+try:
+    from functools import lru_cache
+except ImportError:
+    def lru_cache(maxsize):
+        """Bounded (but not LRU) cache, for Python 2."""
+        def _decorator(f):
+            cache = {}
+            @wraps(f)
+            def _cached(*pa):
+                try:
+                    return cache[pa]
+                except KeyError:
+                    if len(cache) >= maxsize:
+                        cache.clear()
+                    cache[pa] = result = f(*pa)
+                    return result
+            return _cached
+        return _decorator
+
+
+@lru_cache(maxsize=NAMEDTUPLE_CACHE_SIZE)
+def _make_namedtuple(name, fields):
+    return namedtuple(name, fields)
+
+
 @decoder('namedtuple')
 def _load_namedtuple(val):
-    cls = namedtuple(val['name'], val['fields'])
+    key = (val['name'], tuple(val['fields']))
+    cls = _namedtuple_classes.get(key)
+    if cls is None:
+        cls = _make_namedtuple(*key)
     return cls(*val['values'])
 
 
@@ -400,6 +733,63 @@ def _timedelta_total_seconds(td):
     return (td.microseconds + (td.seconds + td.days * 24 * 3600.0) * 10**6) / 10**6
 
 
+# Format of `bytes`, `bytearray` and `memoryview` values in the compat coding:
+# ``text`` (decoded as UTF-8, default), ``base64``, ``hex`` or ``array`` (list
+# of integers).
+BYTES_COMPAT_FORMAT = 'text'
+
+def _byte_view(obj):
+    """Flat view of bytes of a buffer `obj` (copied only if the buffer is
+    not contiguous)."""
+    view = memoryview(obj)
+    if not view.c_contiguous:
+        return memoryview(view.tobytes())
+    if view.ndim != 1 or view.format != 'B':
+        return view.cast('B')
+    return view
+
+def _b64encode(obj):
+    # `binascii` works on buffers directly, without copying them to `bytes`
+    return binascii.b2a_base64(_byte_view(obj), newline=False).decode('ascii')
+
+
+@encoder('bytes')
+@encoder('bytearray')
+@encoder('memoryview')
+def _dump_bytes(obj):
+    return _b64encode(obj)
+
+
+@encoder('bytes', exact=False)
+@encoder('bytearray', exact=False)
+@encoder('memoryview', exact=False)
+def _dump_bytes_compat(obj):
+    if BYTES_COMPAT_FORMAT == 'base64':
+        return _b64encode(obj)
+    if BYTES_COMPAT_FORMAT == 'hex':
+        return binascii.hexlify(_byte_view(obj)).decode('ascii')
+    if BYTES_COMPAT_FORMAT == 'text':
+        return str(_byte_view(obj), 'utf-8')
+    if BYTES_COMPAT_FORMAT == 'array':
+        return _byte_view(obj).tolist()
+    raise ValueError("Unknown bytes format: %r" % BYTES_COMPAT_FORMAT)
+
+
+@decoder('bytes')
+def _load_bytes(val):
+    return binascii.a2b_base64(val)
+
+
+@decoder('bytearray')
+def _load_bytearray(val):
+    return bytearray(binascii.a2b_base64(val))
+
+
+@decoder('memoryview')
+def _load_memoryview(val):
+    return memoryview(binascii.a2b_base64(val))
+
+
 @encoder('Currency')
 def _dump_currency(obj):
     """Serialize standard (ISO-defined) currencies to currency code only,
@@ -418,7 +808,7 @@ def _load_currency(val):
     """Deserialize string values as standard currencies, but
     manually define fully-defined currencies (with code/name/numeric/countries).
     """
-    from moneyed import get_currency
+    from moneyed import get_currency, Currency
     try:
         return get_currency(code=val)
     except:
@@ -429,4 +819,41 @@ def _load_currency(val):
 def _load_money(val):
     # wrap with function to delay Currency/Money
     # parsing if not installed (and not needed)
+    from moneyed import Money
     return Money(**val)
+
+
+from jsonplus import profiling as _profiling
+from jsonplus.profiling import stats, reset_stats, enable_stats
+from jsonplus.engines import get_engine as _get_engine, use_engine
+from jsonplus.compact import (dumps as _compact_dumps, loads as _compact_loads,
+                              is_compact as _is_compact, NotCompact as _NotCompact)
+from jsonplus.lazy import loads as _lazy_loads
+from jsonplus import numpy_coders, pandas_coders  # (NumPy and pandas are not imported)
+
+
+# public attributes provided by submodules imported on first access
+_lazy_attributes = {
+    'compile': 'jsonplus.compiler',
+    'iterdump': 'jsonplus.stream',
+    'iterload': 'jsonplus.stream',
+    'dump_lines': 'jsonplus.lines',
+    'load_lines': 'jsonplus.lines',
+    'dumps_many': 'jsonplus.lines',
+    'loads_many': 'jsonplus.lines',
+    'packb': 'jsonplus.binary',
+    'unpackb': 'jsonplus.binary',
+}
+
+def __getattr__(name):
+    module = _lazy_attributes.get(name)
+    if module is None:
+        raise AttributeError("module %r has no attribute %r" % (__name__, name))
+    __import__(module)
+    value = globals()[name] = getattr(sys.modules[module], name)
+    return value
+
+if sys.version_info < (3, 7):
+    # no module-level `__getattr__` (PEP 562), import eagerly
+    for _name in _lazy_attributes:
+        __getattr__(_name)
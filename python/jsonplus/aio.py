@@ -0,0 +1,183 @@
+"""Coroutine versions of jsonplus functions, for asyncio applications
+(Python 3.7+).
+
+Encoding and decoding of large payloads (above :data:`OFFLOAD_THRESHOLD`) is
+offloaded to an executor -- the event loop's default thread pool, or any
+``concurrent.futures.Executor`` set with :func:`use_executor` (or given per
+call) -- so the event loop isn't blocked meanwhile. With a process pool,
+values (and encoding arguments) must be picklable, and custom encoders must
+be registered in worker processes as well.
+
+The coding preferred (with :func:`jsonplus.prefer` or :func:`jsonplus.coding`)
+in the calling task is used regardless of where encoding runs.
+"""
+
+import asyncio
+from functools import partial
+from itertools import chain
+
+import jsonplus
+
+
+# Approximate size (in bytes of JSON) above which encoding and decoding is
+# offloaded to an executor.
+OFFLOAD_THRESHOLD = 64 * 1024
+
+_executor = None
+
+
+def use_executor(executor):
+    """Set the ``concurrent.futures.Executor`` to offload encoding and
+    decoding to (``None`` for the event loop's default executor)."""
+    global _executor
+    _executor = executor
+
+
+def _estimated_size(obj, limit):
+    """Rough estimate of the encoded size of `obj`, computed only up to
+    `limit` (so it takes time proportional to `limit` at most)."""
+    size = 0
+    # iterators of containers' items, consumed lazily, so that at most
+    # `limit` items are visited in total (each counts for a byte at least)
+    stack = [iter((obj,))]
+    while stack and size <= limit:
+        value = next(stack[-1], stack)
+        if value is stack:
+            stack.pop()
+        elif isinstance(value, (str, bytes, bytearray)):
+            size += len(value) + 2
+        elif isinstance(value, dict):
+            size += 2 + 4 * len(value)
+            stack.append(chain.from_iterable(value.items()))
+        elif isinstance(value, (list, tuple, set, frozenset)):
+            size += 2 + len(value)
+            stack.append(iter(value))
+        elif value is None or isinstance(value, (int, float)):
+            size += 8
+        else:
+            size += _opaque_size(value)
+    return size
+
+
+def _opaque_size(obj):
+    """Size estimate of `obj` encoded by a registered encoder: the size of
+    its data, for buffers (like `memoryview`), NumPy arrays and pandas
+    series and indexes (with ``nbytes``), and pandas frames (with
+    ``size``, the number of items)."""
+    nbytes = getattr(obj, 'nbytes', None)
+    if isinstance(nbytes, int):
+        return nbytes + 8
+    items = getattr(obj, 'size', None)
+    if isinstance(items, int):
+        return 8 * items + 8
+    return 8
+
+
+def _offload(size, threshold):
+    """True if a payload of `size` is to be offloaded (`size` can be
+    callable, evaluated only if needed)."""
+    if threshold is None:
+        return False
+    if not threshold:
+        return True
+    return (size() if callable(size) else size) > threshold
+
+
+def _with_coding(kw):
+    # fix the coding preferred in the calling context, since executors
+    # don't run functions in it (and processes don't share it anyway)
+    kw['exact'] = kw.get('exact', jsonplus._preferred_coding() == jsonplus.EXACT)
+    return kw
+
+
+def _dumps(obj, kw):
+    return jsonplus.dumps(obj, **kw)
+
+
+def _loads(s, kw):
+    return jsonplus.loads(s, **kw)
+
+
+async def _run(func, executor):
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(executor or _executor, func)
+
+
+async def dumps(obj, executor=None, threshold=OFFLOAD_THRESHOLD, **kw):
+    """Encode `obj` to JSON, like :func:`jsonplus.dumps`, in `executor` if
+    the (estimated) size of output is above `threshold` (``0`` to always
+    offload, ``None`` to never offload).
+    """
+    _with_coding(kw)
+    if not _offload(partial(_estimated_size, obj, threshold), threshold):
+        return _dumps(obj, kw)
+    return await _run(partial(_dumps, obj, kw), executor)
+
+
+async def loads(s, executor=None, threshold=OFFLOAD_THRESHOLD, **kw):
+    """Decode JSON document `s`, like :func:`jsonplus.loads`, in `executor`
+    if its length is above `threshold` (``0`` to always offload, ``None`` to
+    never offload).
+    """
+    if not _offload(len(s), threshold):
+        return _loads(s, kw)
+    return await _run(partial(_loads, s, kw), executor)
+
+
+async def dump(obj, writer, **kw):
+    """Encode `obj` to ``asyncio.StreamWriter`` `writer` (UTF-8 encoded),
+    iteratively (see :func:`jsonplus.iterdump`).
+
+    Chunks of output (of about ``buffer_size``) are written as they are
+    encoded, waiting for the writer to drain after each, so the event loop
+    is blocked only for the duration of encoding a single chunk, and memory
+    usage is bounded regardless of the size of output.
+    """
+    from jsonplus.stream import iterdump
+    for chunk in iterdump(obj, **_with_coding(kw)):
+        writer.write(chunk.encode('utf-8'))
+        await writer.drain()
+
+
+async def load(reader, executor=None, threshold=OFFLOAD_THRESHOLD, **kw):
+    """Read a JSON document from ``asyncio.StreamReader`` `reader` (until
+    EOF), and decode it (see :func:`loads`)."""
+    data = await reader.read()
+    return await loads(data.decode('utf-8'), executor=executor, threshold=threshold, **kw)
+
+
+async def dump_lines(values, writer, **kw):
+    """Encode `values` (an iterable, or an async iterable) to
+    ``asyncio.StreamWriter`` `writer` as JSON Lines (see
+    :func:`jsonplus.dump_lines`), one value at a time."""
+    if kw.get('indent') is not None:
+        raise ValueError("indent is not supported in JSON Lines")
+    _with_coding(kw)
+
+    async def write(value):
+        writer.write((jsonplus.dumps(value, **kw) + '\n').encode('utf-8'))
+        await writer.drain()
+
+    if hasattr(values, '__aiter__'):
+        async for value in values:
+            await write(value)
+    else:
+        for value in values:
+            await write(value)
+
+
+async def load_lines(reader, **kw):
+    """Decode JSON Lines from ``asyncio.StreamReader`` `reader`, yielding
+    decoded values one at a time (an async generator). Blank lines are
+    skipped.
+
+    Example:
+        >>> async for row in jsonplus.aio.load_lines(reader):
+        ...     process(row)
+    """
+    while True:
+        line = await reader.readline()
+        if not line:
+            return
+        if line.strip():
+            yield jsonplus.loads(line.decode('utf-8'), **kw)
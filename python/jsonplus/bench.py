@@ -0,0 +1,365 @@
+"""Benchmarks for jsonplus (de-)serialization.
+
+Run with::
+
+    $ python -m jsonplus.bench
+    $ python -m jsonplus.bench --json > results.json
+
+Workloads are deterministic (generated from a fixed seed), so results are
+comparable across runs, releases and engines. For each workload and coding
+(exact and compat), encoding and decoding are measured, and reported as
+operations (``dumps``/``loads`` calls) per second, megabytes (of JSON) per
+second, and peak memory allocated during a single operation.
+"""
+
+from __future__ import print_function
+
+from collections import namedtuple, OrderedDict
+from datetime import datetime, timedelta
+from decimal import Decimal
+from fractions import Fraction
+import argparse
+import platform
+import random
+import sys
+import timeit
+import tracemalloc
+import uuid
+
+from dateutil.parser import parse as parse_datetime
+
+import jsonplus
+
+
+SEED = 2017
+DEFAULT_SIZE = 1000
+DEFAULT_REPEAT = 5
+
+_START = datetime(2017, 2, 17, 2, 41, 4, 390605)
+
+Point = namedtuple('Point', 'x y z')
+
+
+def _flat_dict(rnd, size):
+    return dict(("key%d" % i, rnd.choice([i, "value%d" % i, i / 7.0, None, True]))
+                for i in range(size))
+
+
+def _nested_dict(rnd, size, depth=4):
+    def node(level):
+        if level == depth:
+            return [rnd.randint(0, 10**6), "leaf", rnd.random()]
+        return dict(("n%d" % i, node(level + 1)) for i in range(fanout))
+    # fanout so that the number of leaves approximates size
+    fanout = max(2, int(round(size ** (1.0 / depth))))
+    return node(0)
+
+
+def _rows(rnd, size):
+    """Records of plain JSON types only."""
+    return [{"id": i, "name": "row %d" % i, "score": rnd.random(),
+             "count": rnd.randint(0, 1000), "active": rnd.random() < 0.5,
+             "tags": ["a%d" % (i % 5), "b%d" % (i % 3)], "parent": None}
+            for i in range(size // 10 or 1)]
+
+
+def _datetimes(rnd, size):
+    return [_START + timedelta(seconds=rnd.randint(0, 10**8),
+                               microseconds=rnd.randint(0, 10**6))
+            for _ in range(size)]
+
+
+def _decimals(rnd, size):
+    return [Decimal(rnd.randint(-10**8, 10**8)).scaleb(-rnd.randint(0, 6))
+            for _ in range(size)]
+
+
+def _namedtuples(rnd, size):
+    return [Point(rnd.randint(0, 100), rnd.random(), "p%d" % i) for i in range(size)]
+
+
+def _money(rnd, size):
+    from moneyed import Money
+    return [Money(Decimal(rnd.randint(0, 10**6)).scaleb(-2), rnd.choice(['EUR', 'USD', 'GBP']))
+            for _ in range(size)]
+
+
+def _sets(rnd, size):
+    return [set(rnd.sample(range(1000), 10)) for _ in range(size // 10 or 1)]
+
+
+def _mixed(rnd, size):
+    """Records with values of (almost) all types supported out of the box."""
+    return [{
+        "id": i,
+        "uuid": uuid.UUID(int=rnd.getrandbits(128)),
+        "ts": _START + timedelta(seconds=rnd.randint(0, 10**8)),
+        "date": (_START + timedelta(days=rnd.randint(0, 1000))).date(),
+        "time": (_START + timedelta(seconds=rnd.randint(0, 86400))).time(),
+        "duration": timedelta(seconds=rnd.randint(0, 10**6)),
+        "price": Decimal(rnd.randint(0, 10**6)).scaleb(-2),
+        "ratio": Fraction(rnd.randint(1, 100), rnd.randint(1, 100)),
+        "complex": complex(rnd.random(), rnd.random()),
+        "point": Point(rnd.random(), rnd.random(), i),
+        "pair": (i, "x"),
+        "tags": frozenset(["a%d" % (i % 5), "b%d" % (i % 3)]),
+        "name": "record %d" % i,
+        "score": rnd.random(),
+        "flags": [True, False, None],
+    } for i in range(size // 10 or 1)]
+
+
+def _large(rnd, size):
+    return {"rows": _mixed(rnd, size * 100), "meta": _flat_dict(rnd, size)}
+
+
+# workload name -> payload generator, receiving `random.Random` and `size`
+WORKLOADS = OrderedDict([
+    ('flat_dict', _flat_dict),
+    ('nested_dict', _nested_dict),
+    ('rows', _rows),
+    ('datetime', _datetimes),
+    ('Decimal', _decimals),
+    ('namedtuple', _namedtuples),
+    ('Money', _money),
+    ('set', _sets),
+    ('mixed', _mixed),
+    ('large', _large),
+])
+
+CODINGS = ('exact', 'compat')
+
+
+def _rate(func, repeat, number=None):
+    """Best-of-`repeat` rate (calls per second) of `func()`, called `number`
+    times per repetition (determined automatically by default)."""
+    timer = timeit.Timer(func)
+    if not number:
+        number, _ = timer.autorange()
+    best = min(timer.repeat(number=number, repeat=repeat))
+    return number / best
+
+
+def _peak_memory(func):
+    """Peak memory (in bytes) allocated during a single `func()` call."""
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def bench_workload(name, coding='exact', size=DEFAULT_SIZE,
+                   repeat=DEFAULT_REPEAT, number=None, **kw):
+    """Benchmark encoding and decoding of the workload `name` in `coding`.
+
+    Args:
+        name (str):
+            Workload name, a key of :data:`WORKLOADS`.
+
+        coding (str, default='exact'):
+            Either ``exact`` or ``compat``.
+
+        size (int, default=1000):
+            Workload size (approximate number of values).
+
+        repeat (int, default=5):
+            Number of timing repetitions (the best one is reported).
+
+        number (int, default=None):
+            Number of operations per repetition. By default, determined
+            so that a repetition takes at least 0.2 seconds.
+
+        **kw:
+            Keyword arguments passed to :func:`jsonplus.dumps` and
+            :func:`jsonplus.loads`, e.g. ``engine``.
+
+    Returns:
+        `list` of two `dict` results, for ``encode`` and ``decode``.
+    """
+    payload = WORKLOADS[name](random.Random(SEED), size)
+    exact = coding == 'exact'
+    encoded = jsonplus.dumps(payload, exact=exact, **kw)
+    nbytes = len(encoded.encode('utf-8'))
+
+    operations = [
+        ('encode', lambda: jsonplus.dumps(payload, exact=exact, **kw)),
+        ('decode', lambda: jsonplus.loads(encoded, **kw)),
+    ]
+    results = []
+    for operation, func in operations:
+        rate = _rate(func, repeat, number)
+        results.append(OrderedDict([
+            ('workload', name),
+            ('coding', coding),
+            ('operation', operation),
+            ('bytes', nbytes),
+            ('ops_per_sec', rate),
+            ('mb_per_sec', rate * nbytes / 1e6),
+            ('peak_memory', _peak_memory(func)),
+        ]))
+    return results
+
+
+def bench(workloads=None, codings=CODINGS, size=DEFAULT_SIZE,
+          repeat=DEFAULT_REPEAT, number=None, **kw):
+    """Benchmark `workloads` (all by default) in all `codings`.
+    See :func:`bench_workload` for arguments.
+
+    Returns:
+        `list` of `dict` results.
+    """
+    results = []
+    for name in workloads or WORKLOADS:
+        for coding in codings:
+            results.extend(bench_workload(name, coding, size=size, repeat=repeat,
+                                          number=number, **kw))
+    return results
+
+
+def _measure(func, values, repeat):
+    """Best-of-`repeat` rate (values per second) of applying `func` to
+    each of `values`."""
+    best = min(timeit.repeat(lambda: [func(v) for v in values],
+                             number=1, repeat=repeat))
+    return len(values) / best
+
+
+def bench_iso8601(n=10000, repeat=5):
+    """Compare the strict ISO 8601 decoders of `datetime`/`date`/`time`
+    against the generic `dateutil` parser, on `n` values of each type.
+
+    Returns:
+        `dict` of typename -> (fast rate, dateutil rate), with rates given
+        in decoded values per second.
+    """
+    start = datetime(2017, 2, 17, 2, 41, 4, 390605)
+    timestamps = [start + timedelta(seconds=i * 3607.1) for i in range(n)]
+    workloads = [
+        ('datetime', [t.isoformat() for t in timestamps],
+         jsonplus._load_datetime, parse_datetime),
+        ('date', [t.date().isoformat() for t in timestamps],
+         jsonplus._load_date, lambda v: parse_datetime(v).date()),
+        ('time', [t.time().isoformat() for t in timestamps],
+         jsonplus._load_time, lambda v: parse_datetime(v).timetz()),
+    ]
+
+    results = {}
+    for typename, values, fast, generic in workloads:
+        results[typename] = (_measure(fast, values, repeat),
+                             _measure(generic, values, repeat))
+    return results
+
+
+def bench_engines(workloads=('rows', 'mixed'), coding='compat', size=DEFAULT_SIZE,
+                  repeat=DEFAULT_REPEAT, number=None):
+    """Compare encoding rates of all engines installed (see
+    :mod:`jsonplus.engines`) on `workloads`, in `coding`.
+
+    Returns:
+        `dict` of workload -> engine -> rate (``dumps`` calls per second).
+    """
+    from jsonplus.engines import ENGINES, get_engine
+    engines = []
+    for engine in ENGINES:
+        try:
+            get_engine(engine)
+        except ImportError:
+            continue
+        engines.append(engine)
+
+    exact = coding == 'exact'
+    results = OrderedDict()
+    for name in workloads:
+        payload = WORKLOADS[name](random.Random(SEED), size)
+        results[name] = OrderedDict(
+            (engine, _rate(lambda: jsonplus.dumps(payload, exact=exact, engine=engine),
+                           repeat, number))
+            for engine in engines)
+    return results
+
+
+def _environment(args):
+    return OrderedDict([
+        ('python', platform.python_version()),
+        ('implementation', platform.python_implementation()),
+        ('platform', platform.platform()),
+        ('engine', args.engine),
+        ('size', args.size),
+        ('repeat', args.repeat),
+        ('number', args.number),
+        ('seed', SEED),
+    ])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m jsonplus.bench',
+                                     description="Benchmark jsonplus encoding and decoding.")
+    parser.add_argument('-w', '--workload', action='append', choices=list(WORKLOADS),
+                        help="workload to run (can be repeated, default: all)")
+    parser.add_argument('-c', '--coding', action='append', choices=CODINGS,
+                        help="coding to run (can be repeated, default: all)")
+    parser.add_argument('-n', '--size', type=int, default=DEFAULT_SIZE,
+                        help="workload size (default: %(default)s)")
+    parser.add_argument('-r', '--repeat', type=int, default=DEFAULT_REPEAT,
+                        help="timing repetitions (default: %(default)s)")
+    parser.add_argument('--number', type=int,
+                        help="operations per repetition (default: automatic)")
+    parser.add_argument('-e', '--engine', default='simplejson',
+                        help="JSON engine (default: %(default)s)")
+    parser.add_argument('--iso8601', action='store_true',
+                        help="include ISO 8601 parsers comparison")
+    parser.add_argument('--engines', action='store_true',
+                        help="include engines comparison (encoding)")
+    parser.add_argument('--json', action='store_true',
+                        help="output results as JSON")
+    args = parser.parse_args(argv)
+
+    results = bench(args.workload, args.coding or CODINGS, size=args.size,
+                    repeat=args.repeat, number=args.number, engine=args.engine)
+    iso8601 = bench_iso8601(repeat=args.repeat) if args.iso8601 else None
+    engines = None
+    if args.engines:
+        engines = dict((coding, bench_engines(coding=coding, size=args.size,
+                                              repeat=args.repeat, number=args.number))
+                       for coding in args.coding or CODINGS)
+
+    if args.json:
+        report = OrderedDict([('environment', _environment(args)),
+                              ('results', results)])
+        if iso8601:
+            report['iso8601'] = dict((typename, {"fast": fast, "dateutil": generic})
+                                     for typename, (fast, generic) in iso8601.items())
+        if engines:
+            report['engines'] = engines
+        jsonplus.json.dump(report, sys.stdout, indent=2)
+        print()
+        return
+
+    print("%-12s %-7s %-7s %12s %10s %12s" % (
+        "workload", "coding", "op", "ops/s", "MB/s", "peak KiB"))
+    for result in results:
+        print("%-12s %-7s %-7s %12.1f %10.2f %12.1f" % (
+            result['workload'], result['coding'], result['operation'],
+            result['ops_per_sec'], result['mb_per_sec'], result['peak_memory'] / 1024.0))
+
+    if iso8601:
+        print()
+        print("ISO 8601 decoding (values/s):")
+        for typename, (fast, generic) in sorted(iso8601.items()):
+            print("  %-10s fast: %12.0f   dateutil: %12.0f   speedup: %6.1fx"
+                  % (typename, fast, generic, fast / generic))
+
+    if engines:
+        print()
+        print("Encoding by engine (ops/s, and speedup over simplejson):")
+        for coding, workloads in sorted(engines.items()):
+            for name, rates in workloads.items():
+                print("  %-7s %-12s %s" % (coding, name, "  ".join(
+                    "%s: %.1f (%.2fx)" % (engine, rate, rate / rates['simplejson'])
+                    for engine, rate in rates.items())))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,462 @@
+"""Binary (MessagePack) exact coding, sharing the jsonplus registry.
+
+Basic types (``None``, ``bool``, ``int``, ``float``, ``str``, ``bytes``,
+``list`` and ``dict``) are encoded as native MessagePack types. `datetime`,
+`date`, `time`, `Decimal` and `UUID` are encoded as MessagePack extension
+types with compact binary payloads, and all other types are encoded with
+exact encoders from the registry (see :func:`jsonplus.encoder`), tagged with
+their classname, and decoded with registered decoders.
+
+If the `msgpack` package is installed, it is used for (de-)serialization,
+otherwise a pure-Python implementation is used. Both produce identical
+output. Integers must fit in 64 bits.
+"""
+
+from datetime import datetime, date, time, timedelta
+from decimal import Decimal
+import struct
+import uuid
+
+import jsonplus
+
+
+_text_type = type(u'')
+
+# extension type codes
+EXT_TAGGED = 0
+EXT_DATETIME = 1
+EXT_DATE = 2
+EXT_TIME = 3
+EXT_DECIMAL = 4
+EXT_UUID = 5
+
+
+_date = struct.Struct('>HBB')
+_time = struct.Struct('>BBBI')
+_datetime = struct.Struct('>HBBBBBI')
+_offset = struct.Struct('>q')
+
+
+def _pack_offset(value):
+    offset = value.utcoffset()
+    if offset is None:
+        return b''
+    return _offset.pack((offset.days * 86400 + offset.seconds) * 10**6 +
+                        offset.microseconds)
+
+def _unpack_offset(data, size):
+    if len(data) == size:
+        return None
+    microseconds, = _offset.unpack_from(data, size)
+    return jsonplus._fixed_offset(timedelta(microseconds=microseconds).total_seconds())
+
+
+def _pack_datetime(value):
+    return _datetime.pack(value.year, value.month, value.day, value.hour,
+                          value.minute, value.second, value.microsecond) + \
+        _pack_offset(value)
+
+def _unpack_datetime(data):
+    return datetime(*_datetime.unpack_from(data),
+                    tzinfo=_unpack_offset(data, _datetime.size))
+
+
+def _pack_date(value):
+    return _date.pack(value.year, value.month, value.day)
+
+def _unpack_date(data):
+    return date(*_date.unpack_from(data))
+
+
+def _pack_time(value):
+    return _time.pack(value.hour, value.minute, value.second,
+                      value.microsecond) + _pack_offset(value)
+
+def _unpack_time(data):
+    return time(*_time.unpack_from(data), tzinfo=_unpack_offset(data, _time.size))
+
+
+def _pack_decimal(value):
+    return str(value).encode('ascii')
+
+def _unpack_decimal(data):
+    return Decimal(bytes(data).decode('ascii'))
+
+
+def _pack_uuid(value):
+    return value.bytes
+
+def _unpack_uuid(data):
+    return uuid.UUID(bytes=bytes(data))
+
+
+# native extension types, by exact type
+_ext_encoders = {
+    datetime: (EXT_DATETIME, _pack_datetime),
+    date: (EXT_DATE, _pack_date),
+    time: (EXT_TIME, _pack_time),
+    Decimal: (EXT_DECIMAL, _pack_decimal),
+    uuid.UUID: (EXT_UUID, _pack_uuid),
+}
+
+_ext_decoders = {
+    EXT_DATETIME: _unpack_datetime,
+    EXT_DATE: _unpack_date,
+    EXT_TIME: _unpack_time,
+    EXT_DECIMAL: _unpack_decimal,
+    EXT_UUID: _unpack_uuid,
+}
+
+
+def _encode_tagged(obj):
+    """Encode `obj` with a registered exact encoder, as ``[typename, value]``,
+    or return ``None`` if there's no encoder registered."""
+    handler = jsonplus._resolve_encoder('exact', obj)
+    if handler is None:
+        return None
+    typename, encode = handler
+    return [typename, encode(obj)]
+
+
+def _decode_tagged(data):
+    typename, value = unpackb(data)
+    constructor = jsonplus._decode_handlers.get(typename)
+    if constructor:
+        if jsonplus._profiling.enabled:
+            return jsonplus._profiling.call('decode', typename, constructor, value)
+        return constructor(value)
+    raise TypeError("Unknown class: '%s'" % typename)
+
+
+def _as_native(obj):
+    """Coerce instance of a subclass of a native type to that type,
+    or return ``None``."""
+    for cls in (dict, list, _text_type, bytes, float):
+        if isinstance(obj, cls):
+            return cls(obj)
+    if isinstance(obj, int):
+        return int(obj)
+    return None
+
+
+def _ext_hook(code, data):
+    if code == EXT_TAGGED:
+        return _decode_tagged(data)
+    return _ext_decoders[code](data)
+
+
+class _Packer(object):
+    """Pure-Python MessagePack packer."""
+
+    def __init__(self):
+        self.out = []
+
+    def pack(self, obj):
+        write = self.out.append
+        cls = type(obj)
+
+        if obj is None:
+            write(b'\xc0')
+        elif obj is True:
+            write(b'\xc3')
+        elif obj is False:
+            write(b'\xc2')
+        elif cls is int:
+            self.pack_int(obj)
+        elif cls is float:
+            write(struct.pack('>Bd', 0xcb, obj))
+        elif cls is _text_type:
+            data = obj.encode('utf-8')
+            self.pack_header(len(data), 0xa0, 32, 0xd9, 0xda, 0xdb)
+            write(data)
+        elif cls is bytes:
+            self.pack_header(len(obj), None, 0, 0xc4, 0xc5, 0xc6)
+            write(obj)
+        elif cls is list:
+            self.pack_header(len(obj), 0x90, 16, None, 0xdc, 0xdd)
+            for item in obj:
+                self.pack(item)
+        elif cls is dict:
+            self.pack_header(len(obj), 0x80, 16, None, 0xde, 0xdf)
+            for key, value in obj.items():
+                self.pack(key)
+                self.pack(value)
+        elif cls in _ext_encoders:
+            code, encode = _ext_encoders[cls]
+            self.pack_ext(code, encode(obj))
+        else:
+            tagged = _encode_tagged(obj)
+            if tagged is not None:
+                self.pack_ext(EXT_TAGGED, _Packer().packb(tagged))
+                return
+            native = _as_native(obj)
+            if native is None:
+                raise TypeError(repr(obj) + " is not serializable")
+            self.pack(native)
+
+    def pack_int(self, n):
+        write = self.out.append
+        if 0 <= n < 0x80:
+            write(struct.pack('>B', n))
+        elif -0x20 <= n < 0:
+            write(struct.pack('>b', n))
+        elif n > 0:
+            if n <= 0xff:
+                write(struct.pack('>BB', 0xcc, n))
+            elif n <= 0xffff:
+                write(struct.pack('>BH', 0xcd, n))
+            elif n <= 0xffffffff:
+                write(struct.pack('>BI', 0xce, n))
+            elif n <= 0xffffffffffffffff:
+                write(struct.pack('>BQ', 0xcf, n))
+            else:
+                raise OverflowError("Integer value out of range")
+        else:
+            if n >= -0x80:
+                write(struct.pack('>Bb', 0xd0, n))
+            elif n >= -0x8000:
+                write(struct.pack('>Bh', 0xd1, n))
+            elif n >= -0x80000000:
+                write(struct.pack('>Bi', 0xd2, n))
+            elif n >= -0x8000000000000000:
+                write(struct.pack('>Bq', 0xd3, n))
+            else:
+                raise OverflowError("Integer value out of range")
+
+    def pack_header(self, size, fix, fixlimit, code8, code16, code32):
+        write = self.out.append
+        if size < fixlimit:
+            write(struct.pack('>B', fix | size))
+        elif code8 is not None and size <= 0xff:
+            write(struct.pack('>BB', code8, size))
+        elif size <= 0xffff:
+            write(struct.pack('>BH', code16, size))
+        elif size <= 0xffffffff:
+            write(struct.pack('>BI', code32, size))
+        else:
+            raise ValueError("Object too large")
+
+    def pack_ext(self, code, data):
+        write = self.out.append
+        size = len(data)
+        fixext = {1: 0xd4, 2: 0xd5, 4: 0xd6, 8: 0xd7, 16: 0xd8}.get(size)
+        if fixext is not None:
+            write(struct.pack('>Bb', fixext, code))
+        elif size <= 0xff:
+            write(struct.pack('>BBb', 0xc7, size, code))
+        elif size <= 0xffff:
+            write(struct.pack('>BHb', 0xc8, size, code))
+        else:
+            write(struct.pack('>BIb', 0xc9, size, code))
+        write(data)
+
+    def packb(self, obj):
+        self.pack(obj)
+        return b''.join(self.out)
+
+
+class _Unpacker(object):
+    """Pure-Python MessagePack unpacker."""
+
+    # (struct format, size) of sized values, by type byte
+    _fixed = {
+        0xca: ('>f', 4), 0xcb: ('>d', 8),
+        0xcc: ('>B', 1), 0xcd: ('>H', 2), 0xce: ('>I', 4), 0xcf: ('>Q', 8),
+        0xd0: ('>b', 1), 0xd1: ('>h', 2), 0xd2: ('>i', 4), 0xd3: ('>q', 8),
+    }
+    # (kind, size struct format) of variable-length values, by type byte
+    _sized = {
+        0xc4: ('bin', '>B'), 0xc5: ('bin', '>H'), 0xc6: ('bin', '>I'),
+        0xc7: ('ext', '>B'), 0xc8: ('ext', '>H'), 0xc9: ('ext', '>I'),
+        0xd9: ('str', '>B'), 0xda: ('str', '>H'), 0xdb: ('str', '>I'),
+        0xdc: ('array', '>H'), 0xdd: ('array', '>I'),
+        0xde: ('map', '>H'), 0xdf: ('map', '>I'),
+    }
+    _fixext = {0xd4: 1, 0xd5: 2, 0xd6: 4, 0xd7: 8, 0xd8: 16}
+
+    def __init__(self, data):
+        self.data = bytearray(data)
+        self.pos = 0
+
+    def read(self, size):
+        start = self.pos
+        self.pos += size
+        if self.pos > len(self.data):
+            raise ValueError("Unexpected end of data")
+        return self.data[start:self.pos]
+
+    def read_struct(self, fmt, size):
+        value, = struct.unpack_from(fmt, self.data, self.pos)
+        self.pos += size
+        return value
+
+    def unpack(self):
+        code = self.read_struct('>B', 1)
+
+        if code <= 0x7f:
+            return code
+        if code >= 0xe0:
+            return code - 0x100
+        if code <= 0x8f:
+            return self.unpack_map(code & 0x0f)
+        if code <= 0x9f:
+            return self.unpack_array(code & 0x0f)
+        if code <= 0xbf:
+            return bytes(self.read(code & 0x1f)).decode('utf-8')
+        if code == 0xc0:
+            return None
+        if code == 0xc2:
+            return False
+        if code == 0xc3:
+            return True
+        if code in self._fixed:
+            return self.read_struct(*self._fixed[code])
+        if code in self._fixext:
+            ext = self.read_struct('>b', 1)
+            return _ext_hook(ext, bytes(self.read(self._fixext[code])))
+        if code in self._sized:
+            kind, fmt = self._sized[code]
+            size = self.read_struct(fmt, struct.calcsize(fmt))
+            if kind == 'bin':
+                return bytes(self.read(size))
+            if kind == 'str':
+                return bytes(self.read(size)).decode('utf-8')
+            if kind == 'array':
+                return self.unpack_array(size)
+            if kind == 'map':
+                return self.unpack_map(size)
+            ext = self.read_struct('>b', 1)
+            return _ext_hook(ext, bytes(self.read(size)))
+        raise ValueError("Invalid type byte: 0x%02x" % code)
+
+    def unpack_array(self, size):
+        return [self.unpack() for _ in range(size)]
+
+    def unpack_map(self, size):
+        result = {}
+        for _ in range(size):
+            key = self.unpack()
+            result[key] = self.unpack()
+        return result
+
+    def unpackb(self):
+        obj = self.unpack()
+        if self.pos != len(self.data):
+            raise ValueError("Extra data")
+        return obj
+
+
+class _Buffer(object):
+    """Wrapper of a `bytearray` or `memoryview`, forwarded by `msgpack` to
+    :func:`_msgpack_default` (unlike the bare value, which `msgpack` packs as
+    ``bytes``, regardless of ``strict_types``)."""
+    __slots__ = ('value',)
+
+    def __init__(self, value):
+        self.value = value
+
+
+def _wrap_buffers(obj):
+    """Copy of `obj` with `bytearray` and `memoryview` values (in lists and
+    dicts) wrapped in `_Buffer`. Other containers (like tuples) are packed
+    through :func:`_msgpack_default`, and wrapped there."""
+    cls = type(obj)
+    if cls is list:
+        return [_wrap_buffers(item) for item in obj]
+    if cls is dict:
+        return dict((_wrap_buffers(key), _wrap_buffers(value))
+                    for key, value in obj.items())
+    if cls is bytearray or cls is memoryview:
+        return _Buffer(obj)
+    return obj
+
+
+def _has_bin(data):
+    """True if packed `data` might contain bin values (it contains a byte
+    with a bin type code, which is also often just a part of other values)."""
+    return b'\xc4' in data or b'\xc5' in data or b'\xc6' in data
+
+
+def _has_buffers(obj):
+    """True if there are `bytearray` or `memoryview` values (or keys) in
+    lists and dicts of `obj` (see :func:`_wrap_buffers`)."""
+    stack = [obj]
+    while stack:
+        items = stack.pop()
+        if type(items) is dict:
+            for key in items:
+                if type(key) is memoryview:
+                    return True
+            items = items.values()
+        for item in items:
+            cls = type(item)
+            if cls is dict or cls is list:
+                stack.append(item)
+            elif cls is bytearray or cls is memoryview:
+                return True
+    return False
+
+
+def _msgpack_packb(obj):
+    return _msgpack.packb(obj, default=_msgpack_default,
+                          use_bin_type=True, strict_types=True)
+
+
+def _msgpack_default(obj):
+    if type(obj) is _Buffer:
+        obj = obj.value
+    ext = _ext_encoders.get(type(obj))
+    if ext is not None:
+        code, encode = ext
+        return _msgpack.ExtType(code, encode(obj))
+    tagged = _encode_tagged(obj)
+    if tagged is not None:
+        return _msgpack.ExtType(EXT_TAGGED, packb(tagged))
+    native = _as_native(obj)
+    if native is None:
+        raise TypeError(repr(obj) + " is not serializable")
+    return native
+
+
+try:
+    import msgpack as _msgpack
+except ImportError:
+    _msgpack = None
+
+
+def packb(obj, accelerated=True):
+    """Serialize `obj` to bytes, in exact (binary) coding.
+
+    Args:
+        obj (object):
+            Object to serialize.
+
+        accelerated (bool, default=True):
+            Use the `msgpack` package, if installed.
+    """
+    if accelerated and _msgpack is not None:
+        data = _msgpack_packb(obj)
+        # `bytearray` and `memoryview` are packed as bin by `msgpack`, but
+        # they are tagged (as in the pure-Python packer), so if there might
+        # be any bin values, `obj` is checked for them (by type only), and
+        # it's copied and packed again only if there are any
+        if _has_bin(data) and _has_buffers([obj]):
+            data = _msgpack_packb(_wrap_buffers(obj))
+        return data
+    return _Packer().packb(obj)
+
+
+def unpackb(data, accelerated=True):
+    """Deserialize `data` (bytes) serialized with :func:`packb`.
+
+    Args:
+        data (bytes):
+            Data to deserialize.
+
+        accelerated (bool, default=True):
+            Use the `msgpack` package, if installed.
+    """
+    if accelerated and _msgpack is not None:
+        return _msgpack.unpackb(data, ext_hook=_ext_hook, raw=False,
+                                strict_map_key=False)
+    return _Unpacker(data).unpackb()
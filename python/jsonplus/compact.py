@@ -0,0 +1,169 @@
+"""Compact representation of the exact coding.
+
+Instead of tagging each value with its full classname::
+
+    {"__class__": "datetime", "__value__": "2017-02-17T02:41:04.390605"}
+
+values are tagged with a (small integer) index into a table of classnames,
+stored once, in the document header::
+
+    {"__t__": [0, "2017-02-17T02:41:04.390605"]}
+
+Namedtuples are encoded as a list of values, prefixed with an index into a
+table of namedtuple schemas (name and fields), also stored in the header.
+The complete document looks like::
+
+    {"__jsonplus__": {"version": 1, "classes": [...], "schemas": [...]},
+     "__data__": ...}
+
+Documents in compact representation are detected (and decoded) by
+:func:`jsonplus.loads` automatically. Regular documents that merely look like
+compact ones (e.g. with a ``__jsonplus__`` key first, but without the exact
+header, or with tags referring to missing table entries) are decoded as usual.
+"""
+
+import jsonplus
+from jsonplus import json
+from jsonplus.memo import memoize
+
+
+# version of the compact representation, first in the header
+VERSION = 1
+
+_PREFIX = '{"__jsonplus__":'
+_HEADER_PREFIX = _PREFIX + '{"version":%d,"classes":[' % VERSION
+_HEADER_PREFIX_BYTES = _HEADER_PREFIX.encode('ascii')
+
+
+class NotCompact(ValueError):
+    """Raised on decoding a document that is not in compact representation
+    after all (see :func:`is_compact`)."""
+
+
+def is_compact(s):
+    """Check if JSON string (or bytes) `s` is (likely) in compact
+    representation, by its header."""
+    if isinstance(s, bytes):
+        return s.startswith(_HEADER_PREFIX_BYTES)
+    return s.startswith(_HEADER_PREFIX)
+
+
+def _entry(table, idx):
+    """Entry `idx` of a header `table`, validated."""
+    if type(idx) is not int or not 0 <= idx < len(table):
+        raise NotCompact("Invalid compact table index: %r" % (idx,))
+    return table[idx]
+
+
+class _Encoder(object):
+    """Builds classname and namedtuple schema tables while encoding
+    a single document."""
+
+    def __init__(self):
+        self.classes = []
+        self.class_ids = {}
+        self.schemas = []
+        self.schema_ids = {}
+
+    def class_id(self, classname):
+        try:
+            return self.class_ids[classname]
+        except KeyError:
+            self.classes.append(classname)
+            cid = self.class_ids[classname] = len(self.classes) - 1
+            return cid
+
+    def schema_id(self, name, fields):
+        key = (name, tuple(fields))
+        try:
+            return self.schema_ids[key]
+        except KeyError:
+            self.schemas.append([name, list(fields)])
+            sid = self.schema_ids[key] = len(self.schemas) - 1
+            return sid
+
+    def default(self, obj):
+        handler = jsonplus._resolve_encoder('exact', obj)
+        if handler is None:
+            raise TypeError(repr(obj) + " is not JSON serializable")
+        typename, encode = handler
+        if typename == 'namedtuple':
+            value = [self.schema_id(type(obj).__name__, obj._fields)]
+            value.extend(obj)
+        else:
+            value = encode(obj)
+        return {"__t__": [self.class_id(typename), value]}
+
+
+class _Decoder(object):
+    """Object hook for decoding of a single compact document, translating
+    compactly tagged values to regular ones, for `hook` to decode."""
+
+    def __init__(self, hook):
+        self.hook = hook
+        self.header = None
+        self.data = False
+
+    def object_hook(self, dct):
+        if self.header is None:
+            # header is the first (and only nested) object parsed,
+            # since it precedes data
+            version = dct.get('version')
+            self.classes = dct.get('classes')
+            self.schemas = dct.get('schemas')
+            if (len(dct) != 3 or type(version) is not int or version != VERSION or
+                    not isinstance(self.classes, list) or
+                    not isinstance(self.schemas, list)):
+                raise NotCompact("Invalid compact header")
+            self.header = dct
+            return dct
+
+        tagged = dct.get('__t__')
+        if isinstance(tagged, list) and len(tagged) == 2 and len(dct) == 1:
+            cid, value = tagged
+            classname = _entry(self.classes, cid)
+            if classname == 'namedtuple':
+                if not isinstance(value, list) or not value:
+                    raise NotCompact("Invalid compact namedtuple")
+                schema = _entry(self.schemas, value[0])
+                if not isinstance(schema, list) or len(schema) != 2:
+                    raise NotCompact("Invalid compact namedtuple schema")
+                name, fields = schema
+                value = {"name": name, "fields": fields, "values": value[1:]}
+            return self.hook({"__class__": classname, "__value__": value})
+
+        if dct.get('__jsonplus__') is self.header and '__data__' in dct and len(dct) == 2:
+            self.data = True
+            return dct['__data__']
+
+        return self.hook(dct)
+
+
+def dumps(obj, **kw):
+    """Encode `obj` to JSON in compact representation of the exact coding.
+    Accepts the same keyword arguments as :func:`jsonplus.dumps`."""
+    kw['exact'] = True
+    memo = kw.pop('memo', False)
+    encoder = _Encoder()
+    jsonplus._encoder_default_args(kw)
+    kw['default'] = encoder.default
+    if memo:
+        memoize(kw)
+    data = json.dumps(obj, **kw)
+    header = json.dumps({"version": VERSION, "classes": encoder.classes,
+                         "schemas": encoder.schemas}, separators=(',', ':'))
+    return '%s%s,"__data__":%s}' % (_PREFIX, header, data)
+
+
+def loads(s, *pa, **kw):
+    """Decode JSON document `s` in compact representation. Accepts the same
+    keyword arguments as :func:`jsonplus.loads`.
+
+    Raises `NotCompact` if `s` is not in compact representation."""
+    jsonplus._decoder_default_args(kw)
+    decoder = _Decoder(kw['object_hook'])
+    kw['object_hook'] = decoder.object_hook
+    result = json.loads(s, *pa, **kw)
+    if not decoder.data:
+        raise NotCompact("Document data not found")
+    return result
@@ -0,0 +1,164 @@
+"""Compiled encoders, specialized for values of a fixed shape."""
+
+from decimal import Decimal
+
+import jsonplus
+
+
+try:
+    _scalar_types = (basestring, int, long, float)
+except NameError:
+    # (`bytes` are encoded by jsonplus, not as text)
+    _scalar_types = (str, int, float)
+
+
+def _plan(example, exact):
+    """Build the encoding plan for values shaped like `example`.
+
+    Returns:
+        A pair ``(signature, convert)``, where `signature` is a hashable
+        description of the plan (used to compare plans), and `convert` is
+        a function converting a value to a structure native to `simplejson`,
+        or ``None`` if values need no conversion at all.
+
+        Every `convert` leaves values that don't match the plan unchanged,
+        for the generic (``default=``) encoding path to handle.
+    """
+    if example is None or isinstance(example, _scalar_types):
+        return None, None
+
+    # objects serialized by `simplejson` on their own behalf
+    if callable(getattr(example, 'for_json', None)):
+        return None, None
+    if not exact and (callable(getattr(example, '_asdict', None)) or
+                      isinstance(example, Decimal)):
+        return None, None
+
+    if isinstance(example, list) or (not exact and isinstance(example, tuple)):
+        return _plan_array(example, exact)
+
+    if isinstance(example, dict):
+        return _plan_object(example, exact)
+
+    return _plan_encoded(example, exact)
+
+
+def _plan_array(example, exact):
+    plans = [_plan(item, exact) for item in example]
+    signatures = set(signature for signature, _ in plans)
+    sequence = list if exact else (list, tuple)
+
+    if len(signatures) <= 1:
+        # homogeneous array (or empty one)
+        if not plans or plans[0][1] is None:
+            return None, None
+        signature, convert_item = plans[0]
+
+        def convert(value):
+            if not isinstance(value, sequence):
+                return value
+            return [convert_item(item) for item in value]
+
+        return ('array', signature), convert
+
+    # heterogeneous array, planned per position
+    converters = [convert_item for _, convert_item in plans]
+    size = len(converters)
+
+    def convert(value):
+        if not isinstance(value, sequence) or len(value) != size:
+            return value
+        return [convert_item(item) if convert_item else item
+                for convert_item, item in zip(converters, value)]
+
+    return ('tuple', tuple(signature for signature, _ in plans)), convert
+
+
+def _plan_object(example, exact):
+    plans = [(key, _plan(item, exact)) for key, item in example.items()]
+    converters = [(key, convert_item)
+                  for key, (_, convert_item) in plans if convert_item]
+    if not converters:
+        return None, None
+
+    def convert(value):
+        if not isinstance(value, dict):
+            return value
+        converted = dict(value)
+        for key, convert_item in converters:
+            if key in value:
+                converted[key] = convert_item(value[key])
+        return converted
+
+    return ('object', tuple((key, signature)
+                            for key, (signature, _) in plans)), convert
+
+
+def _plan_encoded(example, exact):
+    handler = jsonplus._resolve_encoder('exact' if exact else 'compat', example)
+    if handler is None:
+        raise TypeError(repr(example) + " is not JSON serializable")
+    typename, encode = handler
+    cls = type(example)
+    signature, convert_encoded = _plan(encode(example), exact)
+
+    if exact:
+        def convert(value):
+            if type(value) is not cls:
+                return value
+            encoded = encode(value)
+            if convert_encoded:
+                encoded = convert_encoded(encoded)
+            return {"__class__": typename, "__value__": encoded}
+    else:
+        def convert(value):
+            if type(value) is not cls:
+                return value
+            encoded = encode(value)
+            if convert_encoded:
+                encoded = convert_encoded(encoded)
+            return encoded
+
+    return ('encoded', cls, signature), convert
+
+
+def compile(example, **kw):
+    """Compile an encoder specialized for values shaped like `example`.
+
+    The structure of `example` is walked once, and an encoder from the
+    registry is resolved up front for each of its values. The compiled
+    encoder then converts values to a structure native to `simplejson`
+    without going through ``default=`` for each non-native value.
+
+    Values (or their parts) not matching the `example`'s shape are still
+    encoded correctly, via the generic path. Encoders registered after
+    compilation are not used for the parts covered by the plan.
+
+    Args:
+        example (object):
+            An example value (e.g. a dict with fixed keys, or a list of
+            namedtuples).
+
+        **kw:
+            Keyword arguments as accepted by :func:`jsonplus.dumps`,
+            including ``exact``.
+
+    Returns:
+        A function that encodes a value to JSON string.
+
+    Example:
+        >>> dumps_row = jsonplus.compile({"id": 1, "ts": datetime.now()})
+        >>> dumps_row({"id": 2, "ts": datetime(2017, 2, 17)})
+        '{"id":2,"ts":{"__class__":"datetime","__value__":"2017-02-17T00:00:00"}}'
+    """
+    exact = kw.pop('exact', jsonplus._preferred_coding() == jsonplus.EXACT)
+    encoder = jsonplus.JSONEncoder(exact=exact, **kw)
+    _, convert = _plan(example, exact)
+
+    if convert is None:
+        return encoder.encode
+
+    def dumps(obj):
+        return encoder.encode(convert(obj))
+
+    return dumps
@@ -0,0 +1,521 @@
+"""Pluggable JSON engines (backends) for :func:`jsonplus.dumps` and
+:func:`jsonplus.loads`.
+
+`simplejson` is the default (and reference) engine. Other engines --
+stdlib's ``json``, ``orjson`` and ``ujson`` -- don't support all the hooks
+`simplejson` provides, so the (simplejson) encoding arguments shaped by
+:func:`jsonplus._encoder_default_args` are translated: values are first
+converted (in Python) to a tree of plain JSON types, with the same semantics
+`simplejson` would apply (``default``, ``for_json``, ``tuple_as_array``,
+``namedtuple_as_object``, ``use_decimal``, ``ignore_nan``, key coercion),
+and the tree is then encoded by the engine. On decoding, the object hook is
+either passed to the engine (stdlib ``json``), or applied to the decoded
+tree afterwards (``orjson``, ``ujson``).
+
+Since the conversion runs in Python, stdlib ``json`` and ``ujson`` engines are
+for compatibility, not speed. ``orjson`` in the compat coding (with default
+``tuple_as_array``, and no ``skipkeys``) encodes native types itself, and only
+values of other types are converted, via ``default`` (see
+:attr:`_ConvertingEngine.native_default`).
+
+Known limitations of non-default engines:
+
+- ``orjson`` can't encode non-finite floats (``nan``, ``inf``) in the exact
+  coding, nor decode them, and it can't encode integers beyond 64 bits
+  (and decodes them as floats). Indentation is limited to ``indent=2`` with
+  ``(',', ': ')`` separators.
+- ``ujson`` doesn't support custom separators, except those implied by
+  ``indent``.
+- ``Decimal`` in the compat coding is encoded as float (``use_decimal``
+  can't be emulated exactly).
+- Floats in exponent notation might be formatted differently (e.g. ``1e-7``
+  instead of ``1e-07``), by ``orjson`` and ``ujson``.
+"""
+
+from decimal import Decimal
+import re
+
+import jsonplus
+from jsonplus import json
+from jsonplus.memo import memoize
+
+
+try:
+    string_types = (str, unicode)
+    text_type = unicode
+except NameError:
+    string_types = (str,)
+    text_type = str
+
+
+class Engine(object):
+    """Base class for JSON engines.
+
+    Engines receive all keyword arguments given to :func:`jsonplus.dumps`
+    and :func:`jsonplus.loads` (except those handled by `jsonplus` itself,
+    like ``compact`` or ``lazy``), and they are free to shape them
+    with :func:`jsonplus._encoder_default_args` and
+    :func:`jsonplus._decoder_default_args`.
+    """
+
+    name = None
+
+    # can be used for iterative encoding, with :func:`jsonplus.iterdump`
+    iterative = False
+
+    def dumps(self, obj, **kw):
+        raise NotImplementedError
+
+    def loads(self, s, **kw):
+        raise NotImplementedError
+
+
+# Maximum number of encoder (and decoder) instances cached by the simplejson
+# engine, i.e. the number of distinct argument combinations used.
+INSTANCE_CACHE_SIZE = 128
+
+
+def _cached(cache, key, build):
+    """Get instance for `key` from `cache`, or `build()` it. Instances for
+    unhashable keys are not cached."""
+    try:
+        return cache[key]
+    except KeyError:
+        if len(cache) >= INSTANCE_CACHE_SIZE:
+            cache.clear()
+        instance = cache[key] = build()
+        return instance
+    except TypeError:
+        return build()
+
+
+class SimplejsonEngine(Engine):
+    """The default engine.
+
+    Encoder and decoder instances are cached and reused, keyed by coding and
+    arguments, so arguments are shaped (and instances constructed) only on
+    the first call with each distinct combination of arguments.
+    """
+
+    name = 'simplejson'
+    iterative = True
+
+    def __init__(self):
+        self.encoders = {}
+        self.decoders = {}
+
+    def dumps(self, obj, *pa, **kw):
+        memo = kw.pop('memo', False)
+        if pa or memo:
+            # (memo is per call, so the encoder has to be, too)
+            jsonplus._encoder_default_args(kw)
+            if memo:
+                memoize(kw)
+            return json.dumps(obj, *pa, **kw)
+        return self.encoder(kw).encode(obj)
+
+    def loads(self, s, *pa, **kw):
+        if pa:
+            jsonplus._decoder_default_args(kw)
+            return json.loads(s, *pa, **kw)
+        return self.decoder(kw).decode(s)
+
+    def encoder(self, kw):
+        """Get `simplejson.JSONEncoder` (or ``cls``) instance
+        for `kw` arguments (as accepted by :func:`jsonplus.dumps`)."""
+        kw['exact'] = kw.get('exact', jsonplus._preferred_coding() == jsonplus.EXACT)
+        # (argument names are unique, so values are never compared in sort)
+        key = tuple(sorted(kw.items()))
+        def build():
+            cls = kw.pop('cls', json.JSONEncoder)
+            jsonplus._encoder_default_args(kw)
+            return cls(**kw)
+        return _cached(self.encoders, key, build)
+
+    def decoder(self, kw):
+        """Get `simplejson.JSONDecoder` (or ``cls``) instance
+        for `kw` arguments (as accepted by :func:`jsonplus.loads`)."""
+        key = (jsonplus._profiling.enabled, tuple(sorted(kw.items())))
+        def build():
+            cls = kw.pop('cls', json.JSONDecoder)
+            if kw.pop('use_decimal', False):
+                if kw.get('parse_float') is not None:
+                    raise TypeError("use_decimal=True implies parse_float=Decimal")
+                kw['parse_float'] = Decimal
+            jsonplus._decoder_default_args(kw)
+            return cls(**kw)
+        return _cached(self.decoders, key, build)
+
+
+_float_repr = float.__repr__
+_infinity = float('inf')
+
+
+class _Converter(object):
+    """Converts values to plain JSON types (dict, list, str, int, float,
+    bool and None), following the encoding rules of `simplejson`, as
+    configured with `simplejson` encoding arguments."""
+
+    def __init__(self, default, for_json=False, use_decimal=True,
+                 tuple_as_array=True, namedtuple_as_object=True,
+                 ignore_nan=False, allow_nan=True, skipkeys=False,
+                 check_circular=True, encoding='utf-8'):
+        self.default = default
+        self.for_json = for_json
+        self.use_decimal = use_decimal
+        self.tuple_as_array = tuple_as_array
+        self.namedtuple_as_object = namedtuple_as_object
+        self.ignore_nan = ignore_nan
+        self.allow_nan = allow_nan
+        self.skipkeys = skipkeys
+        self.encoding = encoding
+        self.markers = {} if check_circular else None
+
+    def float(self, o):
+        if o != o or o == _infinity or o == -_infinity:
+            if self.ignore_nan:
+                return None
+            if not self.allow_nan:
+                raise ValueError("Out of range float values are not JSON compliant: %r" % o)
+        return o
+
+    def key(self, k):
+        if isinstance(k, string_types):
+            return text_type(k)
+        if isinstance(k, bytes):
+            # (as text even if `bytes` values are not, see `jsonplus.dumps`)
+            return k.decode(self.encoding or 'utf-8')
+        if isinstance(k, float):
+            return _float_repr(k) if k == k else 'NaN'
+        if k is True:
+            return 'true'
+        if k is False:
+            return 'false'
+        if k is None:
+            return 'null'
+        if isinstance(k, int):
+            return str(int(k))
+        if self.use_decimal and isinstance(k, Decimal):
+            return str(k)
+        if self.skipkeys:
+            return None
+        raise TypeError("keys must be str, int, float, bool or None, not %s"
+                        % type(k).__name__)
+
+    def container(self, o, convert):
+        markers = self.markers
+        if markers is None:
+            return convert(o)
+        marker = id(o)
+        if marker in markers:
+            raise ValueError("Circular reference detected")
+        markers[marker] = o
+        try:
+            return convert(o)
+        finally:
+            del markers[marker]
+
+    def list(self, o):
+        convert = self.convert
+        return [convert(item) for item in o]
+
+    def dict(self, o):
+        convert, key = self.convert, self.key
+        result = {}
+        for k, v in o.items():
+            if type(k) is not str:
+                k = key(k)
+                if k is None:
+                    continue
+            result[k] = convert(v)
+        return result
+
+    def convert(self, o):
+        cls = type(o)
+        if cls is str or cls is int or cls is bool or o is None:
+            return o
+        if cls is float:
+            return self.float(o)
+        if cls is list:
+            return self.container(o, self.list)
+        if cls is dict:
+            return self.container(o, self.dict)
+
+        # slow path, in the order of checks `simplejson` makes
+        if isinstance(o, string_types):
+            return text_type(o)
+        if isinstance(o, bytes) and self.encoding is not None:
+            return o.decode(self.encoding)
+        if isinstance(o, int):
+            return int(o)
+        if isinstance(o, float):
+            return self.float(float(o))
+        if isinstance(o, json.RawJSON):
+            raise TypeError("RawJSON is supported only by the simplejson engine")
+        if self.for_json:
+            for_json = getattr(o, 'for_json', None)
+            if callable(for_json):
+                return self.convert(for_json())
+        if isinstance(o, list):
+            return self.container(o, self.list)
+        if self.namedtuple_as_object:
+            _asdict = getattr(o, '_asdict', None)
+            if callable(_asdict):
+                return self.container(_asdict(), self.dict)
+        if self.tuple_as_array and isinstance(o, tuple):
+            return self.container(o, self.list)
+        if isinstance(o, dict):
+            return self.container(o, self.dict)
+        if self.use_decimal and isinstance(o, Decimal):
+            return self.float(float(o))
+        return self.container(o, lambda o: self.convert(self.default(o)))
+
+
+# (compiled on first use, since it's relatively slow to compile)
+_non_ascii = None
+
+def _escape_char(match):
+    n = ord(match.group())
+    if n > 0xffff:
+        # surrogate pair
+        n -= 0x10000
+        return '\\u%04x\\u%04x' % (0xd800 | (n >> 10), 0xdc00 | (n & 0x3ff))
+    return '\\u%04x' % n
+
+def _escape(text, ensure_ascii):
+    """Escape non-ASCII characters in encoded JSON `text` (as `simplejson`
+    does), if `ensure_ascii`."""
+    global _non_ascii
+    if not ensure_ascii:
+        return text
+    if _non_ascii is None:
+        _non_ascii = re.compile(u'[\x7f-\U0010ffff]')
+    return _non_ascii.sub(_escape_char, text)
+
+
+def _apply_object_hook(obj, object_hook):
+    """Apply `object_hook` to all objects (dicts) in the decoded `obj`
+    tree, bottom-up, as a parser would."""
+    if type(obj) is dict:
+        for key, value in obj.items():
+            if type(value) is dict or type(value) is list:
+                obj[key] = _apply_object_hook(value, object_hook)
+        return object_hook(obj)
+    if type(obj) is list:
+        for idx, value in enumerate(obj):
+            if type(value) is dict or type(value) is list:
+                obj[idx] = _apply_object_hook(value, object_hook)
+    return obj
+
+
+class _ConvertingEngine(Engine):
+    """Base class for engines encoding trees of plain JSON types."""
+
+    # `simplejson` arguments emulated on conversion
+    convert_args = ('default', 'for_json', 'use_decimal', 'tuple_as_array',
+                    'namedtuple_as_object', 'ignore_nan', 'allow_nan',
+                    'skipkeys', 'check_circular', 'encoding')
+
+    # `simplejson` arguments passed to the engine
+    encode_args = ('sort_keys', 'indent', 'separators', 'ensure_ascii')
+
+    # keyword arguments accepted (besides ``object_hook``) on decoding
+    decode_args = ()
+
+    # engine encodes values of native types (including `tuple`, and with
+    # ``nan``/``inf`` as ``null``) as `simplejson` does in the compat coding,
+    # and passes all others (including subclasses) to ``default``
+    native_default = False
+
+    def dumps(self, obj, **kw):
+        memo = kw.pop('memo', False)
+        jsonplus._encoder_default_args(kw)
+        if memo:
+            memoize(kw, fragments=False)
+        convert_kw = dict((arg, kw.pop(arg)) for arg in self.convert_args if arg in kw)
+        encode_kw = {'sort_keys': False, 'indent': None, 'ensure_ascii': True}
+        for arg in list(kw):
+            if arg not in self.encode_args:
+                raise TypeError("%r argument not supported by the %s engine"
+                                % (arg, self.name))
+            encode_kw[arg] = kw.pop(arg)
+        self.check_args(convert_kw, encode_kw)
+        if self.native_default and self.natively_encoded(convert_kw):
+            # only values of non-native types are converted, on encoding
+            try:
+                return self.encode(obj, default=_Converter(**convert_kw).convert, **encode_kw)
+            except TypeError:
+                # (engine's errors, e.g. on circular references, differ
+                # from `simplejson`'s, so they're raised on conversion)
+                pass
+        return self.encode(_Converter(**convert_kw).convert(obj), **encode_kw)
+
+    @staticmethod
+    def natively_encoded(convert_kw):
+        """True if values of native types can be encoded by the engine
+        (see `native_default`) with the conversion settings `convert_kw`
+        (as in the compat coding)."""
+        return (convert_kw.get('tuple_as_array', True) and
+                convert_kw.get('ignore_nan', False) and
+                not convert_kw.get('skipkeys', False))
+
+    def loads(self, s, **kw):
+        jsonplus._decoder_default_args(kw)
+        object_hook = kw.pop('object_hook')
+        for arg in kw:
+            if arg not in self.decode_args:
+                raise TypeError("%r argument not supported by the %s engine"
+                                % (arg, self.name))
+        return self.decode(s, object_hook, **kw)
+
+    def check_args(self, convert_kw, encode_kw):
+        pass
+
+    def encode(self, native, sort_keys, indent, separators, ensure_ascii):
+        raise NotImplementedError
+
+    def decode(self, s, object_hook, **kw):
+        raise NotImplementedError
+
+
+class StdlibEngine(_ConvertingEngine):
+    name = 'json'
+    decode_args = ('parse_float', 'parse_int', 'parse_constant',
+                   'object_pairs_hook', 'strict')
+
+    def __init__(self):
+        import json
+        self.json = json
+
+    def encode(self, native, sort_keys, indent, separators, ensure_ascii):
+        return self.json.dumps(native, sort_keys=sort_keys, indent=indent,
+                               separators=separators, ensure_ascii=ensure_ascii)
+
+    def decode(self, s, object_hook, **kw):
+        return self.json.loads(s, object_hook=object_hook, **kw)
+
+
+class _Indented(object):
+    """Mixin for engines supporting only a fixed indentation style,
+    with separators implied."""
+
+    def check_args(self, convert_kw, encode_kw):
+        indent = encode_kw.get('indent')
+        separators = tuple(encode_kw.get('separators', (',', ':')))
+        if indent is None and separators == (',', ':'):
+            return
+        if indent in self.indents and separators in ((',', ': '), (', ', ': ')):
+            return
+        raise ValueError("%s engine supports only compact output, or indent "
+                         "of %d with (',', ': ') separators" % (self.name, self.indents[0]))
+
+
+class OrjsonEngine(_Indented, _ConvertingEngine):
+    name = 'orjson'
+    indents = (2, '  ')
+    native_default = True
+
+    def __init__(self):
+        import orjson
+        self.orjson = orjson
+
+    def check_args(self, convert_kw, encode_kw):
+        super(OrjsonEngine, self).check_args(convert_kw, encode_kw)
+        # orjson would silently encode nan/inf as null
+        if not convert_kw.get('ignore_nan'):
+            convert_kw['allow_nan'] = False
+
+    def encode(self, native, sort_keys, indent, separators, ensure_ascii, default=None):
+        option = 0
+        if default is not None:
+            orjson = self.orjson
+            option |= (orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_SUBCLASS |
+                       orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS)
+        if sort_keys:
+            option |= self.orjson.OPT_SORT_KEYS
+        if indent is not None:
+            option |= self.orjson.OPT_INDENT_2
+        return _escape(self.orjson.dumps(native, default=default, option=option).decode('utf-8'),
+                       ensure_ascii)
+
+    def decode(self, s, object_hook):
+        return _apply_object_hook(self.orjson.loads(s), object_hook)
+
+
+class UjsonEngine(_Indented, _ConvertingEngine):
+    name = 'ujson'
+    indents = (2, 4, '  ', '    ')
+
+    def __init__(self):
+        import ujson
+        self.ujson = ujson
+
+    def encode(self, native, sort_keys, indent, separators, ensure_ascii):
+        if isinstance(indent, str):
+            indent = len(indent)
+        text = self.ujson.dumps(native, sort_keys=sort_keys, indent=indent or 0,
+                                ensure_ascii=False, escape_forward_slashes=False)
+        return _escape(text, ensure_ascii)
+
+    def decode(self, s, object_hook):
+        return _apply_object_hook(self.ujson.loads(s), object_hook)
+
+
+ENGINES = {
+    'simplejson': SimplejsonEngine,
+    'json': StdlibEngine,
+    'orjson': OrjsonEngine,
+    'ujson': UjsonEngine,
+}
+
+# engine instances, created on first use
+_instances = {}
+
+_default = 'simplejson'
+
+
+def get_engine(engine=None):
+    """Get the engine instance for `engine`, given by name (a key of
+    :data:`ENGINES`), or as an :class:`Engine` instance. Defaults to the
+    engine selected with :func:`use_engine`.
+
+    Raises `ValueError` for unknown engines, and `ImportError` if engine's
+    package is not installed.
+    """
+    if engine is None:
+        engine = _default
+    if isinstance(engine, Engine):
+        return engine
+    try:
+        return _instances[engine]
+    except KeyError:
+        pass
+    if engine not in ENGINES:
+        raise ValueError("Unknown JSON engine: %r" % engine)
+    instance = _instances[engine] = ENGINES[engine]()
+    return instance
+
+
+def use_engine(engine):
+    """Select the JSON `engine` (by name, or an :class:`Engine` instance)
+    used by default in :func:`jsonplus.dumps` and :func:`jsonplus.loads`.
+    The selection is global (not thread-local).
+
+    Example:
+        >>> jsonplus.use_engine('orjson')
+    """
+    global _default
+    get_engine(engine)
+    _default = engine
+
+
+def available_engines():
+    """List names of engines available (installed)."""
+    available = []
+    for name in sorted(ENGINES):
+        try:
+            get_engine(name)
+        except ImportError:
+            continue
+        available.append(name)
+    return available
@@ -0,0 +1,138 @@
+"""Lazy decoding, with ``loads(s, lazy=True)``.
+
+JSON is parsed (fast, without an object hook) into a tree of plain dicts and
+lists, which is then wrapped in read-only mapping and sequence views. Tagged
+values (of the exact coding) are reconstructed only when accessed through a
+view, and cached, so documents that are only partially read are decoded
+only partially.
+"""
+
+try:
+    from collections.abc import Mapping, Sequence
+except ImportError:
+    from collections import Mapping, Sequence
+
+import jsonplus
+from jsonplus import json
+from jsonplus.engines import _apply_object_hook
+
+
+def _wrap(value, object_hook):
+    """Decode a tagged `value`, or wrap a container `value` in a lazy view."""
+    if type(value) is dict:
+        if '__class__' in value:
+            return _apply_object_hook(value, object_hook)
+        return LazyMapping(value, object_hook)
+    if type(value) is list:
+        return LazyList(value, object_hook)
+    return value
+
+
+def materialize(value):
+    """Fully decode `value`, converting lazy views (recursively)
+    to dicts and lists."""
+    if isinstance(value, LazyMapping):
+        return dict((key, materialize(item)) for key, item in value.items())
+    if isinstance(value, LazyList):
+        return [materialize(item) for item in value]
+    return value
+
+
+class LazyMapping(Mapping):
+    """Read-only view of a decoded JSON object, decoding (and caching)
+    items on access."""
+
+    __slots__ = ('_raw', '_decoded', '_object_hook')
+
+    def __init__(self, raw, object_hook):
+        self._raw = raw
+        self._decoded = {}
+        self._object_hook = object_hook
+
+    def __getitem__(self, key):
+        try:
+            return self._decoded[key]
+        except KeyError:
+            pass
+        value = self._raw[key]
+        if type(value) is dict or type(value) is list:
+            value = self._decoded[key] = _wrap(value, self._object_hook)
+        return value
+
+    def __contains__(self, key):
+        return key in self._raw
+
+    def __iter__(self):
+        return iter(self._raw)
+
+    def __len__(self):
+        return len(self._raw)
+
+    def __repr__(self):
+        return '%s(%r)' % (type(self).__name__, materialize(self))
+
+    def for_json(self):
+        return materialize(self)
+
+
+class LazyList(Sequence):
+    """Read-only view of a decoded JSON array, decoding (and caching)
+    items on access."""
+
+    __slots__ = ('_raw', '_decoded', '_object_hook')
+
+    def __init__(self, raw, object_hook):
+        self._raw = raw
+        self._decoded = {}
+        self._object_hook = object_hook
+
+    def __getitem__(self, idx):
+        if isinstance(idx, slice):
+            return [self[i] for i in range(*idx.indices(len(self._raw)))]
+        if idx < 0:
+            idx += len(self._raw)
+        try:
+            return self._decoded[idx]
+        except KeyError:
+            pass
+        value = self._raw[idx]
+        if type(value) is dict or type(value) is list:
+            value = self._decoded[idx] = _wrap(value, self._object_hook)
+        return value
+
+    def __iter__(self):
+        for idx in range(len(self._raw)):
+            yield self[idx]
+
+    def __len__(self):
+        return len(self._raw)
+
+    def __eq__(self, other):
+        if not isinstance(other, (list, Sequence)) or isinstance(other, (str, bytes)):
+            return NotImplemented
+        return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+
+    def __ne__(self, other):
+        equal = self.__eq__(other)
+        return equal if equal is NotImplemented else not equal
+
+    __hash__ = None
+
+    def __repr__(self):
+        return '%s(%r)' % (type(self).__name__, materialize(self))
+
+    def for_json(self):
+        return materialize(self)
+
+
+def loads(s, *pa, **kw):
+    """Decode JSON document `s` lazily. Accepts the same keyword arguments
+    as :func:`jsonplus.loads`.
+
+    Returns:
+        A :class:`LazyMapping` or :class:`LazyList` view for JSON objects and
+        arrays (or a decoded value for tagged and scalar values).
+    """
+    jsonplus._decoder_default_args(kw)
+    object_hook = kw.pop('object_hook')
+    return _wrap(json.loads(s, *pa, **kw), object_hook)
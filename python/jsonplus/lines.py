@@ -0,0 +1,207 @@
+"""JSON Lines (newline-delimited JSON) encoding and decoding, optionally
+sharded across a pool of workers."""
+
+from collections import deque
+from functools import partial
+from itertools import islice
+import multiprocessing
+
+import jsonplus
+
+
+DEFAULT_CHUNK_SIZE = 1000
+
+
+def _chunks(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _ordered_map(func, chunks, executor, window):
+    """Map `func` over `chunks` in `executor`, yielding results in order,
+    with at most `window` chunks submitted ahead (unlike ``Executor.map``,
+    which submits all of them upfront)."""
+    pending = deque()
+    for chunk in chunks:
+        pending.append(executor.submit(func, chunk))
+        if len(pending) >= window:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+def _map_chunks(func, chunks, executor=None, workers=None):
+    """Map `func` over `chunks`, serially if neither `executor` nor `workers`
+    are given, or in a `executor` (a ``concurrent.futures.Executor``), or in
+    a process pool of `workers` created for the occasion."""
+    if executor is None and not workers:
+        for chunk in chunks:
+            yield func(chunk)
+        return
+
+    window = 2 * (workers or multiprocessing.cpu_count())
+    if executor is not None:
+        for result in _ordered_map(func, chunks, executor, window):
+            yield result
+        return
+
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(workers) as executor:
+        for result in _ordered_map(func, chunks, executor, window):
+            yield result
+
+
+def _encoding(kw):
+    """Function encoding a single value with `kw` arguments, like
+    :func:`jsonplus.dumps`, with per-call setup done only once (i.e. using a
+    shared encoder, where possible)."""
+    kw = dict(kw)
+    engine = jsonplus._get_engine(kw.pop('engine', None))
+    if hasattr(engine, 'encoder') and not kw.get('memo') and not kw.get('compact'):
+        return partial(jsonplus._encode_text_keys, engine.encoder(kw).encode)
+    return partial(jsonplus.dumps, engine=engine, **kw)
+
+
+def _decoding(kw):
+    """Function decoding a single document with `kw` arguments, like
+    :func:`jsonplus.loads` (see :func:`_encoding`)."""
+    kw = dict(kw)
+    if kw.get('lazy'):
+        return partial(jsonplus.loads, **kw)
+    engine = jsonplus._get_engine(kw.pop('engine', None))
+    if hasattr(engine, 'decoder'):
+        decode = engine.decoder(kw).decode
+        def _decode(s):
+            # documents in compact representation are decoded as usual
+            if jsonplus._is_compact(s):
+                return jsonplus.loads(s, engine=engine, **kw)
+            return decode(s)
+        return _decode
+    return partial(jsonplus.loads, engine=engine, **kw)
+
+
+def _dumps_lines(values, kw):
+    encode = _encoding(kw)
+    return ''.join([encode(value) + '\n' for value in values])
+
+
+def _loads_lines(lines, kw):
+    decode = _decoding(kw)
+    return [decode(line) for line in lines]
+
+
+def _dumps_chunk(values, kw):
+    encode = _encoding(kw)
+    return [encode(value) for value in values]
+
+
+def dump_lines(iterable, fp, executor=None, workers=None,
+               chunk_size=DEFAULT_CHUNK_SIZE, **kw):
+    """Encode values from `iterable` to `fp` as JSON Lines, i.e. one JSON
+    document per line.
+
+    Values are encoded in chunks of `chunk_size`. Chunks can be encoded in
+    parallel, in a pool of `workers` processes, or in any
+    ``concurrent.futures.Executor`` given. In both cases, values (and
+    encoding arguments) must be picklable, and custom encoders must be
+    registered in worker processes as well (e.g. on import of a module).
+    Output order always matches the order of `iterable`.
+
+    Args:
+        iterable (iterable):
+            Values to encode.
+
+        fp (file):
+            Text file object to write to.
+
+        executor (concurrent.futures.Executor, default=None):
+            Executor to encode chunks in.
+
+        workers (int, default=None):
+            Number of processes to encode chunks in, if `executor`
+            is not given.
+
+        chunk_size (int, default=1000):
+            Number of values per chunk.
+
+        **kw:
+            Keyword arguments as accepted by :func:`jsonplus.dumps`,
+            including ``exact``.
+    """
+    if kw.get('indent') is not None:
+        raise ValueError("indent is not supported in JSON Lines")
+
+    # fix the coding preferred here, since workers don't share it
+    kw['exact'] = kw.get('exact', jsonplus._preferred_coding() == jsonplus.EXACT)
+
+    encode = partial(_dumps_lines, kw=kw)
+    for text in _map_chunks(encode, _chunks(iterable, chunk_size),
+                            executor=executor, workers=workers):
+        fp.write(text)
+
+
+def load_lines(fp, executor=None, workers=None,
+               chunk_size=DEFAULT_CHUNK_SIZE, **kw):
+    """Decode JSON Lines from `fp`, yielding decoded values one at a time.
+    Blank lines are skipped.
+
+    Lines are decoded in chunks of `chunk_size`, serially or in parallel
+    (see :func:`dump_lines` for `executor` and `workers`).
+
+    Args:
+        fp (file):
+            File object (text or binary) to read from.
+
+        **kw:
+            Keyword arguments as accepted by :func:`jsonplus.loads`.
+    """
+    lines = (line for line in fp if line.strip())
+    decode = partial(_loads_lines, kw=kw)
+    for values in _map_chunks(decode, _chunks(lines, chunk_size),
+                              executor=executor, workers=workers):
+        for value in values:
+            yield value
+
+
+def dumps_many(values, executor=None, workers=None,
+               chunk_size=DEFAULT_CHUNK_SIZE, **kw):
+    """Encode each of `values` to JSON, like :func:`jsonplus.dumps`, but
+    with the (per-call) encoder setup done only once per chunk of values.
+
+    Chunks of `chunk_size` values can be encoded in parallel, in a pool of
+    `workers` processes, or in any ``concurrent.futures.Executor`` given
+    (see :func:`dump_lines`).
+
+    Returns:
+        `list` of JSON documents (strings), in order of `values`.
+
+    Example:
+        >>> jsonplus.dumps_many(rows, workers=4)
+    """
+    kw['exact'] = kw.get('exact', jsonplus._preferred_coding() == jsonplus.EXACT)
+    encode = partial(_dumps_chunk, kw=kw)
+    results = []
+    for documents in _map_chunks(encode, _chunks(values, chunk_size),
+                                 executor=executor, workers=workers):
+        results.extend(documents)
+    return results
+
+
+def loads_many(documents, executor=None, workers=None,
+               chunk_size=DEFAULT_CHUNK_SIZE, **kw):
+    """Decode each of JSON `documents`, like :func:`jsonplus.loads`, with
+    the decoder setup done only once per chunk (see :func:`dumps_many`).
+
+    Returns:
+        `list` of decoded values, in order of `documents`.
+    """
+    decode = partial(_loads_lines, kw=kw)
+    results = []
+    for values in _map_chunks(decode, _chunks(documents, chunk_size),
+                              executor=executor, workers=workers):
+        results.extend(values)
+    return results
@@ -0,0 +1,112 @@
+"""Memoization of encoded values, within a single encoding call.
+
+With ``dumps(obj, memo=True)``, each distinct value of a memoizable type is
+encoded only once per call, and the encoded result is reused for all other
+occurrences of an equal value. Unless output is indented, the reused result
+is the JSON fragment itself (so even the tagged wrapper of the exact coding
+is not re-encoded).
+
+Values are memoizable if their classname has a memo key function registered
+(see :func:`memoizable`). Keys have to distinguish all values encoded
+differently -- which plain equality often doesn't (e.g. ``Decimal('1.0')``
+and ``Decimal('1.00')`` are equal, and so are aware datetimes in different
+timezones, if they denote the same instant).
+"""
+
+import jsonplus
+from jsonplus import json
+
+
+# Maximum number of distinct values memoized per encoding call
+# (values beyond that are simply not memoized).
+MEMO_SIZE = 4096
+
+
+def _identity(obj):
+    return obj
+
+def _with_offset(obj):
+    return (obj, obj.utcoffset())
+
+def _decimal_key(obj):
+    return obj.as_tuple()
+
+def _currency_key(obj):
+    return (obj.code, obj.numeric, obj.name)
+
+def _money_key(obj):
+    return (obj.amount.as_tuple(), _currency_key(obj.currency))
+
+
+# classname -> memo key function
+_memo_keys = {
+    'datetime': _with_offset,
+    'date': _identity,
+    'time': _with_offset,
+    'timedelta': _identity,
+    'Decimal': _decimal_key,
+    'Fraction': _identity,
+    'UUID': _identity,
+    'Currency': _currency_key,
+    'Money': _money_key,
+}
+
+
+def memoizable(classname, key=_identity):
+    """Register objects of `classname` as memoizable, with `key` function
+    returning a hashable key, equal only for objects encoded equally (the
+    object itself, by default).
+
+    Example:
+        >>> jsonplus.memo.memoizable('Color', key=attrgetter('rgb'))
+    """
+    _memo_keys[classname] = key
+
+
+class _Memo(object):
+    """Memoizing wrapper of `default` encoding function, for a single
+    encoding call."""
+
+    def __init__(self, default, fragment_kw=None, size=MEMO_SIZE):
+        self.default = default
+        self.fragment_kw = fragment_kw
+        self.fragment_encoder = None
+        self.size = size
+        self.values = {}
+
+    def fragment(self, value):
+        if self.fragment_encoder is None:
+            kw = dict(self.fragment_kw, default=self)
+            cls = kw.pop('cls', json.JSONEncoder)
+            self.fragment_encoder = cls(**kw)
+        return json.RawJSON(self.fragment_encoder.encode(value))
+
+    def __call__(self, obj):
+        cls = type(obj)
+        key_func = _memo_keys.get(cls.__name__)
+        if key_func is None:
+            return self.default(obj)
+        key = (cls, key_func(obj))
+        try:
+            return self.values[key]
+        except KeyError:
+            pass
+        value = self.default(obj)
+        if self.fragment_kw is not None:
+            value = self.fragment(value)
+        if len(self.values) < self.size:
+            self.values[key] = value
+        return value
+
+
+def memoize(kw, fragments=True):
+    """Replace ``default`` in encoding arguments `kw` (already shaped with
+    :func:`jsonplus._encoder_default_args`) with its memoizing wrapper.
+
+    Encoded JSON fragments are memoized if `fragments` is true and output is
+    not indented (simplejson encoders only), otherwise encoded values are.
+    """
+    fragment_kw = None
+    if fragments and kw.get('indent') is None:
+        fragment_kw = dict(kw)
+    kw['default'] = _Memo(kw['default'], fragment_kw)
@@ -0,0 +1,144 @@
+"""Encoders and decoders of NumPy arrays and scalars.
+
+Handlers are registered with predicates that match only if NumPy has already
+been imported (by the application), so NumPy is never imported by jsonplus
+itself, unless a NumPy value is being decoded.
+
+In the exact coding, arrays are encoded with their dtype (as in the ``.npy``
+header) and shape, and data either as a base64-encoded buffer (default), or
+as a nested list of values (see :data:`NDARRAY_FORMAT`). Both are converted
+with NumPy's vectorized routines (``tobytes``/``frombuffer`` and
+``tolist``/``array``), not element by element. Scalars are encoded with their
+dtype and value. In the compat coding, arrays are encoded as nested lists,
+and scalars as their (closest) Python values.
+
+Note that ``numpy.float64`` and ``numpy.str_`` are subclasses of `float` and
+`str`, so they're encoded as plain floats and strings (and decoded as such).
+"""
+
+import binascii
+import sys
+
+from jsonplus import encoder, decoder, _b64encode
+
+
+# Format of array data in the exact coding: ``base64`` (raw buffer, default)
+# or ``list`` (nested list of values). Arrays of objects are always encoded
+# as lists.
+NDARRAY_FORMAT = 'base64'
+
+
+def _is_ndarray(obj):
+    numpy = sys.modules.get('numpy')
+    return numpy is not None and isinstance(obj, numpy.ndarray)
+
+
+def _is_numpy_scalar(obj):
+    numpy = sys.modules.get('numpy')
+    return numpy is not None and isinstance(obj, numpy.generic)
+
+
+def _dtype_descr(dtype):
+    from numpy.lib.format import dtype_to_descr
+    return dtype_to_descr(dtype)
+
+
+def _descr_dtype(descr):
+    from numpy.lib.format import descr_to_dtype
+    return descr_to_dtype(descr)
+
+
+def _buffer(arr):
+    """Base64-encoded data of `arr`, in C order (copied only if `arr` is
+    not C-contiguous)."""
+    import numpy
+    flat = numpy.ascontiguousarray(arr).reshape(-1)
+    # byte view of the flat array, since buffer protocol doesn't support
+    # all dtypes (e.g. datetime64)
+    return _b64encode(flat.view(numpy.uint8))
+
+
+def _from_buffer(data, dtype):
+    import numpy
+    # (decoded into a `bytearray`, so that the result is writeable)
+    return numpy.frombuffer(bytearray(binascii.a2b_base64(data)), dtype=dtype)
+
+
+def _flatten(values, ndim):
+    for _ in range(ndim - 1):
+        values = [item for sublist in values for item in sublist]
+    return values if ndim else [values]
+
+
+def _from_list(values, dtype, shape):
+    import numpy
+    if dtype.hasobject:
+        # object items can be sequences themselves, so we can't let NumPy
+        # infer the shape from nested lists
+        size = 1
+        for dim in shape:
+            size *= dim
+        return numpy.fromiter(_flatten(values, len(shape)), dtype=dtype, count=size)
+    return numpy.array(values, dtype=dtype)
+
+
+@encoder('numpy.ndarray', _is_ndarray)
+def _dump_ndarray(obj):
+    value = {"dtype": _dtype_descr(obj.dtype), "shape": list(obj.shape)}
+    if NDARRAY_FORMAT == 'list' or obj.dtype.hasobject:
+        value["values"] = obj.tolist()
+    elif NDARRAY_FORMAT == 'base64':
+        value["data"] = _buffer(obj)
+    else:
+        raise ValueError("Unknown ndarray format: %r" % NDARRAY_FORMAT)
+    return value
+
+
+@encoder('numpy.ndarray', _is_ndarray, exact=False)
+def _dump_ndarray_compat(obj):
+    return obj.tolist()
+
+
+@decoder('numpy.ndarray')
+def _load_ndarray(val):
+    dtype = _descr_dtype(val['dtype'])
+    shape = tuple(val['shape'])
+    if 'data' in val:
+        arr = _from_buffer(val['data'], dtype)
+    else:
+        arr = _from_list(val['values'], dtype, shape)
+    return arr.reshape(shape)
+
+
+def _exact_item(dtype):
+    """True if scalars of `dtype` are converted to Python values (by
+    ``item()``) and back without loss."""
+    kind, size = dtype.kind, dtype.itemsize
+    return kind in 'biu' or (kind == 'f' and size <= 8) or (kind == 'c' and size <= 16)
+
+
+@encoder('numpy.generic', _is_numpy_scalar)
+def _dump_numpy_scalar(obj):
+    value = {"dtype": _dtype_descr(obj.dtype)}
+    if _exact_item(obj.dtype):
+        value["value"] = obj.item()
+    else:
+        value["data"] = _buffer(obj)
+    return value
+
+
+@encoder('numpy.generic', _is_numpy_scalar, exact=False)
+def _dump_numpy_scalar_compat(obj):
+    value = obj.item()
+    if isinstance(value, type(obj)):
+        # extended precision (`longdouble`, `clongdouble`) has no Python type
+        return complex(value) if obj.dtype.kind == 'c' else float(value)
+    return value
+
+
+@decoder('numpy.generic')
+def _load_numpy_scalar(val):
+    dtype = _descr_dtype(val['dtype'])
+    if 'data' in val:
+        return _from_buffer(val['data'], dtype)[0]
+    return dtype.type(val['value'])
@@ -0,0 +1,220 @@
+"""Encoders and decoders of pandas data frames, series, indexes and
+timestamps.
+
+As with NumPy (see :mod:`jsonplus.numpy_coders`), handlers match only if pandas
+has already been imported by the application.
+
+In the exact coding, data frames are encoded in a columnar layout: column
+labels and index (both as indexes), and a vector of values for each column.
+Vectors of NumPy dtypes are encoded as NumPy arrays (i.e. as base64 buffers,
+by default), categoricals as categories and codes, timezone-aware datetimes
+as UTC datetimes and the timezone, and vectors of other extension dtypes as
+lists of values (with missing values as nulls), so frames are decoded back
+with the same dtypes. Series are encoded as a single vector, with name and
+index.
+
+In the compat coding, data frames are encoded as objects of column lists,
+series and indexes as lists, and timestamps as ISO 8601 strings.
+"""
+
+import sys
+
+import jsonplus
+from jsonplus import encoder, decoder
+
+
+def _is_instance(classname):
+    def predicate(obj):
+        pandas = sys.modules.get('pandas')
+        return pandas is not None and isinstance(obj, getattr(pandas, classname))
+    return predicate
+
+
+def _tz_name(tz):
+    """Name of timezone `tz`, as accepted by pandas (e.g. in ``tz_convert``),
+    or `None` if it has none (e.g. ``dateutil.tz.tzlocal()``)."""
+    import pandas
+    name = str(tz)
+    filename = getattr(tz, '_filename', None)
+    if isinstance(filename, str):
+        # dateutil zone, named by its file (or path of the file)
+        name = 'dateutil/' + filename.rpartition('zoneinfo/')[2]
+    try:
+        pandas.Timestamp(0, tz=name)
+    except (KeyError, ValueError):
+        return None
+    return name
+
+
+def _dump_vector(values):
+    """Encode values of series or index `values`."""
+    import numpy
+    import pandas
+    dtype = values.dtype
+    array = values.array
+    if isinstance(dtype, numpy.dtype):
+        return {"values": values.to_numpy()}
+    if isinstance(dtype, pandas.CategoricalDtype):
+        return {"dtype": "category", "categories": dtype.categories,
+                "ordered": dtype.ordered, "codes": array.codes}
+    if isinstance(dtype, pandas.DatetimeTZDtype):
+        name = _tz_name(dtype.tz)
+        if name is None:
+            raise TypeError("Timezone %r of %r can't be encoded" % (dtype.tz, values))
+        utc = array.tz_convert('UTC').tz_localize(None)
+        return {"dtype": "datetime64[%s, %s]" % (dtype.unit, name), "values": utc.to_numpy()}
+    return {"dtype": str(dtype),
+            "values": array.to_numpy(dtype=object, na_value=None).tolist()}
+
+
+def _load_vector(val):
+    import pandas
+    values = val.get('values')
+    dtype = val.get('dtype')
+    if dtype is None:
+        return pandas.array(values, dtype=values.dtype, copy=False)
+    if dtype == 'category':
+        return pandas.Categorical.from_codes(val['codes'], categories=val['categories'],
+                                             ordered=val['ordered'])
+    dtype = pandas.api.types.pandas_dtype(dtype)
+    if isinstance(dtype, pandas.DatetimeTZDtype):
+        return pandas.array(values).tz_localize('UTC').tz_convert(dtype.tz)
+    return pandas.array(values, dtype=dtype)
+
+
+@encoder('pandas.Index', _is_instance('Index'))
+def _dump_index(obj):
+    import pandas
+    if isinstance(obj, pandas.RangeIndex):
+        return {"name": obj.name, "range": [obj.start, obj.stop, obj.step]}
+    if isinstance(obj, pandas.MultiIndex):
+        return {"names": list(obj.names),
+                "levels": [_dump_vector(obj.get_level_values(level))
+                           for level in range(obj.nlevels)]}
+    value = _dump_vector(obj)
+    value["name"] = obj.name
+    return value
+
+
+@encoder('pandas.Index', _is_instance('Index'), exact=False)
+def _dump_index_compat(obj):
+    return obj.tolist()
+
+
+@decoder('pandas.Index')
+def _load_index(val):
+    import pandas
+    if 'range' in val:
+        return pandas.RangeIndex(*val['range'], name=val['name'])
+    if 'levels' in val:
+        return pandas.MultiIndex.from_arrays([_load_vector(level) for level in val['levels']],
+                                             names=val['names'])
+    return pandas.Index(_load_vector(val), name=val['name'], copy=False)
+
+
+@encoder('pandas.Series', _is_instance('Series'))
+def _dump_series(obj):
+    value = _dump_vector(obj)
+    value["name"] = obj.name
+    value["index"] = obj.index
+    return value
+
+
+@encoder('pandas.Series', _is_instance('Series'), exact=False)
+def _dump_series_compat(obj):
+    return obj.tolist()
+
+
+@decoder('pandas.Series')
+def _load_series(val):
+    import pandas
+    return pandas.Series(_load_vector(val), index=val['index'], name=val['name'], copy=False)
+
+
+@encoder('pandas.DataFrame', _is_instance('DataFrame'))
+def _dump_dataframe(obj):
+    # columns by position, since labels are not necessarily unique
+    return {"columns": obj.columns, "index": obj.index,
+            "data": [_dump_vector(obj.iloc[:, i]) for i in range(obj.shape[1])]}
+
+
+@encoder('pandas.DataFrame', _is_instance('DataFrame'), exact=False)
+def _dump_dataframe_compat(obj):
+    return dict((str(label), obj.iloc[:, i].tolist())
+                for i, label in enumerate(obj.columns))
+
+
+@decoder('pandas.DataFrame')
+def _load_dataframe(val):
+    import pandas
+    columns = dict((i, _load_vector(vector)) for i, vector in enumerate(val['data']))
+    frame = pandas.DataFrame(columns, index=val['index'], copy=False)
+    frame.columns = val['columns']
+    return frame
+
+
+@encoder('pandas.Timestamp', _is_instance('Timestamp'))
+def _dump_timestamp(obj):
+    tz = obj.tz
+    if tz is not None:
+        # (fixed UTC offset, in seconds, for zones without a name)
+        tz = _tz_name(tz) or int(obj.utcoffset().total_seconds())
+    return {"value": obj.isoformat(), "unit": obj.unit, "tz": tz}
+
+
+@encoder('pandas.Timestamp', _is_instance('Timestamp'), exact=False)
+def _dump_timestamp_compat(obj):
+    return obj.isoformat()
+
+
+@decoder('pandas.Timestamp')
+def _load_timestamp(val):
+    import pandas
+    timestamp = pandas.Timestamp(val['value']).as_unit(val['unit'])
+    tz = val['tz']
+    if isinstance(tz, int):
+        tz = jsonplus._fixed_offset(tz)
+    if tz is not None:
+        timestamp = timestamp.tz_convert(tz)
+    return timestamp
+
+
+@encoder('pandas.Timedelta', _is_instance('Timedelta'))
+def _dump_timedelta(obj):
+    # (value in nanoseconds, regardless of unit)
+    return {"value": obj.value, "unit": obj.unit}
+
+
+@encoder('pandas.Timedelta', _is_instance('Timedelta'), exact=False)
+def _dump_timedelta_compat(obj):
+    return obj.total_seconds()
+
+
+@decoder('pandas.Timedelta')
+def _load_timedelta(val):
+    import pandas
+    return pandas.Timedelta(val['value'], unit='ns').as_unit(val['unit'])
+
+
+# missing values
+
+def _is_missing(obj):
+    pandas = sys.modules.get('pandas')
+    return pandas is not None and (obj is pandas.NaT or obj is pandas.NA)
+
+
+@encoder('pandas.NA', _is_missing)
+def _dump_missing(obj):
+    import pandas
+    return 'NaT' if obj is pandas.NaT else 'NA'
+
+
+@encoder('pandas.NA', _is_missing, exact=False)
+def _dump_missing_compat(obj):
+    return None
+
+
+@decoder('pandas.NA')
+def _load_missing(val):
+    import pandas
+    return pandas.NaT if val == 'NaT' else pandas.NA
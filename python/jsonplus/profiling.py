@@ -0,0 +1,124 @@
+"""Opt-in profiling of encoders and decoders registered in jsonplus.
+
+When enabled (with :func:`enable_stats`), call counts and cumulative time
+are recorded for each encoder (per coding) and decoder used, as well as the
+number of types each encoder's predicate was tested on, and didn't match.
+Predicates are tested only on resolution of an encoder for a type (see
+:func:`jsonplus._resolve_encoder`), i.e. once per type, not per object.
+
+Profiling has (nearly) no overhead when disabled: encoders are wrapped with
+timing wrappers only on resolution (which is cached per type), and the
+profiling object hook is installed only when decoding arguments are shaped
+(so decoders created before profiling is enabled are not profiled, nor are
+encoders compiled with :func:`jsonplus.compile`).
+"""
+
+try:
+    from time import perf_counter as default_timer
+except ImportError:
+    from time import time as default_timer
+
+import jsonplus
+
+
+enabled = False
+
+# section -> typename -> _Counter
+_counters = {}
+
+
+class _Counter(object):
+    __slots__ = ('calls', 'time', 'predicate_misses')
+
+    def __init__(self):
+        self.calls = 0
+        self.time = 0.0
+        self.predicate_misses = 0
+
+    def as_dict(self):
+        return {"calls": self.calls, "time": self.time,
+                "predicate_misses": self.predicate_misses}
+
+
+def _counter(section, typename):
+    try:
+        return _counters[section][typename]
+    except KeyError:
+        counter = _counters.setdefault(section, {})[typename] = _Counter()
+        return counter
+
+
+def _clear_encode_cache():
+    # re-resolve encoders, with (or without) timing wrappers
+    for cache in jsonplus._encode_cache.values():
+        cache.clear()
+
+
+def enable_stats(enable=True):
+    """Enable (or disable) profiling of encoders and decoders."""
+    global enabled
+    enabled = bool(enable)
+    _clear_encode_cache()
+
+
+def reset_stats():
+    """Reset all profiling counters."""
+    _counters.clear()
+    _clear_encode_cache()
+
+
+def stats():
+    """Profiling counters collected so far.
+
+    Returns:
+        `dict` of section -> typename -> counters, where section is one of
+        ``encode_exact``, ``encode_compat`` and ``decode``, and counters is a
+        `dict` with ``calls`` (number of calls), ``time`` (cumulative time,
+        in seconds) and ``predicate_misses`` (number of types of objects the
+        encoder's predicate didn't match; each type is counted once, since
+        encoders are resolved once per type, after profiling is enabled or
+        counters are reset).
+
+    Example:
+        >>> jsonplus.enable_stats()
+        >>> jsonplus.dumps([datetime.now()] * 3)
+        >>> jsonplus.stats()['encode_exact']['datetime']
+        {'calls': 3, 'time': 4.1e-06, 'predicate_misses': 0}
+    """
+    return dict((section, dict((typename, counter.as_dict())
+                               for typename, counter in counters.items()))
+                for section, counters in _counters.items())
+
+
+def predicate_miss(coding, typename):
+    _counter('encode_' + coding, typename).predicate_misses += 1
+
+
+def timed(section, typename, f):
+    """Wrap `f` to record its calls in counter for `typename`."""
+    counter = _counter(section, typename)
+    def _timed(value):
+        start = default_timer()
+        try:
+            return f(value)
+        finally:
+            counter.calls += 1
+            counter.time += default_timer() - start
+    return _timed
+
+
+def call(section, typename, f, value):
+    """Call `f(value)`, recording the call in counter for `typename`."""
+    return timed(section, typename, f)(value)
+
+
+def object_hook(dict):
+    """Profiling variant of :func:`jsonplus._json_object_hook`."""
+    classname = dict.get('__class__')
+    if classname:
+        constructor = jsonplus._decode_handlers.get(classname)
+        value = dict.get('__value__')
+        if constructor:
+            return call('decode', classname, constructor, value)
+        raise TypeError("Unknown class: '%s'" % classname)
+    return dict
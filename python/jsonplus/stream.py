@@ -0,0 +1,403 @@
+"""Streaming (iterative) encoding to, and decoding from, file objects."""
+
+try:
+    from collections.abc import Iterator
+except ImportError:
+    from collections import Iterator
+
+import binascii
+import codecs
+from itertools import islice
+import re
+
+import jsonplus
+from jsonplus import json
+from jsonplus.memo import memoize
+
+
+DEFAULT_BUFFER_SIZE = 64 * 1024
+
+# `bytes`-like values of at least this size are encoded (as base64) in
+# chunks, by `iterdump`, instead of as a whole
+BLOB_STREAM_THRESHOLD = 64 * 1024
+
+# chunk size for base64-encoding of blobs; multiple of 3, so that encoded
+# chunks concatenate to the encoding of a whole blob
+_BLOB_CHUNK_SIZE = 3 * 16 * 1024
+
+_BYTES_TYPES = ('bytes', 'bytearray', 'memoryview')
+
+# number of items (of arrays, and iterators) checked for `bytes` keys at once
+_TEXT_KEYS_BATCH = 256
+
+
+class _LazyArray(list):
+    """Stand-in for an iterator during (pure-Python) `simplejson` encoding.
+    Encoded as a JSON array, consuming the iterator item by item."""
+
+    def __init__(self, iterator):
+        super(_LazyArray, self).__init__()
+        self.iterator = iterator
+
+    def __iter__(self):
+        return self.iterator
+
+    def __bool__(self):
+        # might be empty, but we don't know yet
+        return True
+
+    __nonzero__ = __bool__
+
+
+class _LazyObject(dict):
+    """Stand-in for a dict during (pure-Python) `simplejson` encoding.
+    Encoded as a JSON object, with `bytes` keys decoded as text, and values
+    converted by `_text_keys`, item by item."""
+
+    def __init__(self, dct):
+        super(_LazyObject, self).__init__()
+        self.dct = dct
+
+    def items(self):
+        for key, value in self.dct.items():
+            if isinstance(key, bytes):
+                key = key.decode('utf-8')
+            yield key, _text_keys(value, objects=False)
+
+    def __bool__(self):
+        return bool(self.dct)
+
+    __nonzero__ = __bool__
+
+
+def _text_keys(obj, objects=True):
+    """`obj` with `bytes` keys (of nested dicts) decoded as text, as by
+    :func:`jsonplus._text_keys`, but lazily: a dict (if `objects`) or a list
+    is replaced by a stand-in, which converts items only as encoding reaches
+    them, and only if they have such keys.
+
+    (Nested dicts are not replaced, so that circular references are still
+    detected by the encoder.)
+    """
+    if objects and type(obj) is dict:
+        return _LazyObject(obj)
+    if type(obj) is list and obj:
+        return _LazyArray(_text_keys_batched(iter(obj)))
+    if jsonplus._has_bytes_keys(obj):
+        return jsonplus._text_keys(obj)
+    return obj
+
+
+def _text_keys_batched(items):
+    """Items of iterator `items`, with `bytes` keys decoded as text, checked
+    for such keys (and converted) in batches of `_TEXT_KEYS_BATCH`."""
+    while True:
+        batch = list(islice(items, _TEXT_KEYS_BATCH))
+        if not batch:
+            return
+        if jsonplus._has_bytes_keys(batch):
+            batch = jsonplus._text_keys(batch)
+        for item in batch:
+            yield item
+
+
+def _lazy_iterators(default):
+    """Wrap `default` encoding function to encode iterators (including
+    generators) as arrays, lazily (with `bytes` keys of items decoded as
+    text)."""
+    def _default(obj):
+        if isinstance(obj, Iterator):
+            return _LazyArray(_text_keys_batched(obj))
+        return default(obj)
+    return _default
+
+
+class _Blobs(object):
+    """Streaming encoder of large `bytes`-like values (blobs).
+
+    Blobs are encoded as placeholders (``\\x00<index>\\x00``, a sequence that
+    can't appear in JSON output otherwise), which are then expanded in the
+    output, as the JSON string of a blob's base64 encoding (wrapped as in
+    the exact coding, if needed) is produced chunk by chunk.
+    """
+
+    def __init__(self, kw, exact):
+        self.coding = 'exact' if exact else 'compat'
+        self.template_kw = dict(kw, default=None)
+        self.templates = {}
+        self.blobs = []
+
+    def streamable(self, obj):
+        if not isinstance(obj, (bytes, bytearray, memoryview)):
+            return False
+        if memoryview(obj).nbytes < BLOB_STREAM_THRESHOLD:
+            return False
+        handler = jsonplus._resolve_encoder(self.coding, obj)
+        if handler is None or handler[0] not in _BYTES_TYPES:
+            return False
+        if self.coding == 'compat':
+            return jsonplus.BYTES_COMPAT_FORMAT == 'base64'
+        return True
+
+    def wrap(self, default):
+        def _default(obj):
+            if self.streamable(obj):
+                self.blobs.append(obj)
+                return json.RawJSON(u'\x00%d\x00' % (len(self.blobs) - 1))
+            return default(obj)
+        return _default
+
+    def template(self, typename):
+        """JSON text surrounding the base64 value of blob of `typename`."""
+        if self.coding == 'compat':
+            return u'"', u'"'
+        try:
+            return self.templates[typename]
+        except KeyError:
+            pass
+        text = json.JSONEncoder(**self.template_kw).encode(
+            {"__class__": typename, "__value__": u'\x01'})
+        head, tail = text.split(u'"\\u0001"')
+        template = self.templates[typename] = (head + u'"', u'"' + tail)
+        return template
+
+    def stream(self, idx):
+        obj, self.blobs[idx] = self.blobs[idx], None
+        head, tail = self.template(type(obj).__name__)
+        yield head
+        view = jsonplus._byte_view(obj)
+        for start in range(0, len(view), _BLOB_CHUNK_SIZE):
+            chunk = view[start:start + _BLOB_CHUNK_SIZE]
+            yield binascii.b2a_base64(chunk, newline=False).decode('ascii')
+        yield tail
+
+    def expand(self, chunks):
+        for chunk in chunks:
+            if u'\x00' not in chunk:
+                yield chunk
+                continue
+            for idx, part in enumerate(chunk.split(u'\x00')):
+                if idx % 2:
+                    for piece in self.stream(int(part)):
+                        yield piece
+                elif part:
+                    yield part
+
+
+def iterdump(obj, buffer_size=DEFAULT_BUFFER_SIZE, **kw):
+    """Encode `obj` to JSON, iteratively, yielding chunks of output
+    (strings) as they become available.
+
+    Iterators and generators found in `obj` are encoded as arrays, and
+    consumed only as the encoding progresses. Large `bytes`-like values are
+    encoded in chunks, without creating their (complete) base64 copy. Together
+    with a pure-Python encoding loop, this keeps memory usage bounded,
+    regardless of the total size of output.
+
+    Args:
+        obj (object):
+            Object to encode.
+
+        buffer_size (int, default=64KiB):
+            Approximate size of chunks yielded. Set to ``0``/``None`` to yield
+            every (small) piece of output as it is produced.
+
+        **kw:
+            Keyword arguments as accepted by :func:`jsonplus.dumps`,
+            including ``exact``.
+
+    Example:
+        >>> rows = ({"id": i, "ts": datetime.now()} for i in range(10**7))
+        >>> for chunk in jsonplus.iterdump({"rows": rows}):
+        ...     sock.sendall(chunk.encode('utf8'))
+    """
+    # shape arguments (and resolve the preferred coding) upfront,
+    # not on the first iteration
+    cls = kw.pop('cls', json.JSONEncoder)
+    memo = kw.pop('memo', False)
+    exact = kw.get('exact', jsonplus._preferred_coding() == jsonplus.EXACT)
+    jsonplus._encoder_default_args(kw)
+    if memo:
+        memoize(kw)
+    blobs = None
+    if kw.get('indent') is None:
+        blobs = _Blobs(kw, exact)
+        kw['default'] = blobs.wrap(kw['default'])
+    kw['default'] = _lazy_iterators(kw['default'])
+    # (output can't be encoded again on failure, as in `jsonplus.dumps`)
+    chunks = cls(**kw).iterencode(_text_keys(obj))
+    if blobs is not None:
+        chunks = blobs.expand(chunks)
+    if not buffer_size:
+        return chunks
+    return _buffered(chunks, buffer_size)
+
+
+def _buffered(chunks, buffer_size):
+    buffer, size = [], 0
+    for chunk in chunks:
+        buffer.append(chunk)
+        size += len(chunk)
+        if size >= buffer_size:
+            yield ''.join(buffer)
+            buffer, size = [], 0
+    if buffer:
+        yield ''.join(buffer)
+
+
+_skip_whitespace = re.compile(r'[ \t\n\r]*').match
+_number_tail = re.compile(r'[0-9eE.+-]*\Z').match
+
+
+class _Reader(object):
+    """Buffered reader of JSON values from a file object."""
+
+    def __init__(self, fp, chunk_size):
+        self.fp = fp
+        self.chunk_size = chunk_size
+        self.buffer = u''
+        self.pos = 0
+        self.eof = False
+        self.decoder = codecs.getincrementaldecoder('utf-8')()
+
+    def error(self, msg):
+        return json.JSONDecodeError(msg, self.buffer, self.pos)
+
+    def fill(self, size=None):
+        """Read more data into buffer, dropping the data consumed.
+        Returns `False` on EOF."""
+        while not self.eof:
+            chunk = self.fp.read(size or self.chunk_size)
+            if not chunk:
+                self.eof = True
+            if isinstance(chunk, bytes):
+                chunk = self.decoder.decode(chunk, final=self.eof)
+            if chunk:
+                self.buffer = self.buffer[self.pos:] + chunk
+                self.pos = 0
+                return True
+        return False
+
+    def peek(self):
+        """Skip whitespace, and return the next character
+        (or an empty string on EOF)."""
+        while True:
+            self.pos = _skip_whitespace(self.buffer, self.pos).end()
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self.fill():
+                return u''
+
+    def next(self):
+        """Consume and return the next (non-whitespace) character."""
+        char = self.peek()
+        self.pos += 1
+        return char
+
+    def value(self, decoder):
+        """Decode the next complete JSON value with `decoder`."""
+        self.peek()
+        size = self.chunk_size
+        while True:
+            try:
+                obj, end = decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                # value is incomplete, or invalid
+                if not self.fill(size):
+                    raise
+                size *= 2
+                continue
+            # a number near the end of buffer (e.g. ``1.`` of ``1.5``) might
+            # continue in the next chunk, so it's decoded again once complete
+            if (self.buffer[self.pos] in u'-0123456789' and
+                    _number_tail(self.buffer, end) and self.fill(size)):
+                continue
+            self.pos = end
+            return obj
+
+
+def _iterload(reader, path, decoder, skipper):
+    """Yield values decoded with `decoder` at `path`, from the value
+    currently at `reader` (values not on the `path` are skipped)."""
+    if not path:
+        yield reader.value(decoder)
+        return
+
+    head, rest = path[0], path[1:]
+    char = reader.peek()
+
+    if char == u'[' and head == 'item':
+        reader.next()
+        if reader.peek() == u']':
+            reader.next()
+            return
+        while True:
+            for obj in _iterload(reader, rest, decoder, skipper):
+                yield obj
+            char = reader.next()
+            if char == u']':
+                return
+            if char != u',':
+                raise reader.error("Expecting ',' delimiter")
+
+    elif char == u'{':
+        reader.next()
+        if reader.peek() == u'}':
+            reader.next()
+            return
+        while True:
+            if reader.peek() != u'"':
+                raise reader.error("Expecting property name enclosed in double quotes")
+            key = reader.value(skipper)
+            if reader.next() != u':':
+                raise reader.error("Expecting ':' delimiter")
+            if key == head:
+                for obj in _iterload(reader, rest, decoder, skipper):
+                    yield obj
+            else:
+                reader.value(skipper)
+            char = reader.next()
+            if char == u'}':
+                return
+            if char != u',':
+                raise reader.error("Expecting ',' delimiter")
+
+    else:
+        reader.value(skipper)
+
+
+def iterload(fp, prefix='item', chunk_size=DEFAULT_BUFFER_SIZE, **kw):
+    """Decode values from a JSON document in file object `fp`, iteratively,
+    yielding (fully decoded) values found at `prefix`, one at a time.
+
+    The document is read in chunks, so memory usage is proportional to the
+    size of a single value yielded (and values skipped on the way to
+    `prefix`), not to the size of the document.
+
+    Args:
+        fp (file):
+            File object (text or binary, UTF-8 encoded) to read from.
+
+        prefix (str, default='item'):
+            Dot-separated path to values yielded, where ``item`` stands for
+            each item of an array, and other components are object keys.
+            For example, ``item`` yields items of the top-level array,
+            ``rows.item`` yields items of the array under the ``rows`` key
+            of the top-level object, and an empty prefix yields the complete
+            document.
+
+        chunk_size (int, default=64KiB):
+            Size of chunks read from `fp`.
+
+        **kw:
+            Keyword arguments as accepted by :func:`jsonplus.loads`.
+
+    Example:
+        >>> with open('export.json') as fp:
+        ...     for row in jsonplus.iterload(fp, prefix='rows.item'):
+        ...         process(row)
+    """
+    jsonplus._decoder_default_args(kw)
+    decoder = json.JSONDecoder(**kw)
+    path = prefix.split('.') if prefix else []
+    return _iterload(_Reader(fp, chunk_size), path, decoder, json.JSONDecoder())
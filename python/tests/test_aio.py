@@ -0,0 +1,155 @@
+#!/usr/bin/env python
+# encoding: utf8
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), os.pardir))
+
+import unittest
+import asyncio
+import jsonplus as json
+import jsonplus.aio
+
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+
+try:
+    import numpy
+    import pandas
+except ImportError:
+    numpy = pandas = None
+
+
+class Writer(object):
+    """Minimal ``asyncio.StreamWriter`` stand-in."""
+
+    def __init__(self):
+        self.chunks = []
+        self.drained = 0
+
+    def write(self, data):
+        self.chunks.append(data)
+
+    async def drain(self):
+        self.drained += 1
+
+    def getvalue(self):
+        return b''.join(self.chunks).decode('utf-8')
+
+
+def reader(data):
+    # (created within a running event loop)
+    stream = asyncio.StreamReader()
+    stream.feed_data(data)
+    stream.feed_eof()
+    return stream
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+class TestAio(unittest.TestCase):
+    def setUp(self):
+        json.prefer_exact()
+        self.ts = datetime(2017, 2, 17, 2, 41, 4, 390605)
+        self.value = {"ts": self.ts, "rows": [{"id": i, "name": "row %d" % i} for i in range(3)]}
+
+    def tearDown(self):
+        json.prefer_exact()
+        jsonplus.aio.use_executor(None)
+
+    def test_roundtrip(self):
+        for threshold in (None, 0, jsonplus.aio.OFFLOAD_THRESHOLD):
+            s = run(jsonplus.aio.dumps(self.value, threshold=threshold))
+            self.assertEqual(s, json.dumps(self.value))
+            self.assertEqual(run(jsonplus.aio.loads(s, threshold=threshold)), self.value)
+
+    def test_offload(self):
+        threads = []
+        class Executor(ThreadPoolExecutor):
+            def submit(self, fn, *pa, **kw):
+                threads.append(fn)
+                return super(Executor, self).submit(fn, *pa, **kw)
+
+        with Executor(1) as executor:
+            # small payloads are encoded in place
+            run(jsonplus.aio.dumps([1], executor=executor))
+            run(jsonplus.aio.loads('[1]', executor=executor))
+            self.assertEqual(len(threads), 0)
+
+            large = ["x" * 1000] * 100
+            s = run(jsonplus.aio.dumps(large, executor=executor))
+            self.assertEqual(run(jsonplus.aio.loads(s, executor=executor)), large)
+            self.assertEqual(len(threads), 2)
+
+            jsonplus.aio.use_executor(executor)
+            run(jsonplus.aio.dumps(large))
+            self.assertEqual(len(threads), 3)
+
+    def test_estimated_size(self):
+        visited = []
+        class Items(list):
+            def __iter__(self):
+                for item in super(Items, self).__iter__():
+                    visited.append(item)
+                    yield item
+
+        # items are visited only until the limit is reached
+        value = {"rows": Items([[1, 2]] * 10000)}
+        self.assertTrue(jsonplus.aio._estimated_size(value, 100) > 100)
+        self.assertTrue(len(visited) <= 100)
+        self.assertEqual(jsonplus.aio._estimated_size({"a": ["xy", 1]}, 100), 25)
+
+    @unittest.skipIf(pandas is None, "numpy/pandas not installed")
+    def test_estimated_size_data(self):
+        limit = jsonplus.aio.OFFLOAD_THRESHOLD
+        array = numpy.zeros(10 ** 6)
+        for value in [array, {"data": [array]}, pandas.Series(array),
+                      pandas.DataFrame({"x": array}), memoryview(array)]:
+            self.assertTrue(jsonplus.aio._estimated_size(value, limit) > limit)
+        self.assertTrue(jsonplus.aio._estimated_size(numpy.zeros(10), limit) < limit)
+
+    def test_preferred_coding(self):
+        json.prefer_compat()
+        with ThreadPoolExecutor(1) as executor:
+            s = run(jsonplus.aio.dumps(self.ts, executor=executor, threshold=0))
+        self.assertEqual(s, '"2017-02-17T02:41:04.390605"')
+        self.assertEqual(run(jsonplus.aio.dumps(self.ts, exact=True, threshold=0)),
+                         json.dumps(self.ts, exact=True))
+
+    def test_process_pool(self):
+        with ProcessPoolExecutor(1) as executor:
+            s = run(jsonplus.aio.dumps(self.value, executor=executor, threshold=0))
+            self.assertEqual(run(jsonplus.aio.loads(s, executor=executor, threshold=0)), self.value)
+
+    def test_stream(self):
+        writer = Writer()
+        rows = [{"id": i, "ts": self.ts} for i in range(1000)]
+        run(jsonplus.aio.dump(rows, writer, buffer_size=1024))
+        self.assertTrue(writer.drained > 1)
+        self.assertEqual(writer.getvalue(), json.dumps(rows))
+        async def load(data):
+            return await jsonplus.aio.load(reader(data))
+        self.assertEqual(run(load(writer.getvalue().encode('utf-8'))), rows)
+
+    def test_lines(self):
+        async def values():
+            for i in range(3):
+                yield {"id": i, "ts": self.ts}
+
+        async def collect(data):
+            return [value async for value in jsonplus.aio.load_lines(reader(data))]
+
+        for source in (values(), [{"id": i, "ts": self.ts} for i in range(3)]):
+            writer = Writer()
+            run(jsonplus.aio.dump_lines(source, writer))
+            self.assertEqual(writer.getvalue().count('\n'), 3)
+            data = writer.getvalue().encode('utf-8') + b'\n'
+            self.assertEqual(run(collect(data)),
+                             [{"id": i, "ts": self.ts} for i in range(3)])
+
+        self.assertRaises(ValueError, run, jsonplus.aio.dump_lines([1], Writer(), indent=2))
+
+
+if __name__ == '__main__':
+    unittest.main()
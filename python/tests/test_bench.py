@@ -0,0 +1,59 @@
+#!/usr/bin/env python
+# encoding: utf8
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), os.pardir))
+
+import unittest
+import jsonplus as json
+import io
+
+from jsonplus import bench
+
+
+class TestBench(unittest.TestCase):
+    def test_workloads(self):
+        # workloads are reproducible, and encodable in both codings
+        for name, generate in bench.WORKLOADS.items():
+            payload = generate(bench.random.Random(bench.SEED), 10)
+            again = generate(bench.random.Random(bench.SEED), 10)
+            self.assertEqual(json.dumps(payload, sort_keys=True),
+                             json.dumps(again, sort_keys=True))
+            self.assertEqual(json.loads(json.dumps(payload, exact=True)), payload)
+            json.dumps(payload, exact=False)
+
+    def test_bench(self):
+        results = bench.bench(['flat_dict', 'datetime'], size=10, repeat=1, number=1)
+        self.assertEqual([(r['workload'], r['coding'], r['operation']) for r in results], [
+            ('flat_dict', 'exact', 'encode'), ('flat_dict', 'exact', 'decode'),
+            ('flat_dict', 'compat', 'encode'), ('flat_dict', 'compat', 'decode'),
+            ('datetime', 'exact', 'encode'), ('datetime', 'exact', 'decode'),
+            ('datetime', 'compat', 'encode'), ('datetime', 'compat', 'decode'),
+        ])
+        for result in results:
+            self.assertTrue(result['ops_per_sec'] > 0)
+            self.assertTrue(result['mb_per_sec'] > 0)
+            self.assertTrue(result['peak_memory'] > 0)
+
+    def test_engines(self):
+        results = bench.bench_engines(['rows'], size=10, repeat=1, number=1)
+        self.assertEqual(list(results), ['rows'])
+        self.assertEqual(list(results['rows'])[0], 'simplejson')
+        for rate in results['rows'].values():
+            self.assertTrue(rate > 0)
+
+    def test_json_output(self):
+        stdout, sys.stdout = sys.stdout, io.StringIO()
+        try:
+            bench.main(['--json', '-w', 'mixed', '-c', 'exact', '-n', '10',
+                        '-r', '1', '--number', '1'])
+            output = sys.stdout.getvalue()
+        finally:
+            sys.stdout = stdout
+        report = json.loads(output)
+        self.assertEqual(report['environment']['size'], 10)
+        self.assertEqual(len(report['results']), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,104 @@
+#!/usr/bin/env python
+# encoding: utf8
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), os.pardir))
+
+import unittest
+import jsonplus as json
+import jsonplus.binary
+
+from datetime import datetime, timedelta, date, time
+from decimal import Decimal
+from fractions import Fraction
+from collections import namedtuple, OrderedDict
+from dateutil.tz import tzoffset
+import uuid
+
+from moneyed import Money
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+
+class TestBinary(unittest.TestCase):
+    def setUp(self):
+        self.ts = datetime(2017, 2, 17, 2, 41, 4, 390605)
+        Point = namedtuple('Point', 'x y')
+        self.plus = [
+            self.ts, self.ts.replace(tzinfo=tzoffset(None, -5400)), self.ts.date(),
+            self.ts.time(), self.ts.timetz().replace(tzinfo=tzoffset(None, 3600)),
+            timedelta(10), set(range(10)), frozenset(range(10)), 1+2j,
+            Decimal('3.14'), Decimal('-Infinity'), Fraction(1, 3), (1, 2, 3), (),
+            uuid.UUID('16ebeeb6-fc5f-4266-a3a9-50c320d87810'), Point(3, (4, 5)),
+            Money('3.14', 'USD'), float('inf'), -1.5, b'\x00\xff' * 200, u"žaba",
+            {"a": [1, {"b": None}], 1: True, (1, 2): False}, OrderedDict([("x", 1)]),
+            [0, 127, 128, 255, 256, 2**16, 2**32, 2**64 - 1, -1, -32, -33, -2**7 - 1,
+             -2**15 - 1, -2**31 - 1, -2**63],
+            u"x" * 40, u"x" * 300, u"x" * 70000, list(range(20)), dict.fromkeys(range(20)),
+            bytearray(b'\x00\xff'), memoryview(b'abc'),
+            [b'x', bytearray(b'y'), {"k": memoryview(b'z'), memoryview(b'k'): 1}]
+        ]
+
+    def test_roundtrip_pure(self):
+        for value in self.plus:
+            self.assertEqual(json.unpackb(json.packb(value, accelerated=False),
+                                          accelerated=False), value)
+
+    @unittest.skipIf(msgpack is None, "msgpack not installed")
+    def test_accelerated_compatible(self):
+        for value in self.plus:
+            data = json.packb(value, accelerated=False)
+            self.assertEqual(json.packb(value), data)
+            self.assertEqual(json.unpackb(data), value)
+
+    def test_buffers_preserved(self):
+        x = [bytearray(b'x'), memoryview(b'y'), {"k": bytearray(b'z')}]
+        for accelerated in (True, False):
+            y = json.unpackb(json.packb(x, accelerated=accelerated))
+            self.assertEqual([type(y[0]), type(y[1]), type(y[2]["k"])],
+                             [bytearray, memoryview, bytearray])
+
+    @unittest.skipIf(msgpack is None, "msgpack not installed")
+    def test_accelerated_single_pass(self):
+        # values with bin type codes in their packed form (like 197, or
+        # UTF-8 text) don't make `packb` copy or repack the value
+        rows = [{"id": 197, "name": u"Łukasz šum", "score": [1.5, 198]}] * 1000
+        calls = []
+        binary = jsonplus.binary
+        packb = binary._msgpack_packb
+        def counted(obj):
+            calls.append(obj)
+            return packb(obj)
+        binary._msgpack_packb = counted
+        try:
+            data = json.packb(rows)
+        finally:
+            binary._msgpack_packb = packb
+        self.assertEqual(len(calls), 1)
+        self.assertTrue(calls[0] is rows)
+        self.assertEqual(data, json.packb(rows, accelerated=False))
+
+    def test_types_preserved(self):
+        x = self.plus[:]
+        y = json.unpackb(json.packb(x, accelerated=False), accelerated=False)
+        self.assertEqual([type(v).__name__ for v in y[:21]],
+                         [type(v).__name__ for v in x[:21]])
+        self.assertEqual(y[1].utcoffset(), x[1].utcoffset())
+
+    def test_size(self):
+        rows = [{"ts": self.ts + timedelta(i), "amount": Decimal(i), "id": uuid.uuid4()}
+                for i in range(100)]
+        self.assertTrue(len(json.packb(rows)) < len(json.dumps(rows)) / 2)
+
+    def test_overflow(self):
+        self.assertRaises(OverflowError, json.packb, 2**64, accelerated=False)
+
+    def test_unknown(self):
+        self.assertRaises(TypeError, json.packb, object(), accelerated=False)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,129 @@
+#!/usr/bin/env python
+# encoding: utf8
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), os.pardir))
+
+import unittest
+import jsonplus as json
+import jsonplus.stream
+import array
+import io
+
+
+class TestBytes(unittest.TestCase):
+    def setUp(self):
+        json.prefer_exact()
+        self.data = bytes(bytearray(range(256))) * 3
+
+    def tearDown(self):
+        json.BYTES_COMPAT_FORMAT = 'text'
+
+    def test_exact(self):
+        for value in (self.data, bytearray(self.data), b''):
+            self.assertEqual(json.loads(json.dumps(value)), value)
+            self.assertEqual(type(json.loads(json.dumps(value))), type(value))
+
+        view = json.loads(json.dumps(memoryview(self.data)))
+        self.assertIsInstance(view, memoryview)
+        self.assertEqual(view.tobytes(), self.data)
+
+        self.assertEqual(json.dumps(b'jsonplus'),
+                         '{"__class__":"bytes","__value__":"anNvbnBsdXM="}')
+
+    def test_buffers(self):
+        # non-contiguous, and multi-byte item views
+        self.assertEqual(json.loads(json.dumps(memoryview(self.data)[::2])).tobytes(),
+                         self.data[::2])
+        ints = array.array('i', [1, 2, 3])
+        self.assertEqual(json.loads(json.dumps(memoryview(ints))).tobytes(), ints.tobytes())
+
+    def test_compat(self):
+        self.assertEqual(json.dumps(b'json', exact=False), '"json"')
+        value = b'\x00\xffjson'
+        for fmt, expected in [('base64', '"AP9qc29u"'), ('hex', '"00ff6a736f6e"'),
+                              ('array', '[0,255,106,115,111,110]')]:
+            json.BYTES_COMPAT_FORMAT = fmt
+            self.assertEqual(json.dumps(value, exact=False), expected)
+        json.BYTES_COMPAT_FORMAT = 'text'
+        self.assertEqual(json.dumps(u'žaba'.encode('utf8'), exact=False), u'"\\u017eaba"')
+
+    def test_keys(self):
+        # keys are always encoded as text
+        for exact in (True, False):
+            self.assertEqual(json.dumps({b'k': 1}, exact=exact), '{"k":1}')
+            self.assertEqual(json.dumps([(1, {b'k': 1})], exact=False), '[[1,{"k":1}]]')
+            self.assertEqual(''.join(json.iterdump({b'k': [{b'j': 1}]}, exact=exact)),
+                             '{"k":[{"j":1}]}')
+            self.assertEqual(json.dumps_many([{b'k': 1}], exact=exact), ['{"k":1}'])
+        value = {b'k': (b'v', {b'j': 1})}
+        self.assertEqual(json.loads(json.dumps(value)), {'k': (b'v', {'j': 1})})
+        self.assertRaises(TypeError, json.dumps, {(1, 2): 1})
+
+    def test_keys_streamed(self):
+        # converted lazily, only where needed, including items of iterators
+        rows = [{"id": 1}, {b"id": 2, "v": [{b"k": b"v"}]}, {"id": (3, {b"k": 4})}]
+        for exact in (True, False):
+            self.assertEqual(''.join(json.iterdump(iter(rows), exact=exact)),
+                             json.dumps(rows, exact=exact))
+            self.assertEqual(''.join(json.iterdump({b"rows": rows}, exact=exact, sort_keys=True)),
+                             json.dumps({"rows": rows}, exact=exact, sort_keys=True))
+        self.assertEqual(''.join(json.iterdump([{"id": 1}], indent=2)), json.dumps([{"id": 1}], indent=2))
+        cycle = [{"k": 1}]
+        cycle.append(cycle)
+        self.assertRaises(ValueError, ''.join, json.iterdump(cycle))
+        self.assertRaises(ValueError, ''.join, json.iterdump({"a": cycle}))
+
+    def test_keys_retried_on_key_errors(self):
+        calls = []
+        def encode(obj):
+            calls.append(obj)
+            raise TypeError("Object of type object is not JSON serializable")
+        self.assertRaises(TypeError, jsonplus._encode_text_keys, encode, {b"k": object()})
+        self.assertEqual(len(calls), 1)
+        self.assertRaises(TypeError, json.dumps, {b"k": object()})
+
+    def test_nested(self):
+        doc = {"blob": self.data, "items": [bytearray(b'x'), (b'y', 1)]}
+        self.assertEqual(json.loads(json.dumps(doc)), doc)
+
+
+class TestStreamingBytes(unittest.TestCase):
+    def setUp(self):
+        json.prefer_exact()
+        self.threshold = jsonplus.stream.BLOB_STREAM_THRESHOLD
+        jsonplus.stream.BLOB_STREAM_THRESHOLD = 1000
+        json.BYTES_COMPAT_FORMAT = 'base64'
+        self.blob = bytes(bytearray(range(256))) * 1000
+        self.doc = {"a": self.blob, "b": [bytearray(b'xy'), memoryview(self.blob)[:100001]],
+                    "c": [self.blob, 1]}
+
+    def tearDown(self):
+        jsonplus.stream.BLOB_STREAM_THRESHOLD = self.threshold
+        json.BYTES_COMPAT_FORMAT = 'text'
+
+    def test_same_as_dumps(self):
+        for exact in (True, False):
+            for kw in ({}, {'sort_keys': True}, {'separators': (', ', ': ')},
+                       {'indent': 2}):
+                for buffer_size in (None, 1 << 16):
+                    self.assertEqual(''.join(json.iterdump(self.doc, buffer_size=buffer_size,
+                                                           exact=exact, **kw)),
+                                     json.dumps(self.doc, exact=exact, **kw))
+        json.BYTES_COMPAT_FORMAT = 'hex'
+        self.assertEqual(''.join(json.iterdump(self.doc, exact=False)),
+                         json.dumps(self.doc, exact=False))
+
+    def test_chunked(self):
+        chunks = list(json.iterdump(self.blob, buffer_size=None))
+        self.assertTrue(len(chunks) > 2)
+        self.assertTrue(max(len(chunk) for chunk in chunks) < len(self.blob))
+
+    def test_dump(self):
+        fp = io.StringIO()
+        json.dump(self.doc, fp)
+        self.assertEqual(json.loads(fp.getvalue()), json.loads(json.dumps(self.doc)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python
+# encoding: utf8
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), os.pardir))
+
+import unittest
+import asyncio
+import threading
+import jsonplus as json
+import jsonplus.aio
+
+from datetime import date
+from concurrent.futures import ThreadPoolExecutor
+
+
+EXACT_DATE = '{"__class__":"date","__value__":"2017-02-17"}'
+COMPAT_DATE = '"2017-02-17"'
+
+
+class TestCoding(unittest.TestCase):
+    def setUp(self):
+        json.prefer_exact()
+        self.date = date(2017, 2, 17)
+
+    def tearDown(self):
+        json.prefer_exact()
+
+    def test_context_manager(self):
+        with json.coding(json.COMPAT):
+            self.assertEqual(json.dumps(self.date), COMPAT_DATE)
+            with json.coding(json.EXACT):
+                self.assertEqual(json.dumps(self.date), EXACT_DATE)
+            self.assertEqual(json.dumps(self.date), COMPAT_DATE)
+        self.assertEqual(json.dumps(self.date), EXACT_DATE)
+
+        # restored on errors too
+        try:
+            with json.coding(json.COMPAT):
+                raise ValueError
+        except ValueError:
+            pass
+        self.assertEqual(json.dumps(self.date), EXACT_DATE)
+
+    def test_threads(self):
+        json.prefer_compat()
+        results = []
+        thread = threading.Thread(target=lambda: results.append(json.dumps(self.date)))
+        thread.start()
+        thread.join()
+        self.assertEqual(results, [EXACT_DATE])
+        self.assertEqual(json.dumps(self.date), COMPAT_DATE)
+
+    def test_tasks(self):
+        async def request(coding, started, proceed):
+            json.prefer(coding)
+            started.set()
+            await proceed.wait()
+            return json.dumps(self.date)
+
+        async def main():
+            # preference set in one task doesn't leak to another one
+            # (on the same thread), nor to the caller
+            started = [asyncio.Event(), asyncio.Event()]
+            proceed = asyncio.Event()
+            tasks = [asyncio.ensure_future(request(json.COMPAT, started[0], proceed)),
+                     asyncio.ensure_future(request(json.EXACT, started[1], proceed))]
+            for event in started:
+                await event.wait()
+            proceed.set()
+            return await asyncio.gather(*tasks), json.dumps(self.date)
+
+        self.assertEqual(asyncio.run(main()), ([COMPAT_DATE, EXACT_DATE], EXACT_DATE))
+
+    def test_executor(self):
+        async def main():
+            with json.coding(json.COMPAT):
+                with ThreadPoolExecutor(1) as executor:
+                    return await jsonplus.aio.dumps(self.date, executor=executor, threshold=0)
+
+        self.assertEqual(asyncio.run(main()), COMPAT_DATE)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,117 @@
+#!/usr/bin/env python
+# encoding: utf8
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), os.pardir))
+
+import unittest
+import jsonplus as json
+from jsonplus import compact
+import simplejson
+import io
+
+from datetime import datetime, timedelta
+from decimal import Decimal
+from fractions import Fraction
+from collections import namedtuple
+import uuid
+
+from moneyed import Money
+
+
+Row = namedtuple('Row', 'id ts amount')
+
+
+class TestCompact(unittest.TestCase):
+    def setUp(self):
+        json.prefer_exact()
+        self.ts = datetime(2017, 2, 17, 2, 41, 4, 390605)
+        self.plus = [
+            self.ts, self.ts.date(), self.ts.time(), timedelta(10),
+            set(range(10)), frozenset(range(10)), 1+2j,
+            Decimal('3.14'), Fraction(1, 3), (1, 2, 3), (),
+            uuid.UUID('16ebeeb6-fc5f-4266-a3a9-50c320d87810'),
+            Money('3.14', 'USD'), {"__t__": "not tagged"}, {"a": [1, {"b": None}]}
+        ]
+        self.rows = [Row(i, self.ts + timedelta(i), Decimal(i)) for i in range(100)]
+
+    def test_roundtrip(self):
+        data = json.dumps(self.plus, compact=True)
+        self.assertTrue(data.startswith('{"__jsonplus__":'))
+        self.assertEqual(json.loads(data), self.plus)
+        self.assertEqual(json.loads(data.encode('utf8')), self.plus)
+
+    def test_scalar(self):
+        for value in [self.ts, 1, None, "str", []]:
+            self.assertEqual(json.loads(json.dumps(value, compact=True)), value)
+
+    def test_not_compact(self):
+        # regular documents with a `__jsonplus__` key first
+        for value in [{"__jsonplus__": 1},
+                      {"__jsonplus__": {"classes": [1]}, "x": self.ts},
+                      {"__jsonplus__": {"classes": [], "schemas": []}, "x": 1},
+                      {"__jsonplus__": {"classes": [], "schemas": []}, "__data__": 5},
+                      {"__jsonplus__": {"version": 2, "classes": [], "schemas": []}, "__data__": 5},
+                      {"__jsonplus__": {"version": 1, "classes": ["datetime"], "schemas": []},
+                       "__data__": [{"__t__": [1, "x"]}, {"__t__": [-1, "x"]}, {"__t__": ["0", "x"]}]},
+                      {"__jsonplus__": {"version": 1, "classes": ["namedtuple"], "schemas": []},
+                       "__data__": {"__t__": [0, [0, 1]]}}]:
+            data = json.dumps(value)
+            self.assertEqual(json.loads(data), value)
+            self.assertEqual(json.loads(data.encode('utf8')), value)
+            self.assertEqual(json.loads(data, lazy=True), value)
+
+    def test_malformed(self):
+        data = '{"__jsonplus__":{"version":1,"classes":["datetime"],"schemas":[]},"__data__":{"__t__":[%s,"x"]}}'
+        for cid in ('1', '-1', 'null', 'true'):
+            self.assertRaises(compact.NotCompact, compact.loads, data % cid)
+
+    def test_namedtuple_schemas(self):
+        data = json.dumps(self.rows, compact=True)
+        header = simplejson.loads(data)['__jsonplus__']
+        self.assertEqual(header['classes'], ['namedtuple', 'datetime', 'Decimal'])
+        self.assertEqual(header['schemas'], [['Row', ['id', 'ts', 'amount']]])
+        self.assertEqual(json.loads(data), self.rows)
+
+    def test_size(self):
+        compact = json.dumps(self.rows, compact=True)
+        regular = json.dumps(self.rows)
+        self.assertTrue(len(compact) < len(regular) / 2)
+
+    def test_dump_load(self):
+        fp = io.StringIO()
+        json.dump(self.rows, fp, compact=True)
+        fp.seek(0)
+        self.assertEqual(json.load(fp), self.rows)
+
+        fp = io.StringIO()
+        json.dump(self.rows, fp, compact=False, buffer_size=10)
+        self.assertEqual(fp.getvalue(), json.dumps(self.rows))
+
+    def test_compat_preferred(self):
+        json.prefer_compat()
+        self.assertEqual(json.loads(json.dumps(self.plus, compact=True, exact=True)), self.plus)
+
+    def test_compat_ignored(self):
+        self.assertEqual(json.dumps(self.ts, compact=True, exact=False),
+                         '"2017-02-17T02:41:04.390605"')
+
+    def test_user_encoder(self):
+        class mytype4(object):
+            def __init__(self, val):
+                self.val = val
+
+        @json.encoder('mytype4')
+        def mytype_encoder(obj):
+            return obj.val
+
+        @json.decoder('mytype4')
+        def mytype_decoder(val):
+            return mytype4(val)
+
+        y = json.loads(json.dumps([mytype4(self.ts), mytype4(1)], compact=True))
+        self.assertEqual([y[0].val, y[1].val], [self.ts, 1])
+
+
+if __name__ == '__main__':
+    unittest.main()
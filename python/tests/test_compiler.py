@@ -0,0 +1,75 @@
+#!/usr/bin/env python
+# encoding: utf8
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), os.pardir))
+
+import unittest
+import jsonplus as json
+
+from datetime import datetime, timedelta
+from decimal import Decimal
+from collections import namedtuple
+import uuid
+
+from moneyed import Money
+
+
+Record = namedtuple('Record', 'id ts amount')
+
+
+class TestCompile(unittest.TestCase):
+    def setUp(self):
+        json.prefer_exact()
+        self.ts = datetime(2017, 2, 17, 2, 41, 4, 390605)
+        self.row = {
+            "id": uuid.UUID('16ebeeb6-fc5f-4266-a3a9-50c320d87810'),
+            "ts": self.ts,
+            "price": Decimal('3.14'),
+            "money": Money('3.14', 'USD'),
+            "tags": {"a", "b"},
+            "record": Record(1, self.ts, Decimal('1.10')),
+            "name": "row"
+        }
+
+    def assertSameEncoding(self, example, values, **kw):
+        dumps = json.compile(example, **kw)
+        for value in values:
+            self.assertEqual(dumps(value), json.dumps(value, **kw))
+
+    def test_native(self):
+        self.assertSameEncoding({"a": [1, 2], "b": "c"}, [{"a": [3], "b": None}])
+
+    def test_record(self):
+        other = dict(self.row, ts=self.ts + timedelta(1), price=Decimal('0'))
+        self.assertSameEncoding(self.row, [self.row, other], sort_keys=True)
+
+    def test_record_compat(self):
+        self.assertSameEncoding(self.row, [self.row], sort_keys=True, exact=False)
+
+    def test_list_of_records(self):
+        rows = [Record(i, self.ts + timedelta(i), Decimal(i)) for i in range(10)]
+        self.assertSameEncoding(rows, [rows, rows[:3], []])
+        self.assertEqual(json.loads(json.compile(rows)(rows)), rows)
+
+    def test_mismatch(self):
+        mismatched = [
+            dict(self.row, ts=self.ts.date()),
+            dict(self.row, ts=None, extra=self.ts),
+            dict(self.row, record=(1, 2)),
+            dict((k, v) for k, v in self.row.items() if k != 'ts'),
+            [self.row],
+            self.ts
+        ]
+        self.assertSameEncoding(self.row, mismatched, sort_keys=True)
+
+    def test_heterogeneous_list(self):
+        example = [1, self.ts, Decimal('1')]
+        self.assertSameEncoding(example, [example, [2, self.ts], [self.ts, 1, 2]])
+
+    def test_unserializable(self):
+        self.assertRaises(TypeError, json.compile, {"x": object()})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -122,6 +122,33 @@ class TestDecorators(unittest.TestCase):
         self.assertEqual(r['__class__'], 'mycls')
         self.assertEqual(r['__value__'], 'valid')
 
+    def test_encoder_cache_invalidation(self):
+        class mycls(object):
+            pass
+
+        # unknown type resolution is cached as well
+        self.assertRaises(TypeError, jsonplus.dumps, mycls(), exact=True)
+
+        @jsonplus.encoder('mycls', lambda obj: isinstance(obj, mycls))
+        def _enc(obj):
+            return 'registered'
+
+        r = json.loads(jsonplus.dumps(mycls(), exact=True))
+
+        self.assertEqual(r['__class__'], 'mycls')
+        self.assertEqual(r['__value__'], 'registered')
+
+    def test_encoder_cache_weak(self):
+        # cached types can still be garbage collected
+        from collections import namedtuple
+        import gc
+        cache = jsonplus._encode_cache['exact']
+        size = len(cache)
+        for i in range(100):
+            jsonplus.dumps(namedtuple('Point%d' % i, 'x y')(1, 2), exact=True)
+        gc.collect()
+        self.assertTrue(len(cache) <= size + 1)
+
 
 if __name__ == '__main__':
     unittest.main()
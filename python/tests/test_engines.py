@@ -0,0 +1,181 @@
+#!/usr/bin/env python
+# encoding: utf8
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), os.pardir))
+
+import unittest
+import jsonplus as json
+import io
+
+from datetime import datetime, timedelta
+from decimal import Decimal
+from fractions import Fraction
+from collections import namedtuple, OrderedDict
+import uuid
+
+from moneyed import Money
+
+from jsonplus.engines import available_engines, get_engine, Engine
+
+
+ENGINES = [name for name in available_engines() if name != 'simplejson']
+
+
+class Item(object):
+    def __init__(self, value):
+        self.value = value
+
+    def for_json(self):
+        return {"item": self.value}
+
+
+class TestConformance(unittest.TestCase):
+    """Output of all engines has to match the output of `simplejson`."""
+
+    def setUp(self):
+        json.prefer_exact()
+        self.ts = datetime(2017, 2, 17, 2, 41, 4, 390605)
+        Point = namedtuple('Point', 'x y')
+        self.values = [
+            {"a": "str", "i": 123, "f": 1.23, "l": [4, 3], "n": None,
+             "b": [True, False], "d": {"x": {"y": []}}, "e": {}},
+            [self.ts, self.ts.date(), self.ts.time(), timedelta(10)],
+            [Decimal('3.14'), 1+2j, Fraction(1, 3), 2**62, -0.5, 0.1],
+            [(1, 2), {3}, frozenset([4]), Point(5, (6, self.ts))],
+            [uuid.UUID('16ebeeb6-fc5f-4266-a3a9-50c320d87810'), Money('1.23', 'EUR')],
+            {1: "int", 2.5: "float", None: "null", True: "bool"},
+            [u"žaba", u"\U0001f600", u"a\u2028b", u"\x7f", u"\"\\/\n"],
+            OrderedDict([("z", 1), ("a", Item(Point(1, 2)))]),
+            [[[]], [{}], u"", 0],
+            [b"bytes", bytearray(b"\x00\xc5\xbe"), {b"key": 1}],
+        ]
+
+    def assertConforms(self, engine, value, **kw):
+        expected = json.dumps(value, **kw)
+        self.assertEqual(json.dumps(value, engine=engine, **kw), expected)
+        # (compared by repr, since nan != nan)
+        self.assertEqual(repr(json.loads(expected, engine=engine)), repr(json.loads(expected)))
+
+    def test_exact(self):
+        for engine in ENGINES:
+            for value in self.values:
+                self.assertConforms(engine, value, exact=True)
+                self.assertConforms(engine, value, exact=True, sort_keys=True)
+
+    def test_compat(self):
+        for engine in ENGINES:
+            for value in self.values:
+                self.assertConforms(engine, value, exact=False)
+
+    def test_ensure_ascii(self):
+        for engine in ENGINES:
+            for value in self.values:
+                self.assertConforms(engine, value, ensure_ascii=False)
+
+    def test_indent(self):
+        for engine in ENGINES:
+            for value in self.values:
+                self.assertConforms(engine, value, indent=2, separators=(',', ': '))
+
+    def test_nonfinite(self):
+        values = [float('nan'), float('inf'), -float('inf')]
+        for engine in ENGINES:
+            self.assertConforms(engine, values, exact=False)
+            if engine != 'orjson':
+                self.assertConforms(engine, values, exact=True)
+
+    def test_orjson_nonfinite(self):
+        if 'orjson' not in ENGINES:
+            self.skipTest("orjson not installed")
+        self.assertRaises(ValueError, json.dumps, float('nan'), engine='orjson', exact=True)
+
+    def test_unsupported(self):
+        for engine in ENGINES:
+            self.assertRaises(TypeError, json.dumps, 1, engine=engine, bigint_as_string=True)
+            self.assertRaises(TypeError, json.dumps, object(), engine=engine)
+            self.assertRaises(TypeError, json.dumps, {object(): 1}, engine=engine)
+            self.assertEqual(json.dumps({object(): 1}, engine=engine, skipkeys=True), '{}')
+
+    def test_circular(self):
+        x = []
+        x.append(x)
+        for engine in ENGINES:
+            self.assertRaises(ValueError, json.dumps, x, engine=engine)
+            self.assertRaises(ValueError, json.dumps, x, engine=engine, exact=False)
+
+    def test_unknown_engine(self):
+        self.assertRaises(ValueError, json.dumps, 1, engine='nope')
+
+
+class TestInstanceCache(unittest.TestCase):
+    def setUp(self):
+        json.prefer_exact()
+        self.engine = get_engine('simplejson')
+        self.ts = datetime(2017, 2, 17)
+
+    def test_reuse(self):
+        self.assertIs(self.engine.encoder({}), self.engine.encoder({'exact': True}))
+        self.assertIsNot(self.engine.encoder({}), self.engine.encoder({'exact': False}))
+        self.assertIsNot(self.engine.encoder({}), self.engine.encoder({'sort_keys': True}))
+        self.assertIs(self.engine.decoder({}), self.engine.decoder({}))
+
+    def test_preferred_coding(self):
+        self.assertEqual(json.dumps(self.ts), '{"__class__":"datetime","__value__":"2017-02-17T00:00:00"}')
+        json.prefer_compat()
+        self.assertEqual(json.dumps(self.ts), '"2017-02-17T00:00:00"')
+
+    def test_unhashable_args(self):
+        self.assertEqual(json.dumps({"a": [1]}, separators=[', ', ': ']), '{"a": [1]}')
+
+    def test_decoder_args(self):
+        self.assertEqual(json.loads('1.5', use_decimal=True), Decimal('1.5'))
+        self.assertRaises(TypeError, json.loads, '1.5', use_decimal=True, parse_float=float)
+        self.assertEqual(json.loads('[1]', object_pairs_hook=OrderedDict), [1])
+
+    def test_bounded(self):
+        for indent in range(200):
+            json.dumps([], indent=indent)
+        self.assertTrue(len(self.engine.encoders) <= 128)
+
+
+class TestSelection(unittest.TestCase):
+    def tearDown(self):
+        json.use_engine('simplejson')
+
+    def test_use_engine(self):
+        class Tracing(Engine):
+            name = 'tracing'
+            def __init__(self):
+                self.calls = []
+            def dumps(self, obj, **kw):
+                self.calls.append('dumps')
+                return get_engine('simplejson').dumps(obj, **kw)
+            def loads(self, s, **kw):
+                self.calls.append('loads')
+                return get_engine('simplejson').loads(s, **kw)
+
+        engine = Tracing()
+        json.use_engine(engine)
+        ts = datetime(2017, 2, 17)
+        self.assertEqual(json.loads(json.dumps(ts)), ts)
+        self.assertEqual(engine.calls, ['dumps', 'loads'])
+
+        # per call selection overrides the global one
+        json.dumps(ts, engine='simplejson')
+        self.assertEqual(engine.calls, ['dumps', 'loads'])
+
+        # file functions, and non-iterative engines
+        fp = io.StringIO()
+        json.dump([ts], fp, buffer_size=10)
+        fp.seek(0)
+        self.assertEqual(json.load(fp), [ts])
+        self.assertEqual(engine.calls, ['dumps', 'loads', 'dumps', 'loads'])
+
+    def test_use_unknown_engine(self):
+        self.assertRaises(ValueError, json.use_engine, 'nope')
+        self.assertEqual(json.dumps([1]), '[1]')
+
+
+if __name__ == '__main__':
+    unittest.main()
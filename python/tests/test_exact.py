@@ -135,6 +135,25 @@ class TestJSONPlus(unittest.TestCase):
     def test_datetime(self):
         self.assertEqual(self.dump_and_load(self.ts), self.ts)
 
+    def test_datetime_aware(self):
+        from dateutil.tz import tzoffset
+        ts = self.ts.replace(tzinfo=tzoffset(None, -5400))
+        self.assertEqual(self.dump_and_load(ts), ts)
+        self.assertEqual(self.dump_and_load(ts).utcoffset(), ts.utcoffset())
+
+    def test_datetime_nonconforming(self):
+        x = json.loads('{"__class__":"datetime","__value__":"Feb 17 2017 02:41:04"}')
+        self.assertEqual(x, datetime(2017, 2, 17, 2, 41, 4))
+
+    def test_iso_regex_parsers(self):
+        from dateutil.tz import tzoffset
+        ts = self.ts.replace(tzinfo=tzoffset(None, 3600))
+        for value in [self.ts, self.ts.replace(microsecond=0), ts]:
+            self.assertEqual(json._regex_iso_datetime(value.isoformat()), value)
+            self.assertEqual(json._regex_iso_time(value.timetz().isoformat()), value.timetz())
+        self.assertEqual(json._regex_iso_date(self.ts.date().isoformat()), self.ts.date())
+        self.assertRaises(ValueError, json._regex_iso_datetime, '2017-02-17T02:41:04Z')
+
     def test_date(self):
         date = self.ts.date()
         self.assertEqual(self.dump_and_load(date), date)
@@ -199,6 +218,24 @@ class TestJSONPlus(unittest.TestCase):
         self.assertEqual(y.x, 3)
         self.assertEqual(y.y, 4)
 
+    def test_namedtuple_class_reused(self):
+        Point = namedtuple('Point', 'x y')
+        x = self.dump_and_load([Point(1, 2), Point(3, 4)])
+        y = self.dump_and_load(Point(5, 6))
+        self.assertIs(type(x[0]), type(x[1]))
+        self.assertIs(type(x[0]), type(y))
+        self.assertIsNot(type(x[0]), type(self.dump_and_load(namedtuple('Point', 'x z')(1, 2))))
+
+    def test_namedtuple_registered(self):
+        @json.register_namedtuple
+        class Vector(namedtuple('Vector', 'x y')):
+            def norm(self):
+                return math.hypot(self.x, self.y)
+
+        y = self.dump_and_load(Vector(3, 4))
+        self.assertIs(type(y), Vector)
+        self.assertEqual(y.norm(), 5.0)
+
     def test_uuid1(self):
         a = uuid.uuid1()
         b = self.dump_and_load(a)
@@ -0,0 +1,70 @@
+#!/usr/bin/env python
+# encoding: utf8
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), os.pardir))
+
+import unittest
+import subprocess
+import json
+
+
+PACKAGE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+
+# modules that must not be imported by `import jsonplus`
+HEAVY_MODULES = [
+    'dateutil', 'moneyed', 'sortedcontainers', 'fractions', 'uuid',
+    'multiprocessing', 'msgpack', 'orjson', 'ujson', 'numpy', 'pandas',
+    'jsonplus.binary', 'jsonplus.lines', 'jsonplus.stream', 'jsonplus.compiler',
+]
+
+# maximum number of modules imported by `import jsonplus`, besides the
+# modules imported by its (required) dependencies
+IMPORT_BUDGET = 12
+
+
+def run(code):
+    """Run `code` in a fresh interpreter, returning its JSON output."""
+    output = subprocess.check_output([sys.executable, '-c', code], cwd=PACKAGE_DIR)
+    return json.loads(output.decode('utf8'))
+
+
+class TestImport(unittest.TestCase):
+    def test_heavy_modules_deferred(self):
+        modules = run("import sys, json, jsonplus; print(json.dumps(list(sys.modules)))")
+        loaded = [name for name in HEAVY_MODULES if name in modules]
+        self.assertEqual(loaded, [])
+
+    def test_import_budget(self):
+        added = run("import sys, json, simplejson, datetime, decimal, threading, re, contextvars, weakref\n"
+                    "before = set(sys.modules)\n"
+                    "import jsonplus\n"
+                    "print(json.dumps(sorted(set(sys.modules) - before)))")
+        self.assertTrue(len(added) <= IMPORT_BUDGET, added)
+
+    def test_lazy_attributes(self):
+        loaded = run("import sys, json, jsonplus\n"
+                     "assert 'jsonplus.binary' not in sys.modules\n"
+                     "assert jsonplus.unpackb(jsonplus.packb([1])) == [1]\n"
+                     "from jsonplus import *\n"
+                     "print(json.dumps('jsonplus.binary' in sys.modules))")
+        self.assertTrue(loaded)
+
+        import jsonplus
+        self.assertRaises(AttributeError, getattr, jsonplus, 'missing')
+
+    def test_deferred_decoders(self):
+        self.assertTrue(run(
+            "import json, jsonplus, uuid, fractions, moneyed, datetime\n"
+            "x = [uuid.uuid4(), fractions.Fraction(1, 3), moneyed.Money(1, 'EUR'),\n"
+            "     moneyed.Currency('XYZ', name='Custom'), datetime.date(2017, 1, 1)]\n"
+            "print(json.dumps(jsonplus.loads(jsonplus.dumps(x)) == x))"))
+        # dateutil is still used for values not in ISO 8601 format
+        self.assertTrue(run(
+            "import json, jsonplus, datetime\n"
+            "s = '{\"__class__\": \"datetime\", \"__value__\": \"Feb 17 2017 2:41\"}'\n"
+            "print(json.dumps(jsonplus.loads(s) == datetime.datetime(2017, 2, 17, 2, 41)))"))
+
+
+if __name__ == '__main__':
+    unittest.main()
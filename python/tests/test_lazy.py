@@ -0,0 +1,84 @@
+#!/usr/bin/env python
+# encoding: utf8
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), os.pardir))
+
+import unittest
+import jsonplus as json
+
+from datetime import datetime
+from decimal import Decimal
+from collections import namedtuple
+
+from jsonplus.lazy import LazyMapping, LazyList, materialize
+
+
+class TestLazy(unittest.TestCase):
+    def setUp(self):
+        json.prefer_exact()
+        self.ts = datetime(2017, 2, 17, 2, 41, 4, 390605)
+        Point = namedtuple('Point', 'x y')
+        self.doc = {
+            "meta": {"count": 2, "created": self.ts},
+            "rows": [{"ts": self.ts, "amount": Decimal('3.14'), "pos": Point(1, (2, 3))},
+                     {"ts": self.ts.date(), "tags": {"a", "b"}, "nested": [[self.ts]]}],
+            "plain": [1, "two", None, True, 1.5],
+        }
+        self.s = json.dumps(self.doc)
+
+    def test_same_as_eager(self):
+        lazy = json.loads(self.s, lazy=True)
+        self.assertIsInstance(lazy, LazyMapping)
+        self.assertEqual(materialize(lazy), json.loads(self.s))
+        self.assertEqual(lazy, json.loads(self.s))
+
+    def test_access(self):
+        lazy = json.loads(self.s, lazy=True)
+        self.assertEqual(lazy["meta"]["created"], self.ts)
+        rows = lazy["rows"]
+        self.assertIsInstance(rows, LazyList)
+        self.assertEqual(len(rows), 2)
+        self.assertEqual(rows[0]["amount"], Decimal('3.14'))
+        self.assertEqual(rows[0]["pos"].y, (2, 3))
+        self.assertEqual(rows[-1]["nested"][0][0], self.ts)
+        self.assertEqual(rows[-1]["tags"], {"a", "b"})
+        self.assertEqual(lazy["plain"][1:3], ["two", None])
+        self.assertEqual(list(lazy["plain"]), self.doc["plain"])
+        self.assertEqual(sorted(lazy), ["meta", "plain", "rows"])
+        self.assertTrue("rows" in lazy)
+        self.assertEqual(lazy.get("missing"), None)
+        self.assertRaises(IndexError, lambda: rows[2])
+
+    def test_deferred_and_cached(self):
+        calls = []
+        decode = json._decode_handlers['datetime']
+        json._decode_handlers['datetime'] = lambda v: calls.append(v) or decode(v)
+        try:
+            lazy = json.loads(self.s, lazy=True)
+            self.assertEqual(calls, [])
+            lazy["meta"]["created"]
+            lazy["meta"]["created"]
+            self.assertEqual(len(calls), 1)
+            self.assertIs(lazy["rows"], lazy["rows"])
+        finally:
+            json._decode_handlers['datetime'] = decode
+
+    def test_toplevel(self):
+        self.assertEqual(json.loads(json.dumps(self.ts), lazy=True), self.ts)
+        self.assertEqual(json.loads('1', lazy=True), 1)
+        self.assertEqual(json.loads('[]', lazy=True), [])
+
+    def test_reencode(self):
+        lazy = json.loads(self.s, lazy=True)
+        self.assertEqual(json.loads(json.dumps(lazy)), json.loads(self.s))
+
+    def test_unsupported(self):
+        self.assertEqual(json.loads(self.s, lazy=True, engine='simplejson'), self.doc)
+        self.assertRaises(TypeError, json.loads, self.s, lazy=True, engine='json')
+        compact = json.dumps(self.doc, compact=True)
+        self.assertRaises(TypeError, json.loads, compact, lazy=True)
+
+
+if __name__ == '__main__':
+    unittest.main()
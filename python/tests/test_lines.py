@@ -0,0 +1,80 @@
+#!/usr/bin/env python
+# encoding: utf8
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), os.pardir))
+
+import unittest
+import jsonplus as json
+import io
+
+from datetime import datetime, timedelta
+from decimal import Decimal
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+
+
+class TestLines(unittest.TestCase):
+    def setUp(self):
+        json.prefer_exact()
+        ts = datetime(2017, 2, 17, 2, 41, 4, 390605)
+        self.values = [{"id": i, "ts": ts + timedelta(i), "x": (Decimal(i), {i})}
+                       for i in range(25)] + [None, u"line\nbreak", []]
+
+    def roundtrip(self, **kw):
+        fp = io.StringIO()
+        json.dump_lines(iter(self.values), fp, chunk_size=4, **kw)
+        lines = fp.getvalue().splitlines()
+        self.assertEqual(len(lines), len(self.values))
+        self.assertEqual(lines[0], json.dumps(self.values[0]))
+        fp.seek(0)
+        return list(json.load_lines(fp, chunk_size=3, **kw))
+
+    def test_serial(self):
+        self.assertEqual(self.roundtrip(), self.values)
+
+    def test_executor(self):
+        with ThreadPoolExecutor(2) as executor:
+            self.assertEqual(self.roundtrip(executor=executor), self.values)
+
+    def test_processes(self):
+        self.assertEqual(self.roundtrip(workers=2), self.values)
+
+    def test_coding_propagated(self):
+        json.prefer_compat()
+        fp = io.StringIO()
+        with ProcessPoolExecutor(1) as executor:
+            json.dump_lines([self.values[0]["ts"]], fp, executor=executor)
+        self.assertEqual(fp.getvalue(), '"2017-02-17T02:41:04.390605"\n')
+
+    def test_blank_lines(self):
+        fp = io.BytesIO(b'1\n\n{"a":2}\n  \n')
+        self.assertEqual(list(json.load_lines(fp)), [1, {"a": 2}])
+
+    def test_many(self):
+        documents = json.dumps_many(iter(self.values), chunk_size=4)
+        self.assertEqual(documents, [json.dumps(value) for value in self.values])
+        self.assertEqual(json.loads_many(documents, chunk_size=3), self.values)
+
+        with ThreadPoolExecutor(2) as executor:
+            documents = json.dumps_many(self.values, executor=executor, chunk_size=4)
+            self.assertEqual(json.loads_many(documents, executor=executor), self.values)
+        self.assertEqual(json.loads_many(json.dumps_many(self.values, workers=2), workers=2),
+                         self.values)
+
+    def test_many_args(self):
+        # arguments not supported by the shared encoder/decoder
+        values = [Decimal('1.5'), [1, 2]]
+        documents = json.dumps_many(values, compact=True)
+        self.assertEqual(documents, [json.dumps(value, compact=True) for value in values])
+        self.assertEqual(json.loads_many(documents), values)
+        self.assertEqual(json.dumps_many(values, exact=False, memo=True, sort_keys=True),
+                         ['1.5', '[1,2]'])
+        self.assertEqual(list(json.loads_many(['[1]'], lazy=True)[0]), [1])
+        self.assertEqual(json.loads_many([b'[1]']), [[1]])
+
+    def test_indent(self):
+        self.assertRaises(ValueError, json.dump_lines, [1], io.StringIO(), indent=2)
+
+
+if __name__ == '__main__':
+    unittest.main()
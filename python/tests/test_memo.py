@@ -0,0 +1,92 @@
+#!/usr/bin/env python
+# encoding: utf8
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), os.pardir))
+
+import unittest
+import jsonplus as json
+import jsonplus.memo
+
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+import uuid
+
+from moneyed import Money, Currency
+
+
+class Tag(object):
+    def __init__(self, name):
+        self.name = name
+
+    def __eq__(self, other):
+        return self.name == other.name
+
+    def __hash__(self):
+        return hash(self.name)
+
+
+calls = []
+
+@json.encoder('Tag')
+def _dump_tag(tag):
+    calls.append(tag.name)
+    return tag.name
+
+@json.decoder('Tag')
+def _load_tag(name):
+    return Tag(name)
+
+jsonplus.memo.memoizable('Tag')
+
+
+class TestMemo(unittest.TestCase):
+    def setUp(self):
+        json.prefer_exact()
+        self.ts = datetime(2017, 2, 17, 2, 41, 4, 390605)
+        utc = self.ts.replace(tzinfo=timezone.utc)
+        self.values = [
+            self.ts, self.ts, self.ts.date(), self.ts.time(), timedelta(1),
+            Decimal('1.0'), Decimal('1.00'), Decimal('-0'), Decimal('0'),
+            utc, utc.astimezone(timezone(timedelta(hours=2))),
+            uuid.UUID('16ebeeb6-fc5f-4266-a3a9-50c320d87810'),
+            Money('1.0', 'EUR'), Money('1.00', 'EUR'), Currency('EUR'),
+            Currency(code='XYZ', name='Custom'), Currency(code='XYZ', name='Other'),
+            (1, 2), (1.0, 2), {"nested": [self.ts, (True, self.ts)]},
+        ]
+        self.calls = calls
+        del calls[:]
+
+    def test_same_output(self):
+        for exact in (True, False):
+            for kw in ({}, {'indent': 2}, {'sort_keys': True}):
+                self.assertEqual(json.dumps(self.values, exact=exact, memo=True, **kw),
+                                 json.dumps(self.values, exact=exact, **kw))
+
+    def test_encoded_once(self):
+        tags = [Tag("a"), Tag("b"), Tag("a")] * 10
+        self.assertEqual(json.loads(json.dumps(tags, memo=True)), tags)
+        self.assertEqual(self.calls, ["a", "b"])
+
+        # memo is per call
+        json.dumps(tags, memo=True)
+        self.assertEqual(self.calls, ["a", "b"] * 2)
+
+    def test_bounded(self):
+        tags = [Tag(str(i)) for i in range(10)] * 2
+        memo = jsonplus.memo._Memo(json._json_default_exact, size=5)
+        for tag in tags:
+            memo(tag)
+        self.assertEqual(len(memo.values), 5)
+        self.assertEqual(len(self.calls), 15)
+
+    def test_other_paths(self):
+        expected = json.dumps(self.values)
+        self.assertEqual(''.join(json.iterdump(self.values, memo=True)), expected)
+        self.assertEqual(json.dumps(self.values, engine='json', memo=True), expected)
+        self.assertEqual(json.loads(json.dumps(self.values, compact=True, memo=True)),
+                         json.loads(expected))
+
+
+if __name__ == '__main__':
+    unittest.main()
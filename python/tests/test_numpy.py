@@ -0,0 +1,100 @@
+#!/usr/bin/env python
+# encoding: utf8
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), os.pardir))
+
+import unittest
+import jsonplus as json
+import jsonplus.numpy_coders
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+@unittest.skipIf(numpy is None, "numpy not installed")
+class TestNumpy(unittest.TestCase):
+    def setUp(self):
+        json.prefer_exact()
+        self.arrays = [
+            numpy.arange(12.0).reshape(3, 4),
+            numpy.arange(12).reshape(3, 4).T,
+            numpy.zeros((0, 3), dtype='int8'),
+            numpy.array(5, dtype='>u4'),
+            numpy.array([True, False]),
+            numpy.array([1+2j, 3.5j], dtype='complex64'),
+            numpy.array(['ab', u'žaba']),
+            numpy.array(['2017-02-17T02:41', '1970-01-01'], dtype='datetime64[ns]'),
+            numpy.array([(1, 2.5), (3, -1.0)], dtype=[('a', '<i4'), ('b', '>f8')]),
+            numpy.arange(4, dtype=numpy.longdouble) / 3,
+        ]
+
+    def tearDown(self):
+        jsonplus.numpy_coders.NDARRAY_FORMAT = 'base64'
+
+    def assertIdentical(self, a, b):
+        self.assertIsInstance(b, numpy.ndarray)
+        self.assertEqual(b.dtype, a.dtype)
+        self.assertEqual(b.shape, a.shape)
+        self.assertTrue(numpy.array_equal(a, b))
+
+    def test_arrays(self):
+        for fmt in ('base64', 'list'):
+            jsonplus.numpy_coders.NDARRAY_FORMAT = fmt
+            for arr in self.arrays:
+                decoded = json.loads(json.dumps(arr))
+                self.assertIdentical(arr, decoded)
+                self.assertTrue(decoded.flags.writeable)
+
+    def test_format(self):
+        arr = numpy.arange(3, dtype='int16')
+        self.assertEqual(json.dumps(arr),
+            '{"__class__":"numpy.ndarray","__value__":{"dtype":"<i2","shape":[3],"data":"AAABAAIA"}}')
+        jsonplus.numpy_coders.NDARRAY_FORMAT = 'list'
+        self.assertEqual(json.dumps(arr),
+            '{"__class__":"numpy.ndarray","__value__":{"dtype":"<i2","shape":[3],"values":[0,1,2]}}')
+        jsonplus.numpy_coders.NDARRAY_FORMAT = 'nope'
+        self.assertRaises(ValueError, json.dumps, arr)
+
+    def test_object_arrays(self):
+        arr = numpy.empty((2, 2), dtype=object)
+        arr[:] = [[1, None], ["x", (2, 3)]]
+        decoded = json.loads(json.dumps(arr))
+        self.assertEqual(decoded.dtype, arr.dtype)
+        self.assertEqual(decoded.shape, arr.shape)
+        self.assertEqual(decoded.tolist(), arr.tolist())
+
+    def test_scalars(self):
+        scalars = [numpy.int64(-5), numpy.uint64(2**64 - 1), numpy.float32(0.1),
+                   numpy.bool_(True), numpy.complex64(1+2j), numpy.longdouble(1) / 3,
+                   numpy.datetime64('2017-02-17T02:41'), numpy.timedelta64(3, 'D')]
+        for scalar in scalars:
+            decoded = json.loads(json.dumps(scalar))
+            self.assertIs(type(decoded), type(scalar))
+            self.assertEqual(decoded, scalar)
+
+        self.assertEqual(json.dumps(numpy.int64(5)),
+            '{"__class__":"numpy.generic","__value__":{"dtype":"<i8","value":5}}')
+        # float64 is a float
+        self.assertEqual(json.dumps(numpy.float64(2.5)), '2.5')
+
+    def test_compat(self):
+        self.assertEqual(json.dumps(numpy.arange(4).reshape(2, 2), exact=False), '[[0,1],[2,3]]')
+        self.assertEqual(json.dumps([numpy.int32(1), numpy.bool_(False), numpy.float16(0.5)],
+                                    exact=False), '[1,false,0.5]')
+        self.assertEqual(json.dumps(numpy.array([0.25], dtype=numpy.longdouble), exact=False),
+                         '[0.25]')
+        self.assertEqual(json.dumps(numpy.datetime64('2017-02-17T02:41:04'), exact=False),
+                         '"2017-02-17T02:41:04"')
+
+    def test_nested(self):
+        value = {"a": [numpy.arange(3), numpy.int8(1)]}
+        decoded = json.loads(json.dumps(value))
+        self.assertIdentical(value["a"][0], decoded["a"][0])
+        self.assertEqual(decoded["a"][1], numpy.int8(1))
+
+
+if __name__ == '__main__':
+    unittest.main()
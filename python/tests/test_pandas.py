@@ -0,0 +1,111 @@
+#!/usr/bin/env python
+# encoding: utf8
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), os.pardir))
+
+import unittest
+import jsonplus as json
+
+try:
+    import numpy
+    import pandas
+    from pandas.testing import assert_frame_equal, assert_series_equal, assert_index_equal
+    import dateutil.tz
+except ImportError:
+    pandas = None
+
+
+@unittest.skipIf(pandas is None, "pandas not installed")
+class TestPandas(unittest.TestCase):
+    def setUp(self):
+        json.prefer_exact()
+        self.frame = pandas.DataFrame({
+            'int': numpy.arange(4),
+            'float': numpy.linspace(0, 1, 4),
+            'str': ['a', u'žaba', None, 'd'],
+            'object': numpy.array([1, 'x', None, (1, 2)], dtype=object),
+            'datetime': pandas.date_range('2017-02-17', periods=4, freq='h'),
+            'datetimetz': pandas.date_range('2017-03-26', periods=4, freq='h', tz='Europe/Berlin'),
+            'timedelta': pandas.to_timedelta([1, 2, 3, 4], unit='s'),
+            'category': pandas.Categorical(['x', 'y', 'x', 'z'], ordered=True),
+            'nullable': pandas.array([1, None, 3, 4], dtype='Int64'),
+            'bool': [True, False, True, True],
+        }, index=pandas.Index([10, 20, 30, 40], name='id'))
+
+    def roundtrip(self, value):
+        return json.loads(json.dumps(value))
+
+    def test_dataframe(self):
+        assert_frame_equal(self.roundtrip(self.frame), self.frame)
+        assert_frame_equal(self.roundtrip(pandas.DataFrame()), pandas.DataFrame())
+
+    def test_columns(self):
+        # non-unique, and hierarchical column labels
+        frame = pandas.DataFrame([[1, 2.5]], columns=['a', 'a'])
+        assert_frame_equal(self.roundtrip(frame), frame)
+        frame.columns = pandas.MultiIndex.from_tuples([('a', 1), ('a', 2)])
+        assert_frame_equal(self.roundtrip(frame), frame)
+
+    def test_columnar(self):
+        # one (buffer-encoded) vector per column, not one object per row
+        frame = pandas.DataFrame({"x": numpy.arange(1000.0), "y": numpy.arange(1000)})
+        encoded = json.dumps(frame)
+        self.assertEqual(encoded.count('"__class__":"numpy.ndarray"'), 2)
+        self.assertIn('"range":[0,1000,1]', encoded)
+
+    def test_series(self):
+        for name in self.frame:
+            assert_series_equal(self.roundtrip(self.frame[name]), self.frame[name])
+
+    def test_index(self):
+        indexes = [pandas.RangeIndex(5, 15, 2, name='r'),
+                   pandas.DatetimeIndex(['2017-02-17'], name='ts'),
+                   pandas.CategoricalIndex(['a', 'b', 'a']),
+                   self.frame.set_index(['int', 'str']).index]
+        for index in indexes:
+            assert_index_equal(self.roundtrip(index), index)
+
+    def test_scalars(self):
+        timestamps = [pandas.Timestamp('2017-02-17 02:41:04.123456789'),
+                      pandas.Timestamp('2017-02-17', tz='Europe/Berlin'),
+                      pandas.Timestamp('2017-02-17').as_unit('s')]
+        for ts in timestamps:
+            decoded = self.roundtrip(ts)
+            self.assertIsInstance(decoded, pandas.Timestamp)
+            self.assertEqual(decoded, ts)
+            self.assertEqual(decoded.unit, ts.unit)
+            self.assertEqual(str(decoded.tz), str(ts.tz))
+
+        # zones without a name pandas resolves are encoded as fixed offsets
+        timestamps = [pandas.Timestamp('2017-06-17 02:41', tz='dateutil/Europe/Paris'),
+                      pandas.Timestamp('2017-06-17 02:41', tz=dateutil.tz.gettz('Europe/Paris')),
+                      pandas.Timestamp('2017-06-17 02:41', tz=dateutil.tz.tzoffset(None, 3600)),
+                      pandas.Timestamp('2017-06-17 02:41', tz=dateutil.tz.tzutc())]
+        for ts in timestamps:
+            decoded = self.roundtrip(ts)
+            self.assertEqual(decoded, ts)
+            self.assertEqual(decoded.utcoffset(), ts.utcoffset())
+        self.assertEqual(str(self.roundtrip(timestamps[0]).tz), str(timestamps[0].tz))
+        series = pandas.Series(pandas.date_range('2017-03-25', periods=3, tz='dateutil/Europe/Paris'))
+        assert_series_equal(self.roundtrip(series), series)
+
+        td = pandas.Timedelta('1 days 2 ns')
+        self.assertEqual(self.roundtrip(td), td)
+        self.assertIs(self.roundtrip(pandas.NaT), pandas.NaT)
+        self.assertIs(self.roundtrip(pandas.NA), pandas.NA)
+
+    def test_compat(self):
+        frame = self.frame[['int', 'datetime', 'timedelta', 'nullable']]
+        self.assertEqual(json.loads(json.dumps(frame, exact=False)), {
+            "int": [0, 1, 2, 3],
+            "datetime": ["2017-02-17T00:00:00", "2017-02-17T01:00:00",
+                         "2017-02-17T02:00:00", "2017-02-17T03:00:00"],
+            "timedelta": [1.0, 2.0, 3.0, 4.0],
+            "nullable": [1, None, 3, 4]})
+        self.assertEqual(json.dumps(frame['int'], exact=False), '[0,1,2,3]')
+        self.assertEqual(json.dumps(frame.index, exact=False), '[10,20,30,40]')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+#!/usr/bin/env python
+# encoding: utf8
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), os.pardir))
+
+import unittest
+import jsonplus
+
+from datetime import datetime
+from decimal import Decimal
+from collections import namedtuple
+
+
+class TestProfiling(unittest.TestCase):
+    def setUp(self):
+        jsonplus.prefer_exact()
+        jsonplus.reset_stats()
+        jsonplus.enable_stats()
+        self.ts = datetime(2017, 2, 17, 2, 41, 4, 390605)
+
+    def tearDown(self):
+        jsonplus.enable_stats(False)
+        jsonplus.reset_stats()
+
+    def test_encode(self):
+        jsonplus.dumps([self.ts] * 3 + [Decimal('1.5')])
+        jsonplus.dumps(self.ts, exact=False)
+        stats = jsonplus.stats()
+        self.assertEqual(stats['encode_exact']['datetime']['calls'], 3)
+        self.assertEqual(stats['encode_exact']['Decimal']['calls'], 1)
+        self.assertEqual(stats['encode_compat']['datetime']['calls'], 1)
+        self.assertTrue(stats['encode_exact']['datetime']['time'] > 0)
+
+    def test_predicate_misses(self):
+        jsonplus.dumps([self.ts, self.ts])
+        # resolved once per type
+        self.assertEqual(jsonplus.stats()['encode_exact']['namedtuple']['predicate_misses'], 1)
+
+        Point = namedtuple('Point', 'x y')
+        jsonplus.dumps(Point(1, 2))
+        counters = jsonplus.stats()['encode_exact']['namedtuple']
+        self.assertEqual((counters['calls'], counters['predicate_misses']), (1, 1))
+
+    def test_decode(self):
+        s = jsonplus.dumps([self.ts] * 3)
+        jsonplus.loads(s)
+        self.assertEqual(jsonplus.stats()['decode']['datetime']['calls'], 3)
+
+        jsonplus.reset_stats()
+        jsonplus.unpackb(jsonplus.packb([(1, 2)]))
+        self.assertEqual(jsonplus.stats()['decode']['tuple']['calls'], 1)
+
+    def test_disabled(self):
+        jsonplus.enable_stats(False)
+        jsonplus.loads(jsonplus.dumps([self.ts]))
+        self.assertEqual(jsonplus.stats(), {})
+        self.assertIs(jsonplus._resolve_encoder('exact', self.ts)[1],
+                      jsonplus._encode_handlers['exact']['classname']['datetime'])
+
+    def test_reset(self):
+        jsonplus.dumps(self.ts)
+        jsonplus.reset_stats()
+        self.assertEqual(jsonplus.stats(), {})
+        jsonplus.dumps(self.ts)
+        self.assertEqual(jsonplus.stats()['encode_exact']['datetime']['calls'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
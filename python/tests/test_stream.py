@@ -0,0 +1,136 @@
+#!/usr/bin/env python
+# encoding: utf8
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), os.pardir))
+
+import unittest
+import jsonplus as json
+import io
+
+from datetime import datetime, timedelta
+from decimal import Decimal
+from collections import namedtuple
+
+
+class TestIterDump(unittest.TestCase):
+    def setUp(self):
+        json.prefer_exact()
+        self.ts = datetime(2017, 2, 17, 2, 41, 4, 390605)
+        Point = namedtuple('Point', 'x y')
+        self.plus = {
+            "ts": [self.ts, self.ts.date(), self.ts.time()],
+            "num": [Decimal('3.14'), 1+2j, float('inf')],
+            "col": [(1, 2), {3}, frozenset([4]), Point(5, 6)],
+            "basic": {"a": [1, "b", None, True]}
+        }
+
+    def test_same_as_dumps(self):
+        for exact in (True, False):
+            for buffer_size in (None, 1, 16, 1 << 16):
+                chunks = list(json.iterdump(self.plus, buffer_size=buffer_size,
+                                            sort_keys=True, exact=exact))
+                self.assertEqual(''.join(chunks),
+                                 json.dumps(self.plus, sort_keys=True, exact=exact))
+
+    def test_buffer_size(self):
+        chunks = list(json.iterdump(list(range(1000)), buffer_size=100))
+        self.assertTrue(len(chunks) > 1)
+        self.assertTrue(all(len(chunk) >= 100 for chunk in chunks[:-1]))
+
+    def test_generators(self):
+        x = {"empty": iter([]), "rows": (self.ts + timedelta(i) for i in range(3))}
+        y = json.loads(''.join(json.iterdump(x, sort_keys=True)))
+        self.assertEqual(y, {"empty": [], "rows": [self.ts + timedelta(i) for i in range(3)]})
+
+    def test_lazy_consumption(self):
+        produced = []
+        def rows():
+            for i in range(20000):
+                produced.append(i)
+                yield {"id": i, "ts": self.ts}
+
+        chunks = json.iterdump({"rows": rows()}, buffer_size=1024)
+        first = next(chunks)
+        self.assertTrue(len(produced) < 1000)
+        self.assertEqual(len(json.loads(first + ''.join(chunks))["rows"]), 20000)
+
+    def test_indent(self):
+        self.assertEqual(''.join(json.iterdump({"a": iter([1])}, indent=2)),
+                         json.dumps({"a": [1]}, indent=2))
+
+    def test_dump(self):
+        fp = io.StringIO()
+        json.dump({"rows": (self.ts for _ in range(3))}, fp, buffer_size=10)
+        self.assertEqual(json.loads(fp.getvalue()), {"rows": [self.ts] * 3})
+
+    def test_coding_resolved_on_call(self):
+        chunks = json.iterdump(self.ts)
+        json.prefer_compat()
+        self.assertEqual(json.loads(''.join(chunks)), self.ts)
+
+
+class TestIterLoad(unittest.TestCase):
+    def setUp(self):
+        json.prefer_exact()
+        self.ts = datetime(2017, 2, 17, 2, 41, 4, 390605)
+        Point = namedtuple('Point', 'x y')
+        self.items = [
+            self.ts, Decimal('3.14'), (1, 2), Point(3, self.ts.date()),
+            {"a": [1, {"b": None}], "c": u"\u017eaba"}, 123456789, -1.5e-10,
+            u"str", True, None, [], {}
+        ]
+
+    def iterload(self, value, binary=False, **kw):
+        data = json.dumps(value, indent=kw.pop('indent', None))
+        fp = io.BytesIO(data.encode('utf8')) if binary else io.StringIO(data)
+        return list(json.iterload(fp, **kw))
+
+    def test_toplevel_array(self):
+        for binary in (False, True):
+            for chunk_size in (1, 3, 1024):
+                self.assertEqual(self.iterload(self.items, binary=binary,
+                                               chunk_size=chunk_size),
+                                 self.items)
+
+    def test_number_boundary(self):
+        doc = u'[1.5, 2e3, 10, -0.25E-2, 3.0e+1, 7]'
+        for chunk_size in range(1, len(doc) + 1):
+            items = list(json.iterload(io.StringIO(doc), chunk_size=chunk_size))
+            self.assertEqual(items, [1.5, 2e3, 10, -0.25e-2, 3.0e+1, 7], chunk_size)
+
+    def test_whitespace(self):
+        self.assertEqual(self.iterload(self.items, indent=4, chunk_size=5), self.items)
+
+    def test_prefix(self):
+        doc = {"meta": {"count": 3, "items": [0]}, "rows": self.items, "tail": [1]}
+        self.assertEqual(self.iterload(doc, prefix='rows.item', chunk_size=7), self.items)
+        self.assertEqual(self.iterload(doc, prefix='meta.count'), [3])
+        self.assertEqual(self.iterload(doc, prefix='meta.items.item'), [0])
+        self.assertEqual(self.iterload(doc, prefix='meta.missing'), [])
+        self.assertEqual(self.iterload(doc, prefix=''), [doc])
+
+    def test_nested_prefix(self):
+        doc = [{"ts": self.ts, "x": 1}, {"x": 2}, {"ts": self.ts.date()}]
+        self.assertEqual(self.iterload(doc, prefix='item.ts'), [self.ts, self.ts.date()])
+
+    def test_empty(self):
+        self.assertEqual(self.iterload([]), [])
+
+    def test_lazy(self):
+        rows = [{"id": i, "ts": self.ts} for i in range(1000)]
+        fp = io.StringIO(json.dumps(rows))
+        items = json.iterload(fp, chunk_size=64)
+        self.assertEqual(next(items), rows[0])
+        self.assertTrue(fp.tell() < 1024)
+        self.assertEqual([next(items)] + list(items), rows[1:])
+
+    def test_invalid(self):
+        fp = io.StringIO(u'[1, 2 3]')
+        self.assertRaises(ValueError, list, json.iterload(fp))
+        fp = io.StringIO(u'[1, {"a": ')
+        self.assertRaises(ValueError, list, json.iterload(fp))
+
+
+if __name__ == '__main__':
+    unittest.main()